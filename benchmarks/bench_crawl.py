@@ -0,0 +1,250 @@
+"""
+가짜 e-Class 서버(benchmarks/fake_eclass_server.py)를 상대로 전체 수집을 재는 벤치마크입니다.
+
+로그인 → 과목 목록 → 과목 메뉴 → 핸들러(공지사항, 강의계획서, 강의 자료)까지
+수집 경로마다(직렬, 스레드, asyncio) 다음을 보고합니다.
+
+- 초당 요청 수와 요청 지연의 p50/p99 (클라이언트에서 잰 값, 재시도와 동시성 제한 대기 포함)
+- HTML 파싱에 쓴 CPU 시간의 합 (스레드별 CPU 시간이므로 GIL 대기는 빠집니다)
+- 최대 메모리(RSS)
+
+각 경로는 새 프로세스에서 실행되므로 서로의 메모리나 연결 풀에 영향을 주지 않습니다.
+--json으로 결과를 저장하고 --baseline으로 이전 결과와 비교하면, 기준보다 느려진 경로가
+있을 때 종료 코드 1로 끝납니다.
+
+    python -m benchmarks.bench_crawl --courses 20 --latency 10 --json bench.json
+    python -m benchmarks.bench_crawl --courses 20 --latency 10 --baseline bench.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_eclass_server import ServerOptions, serve  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SCENARIOS = ('serial', 'threads', 'async')
+
+# 파싱 시간을 잴 함수들: (모듈, 이름). 클래스 메서드는 '클래스.메서드'로 적습니다.
+# 핸들러가 이름으로 가져다 쓰는 함수는 가져다 쓴 모듈에서 바꿔야 합니다.
+PARSE_FUNCTIONS = (
+    ('scrapping.eclass_session', 'parse_course_list'),
+    ('scrapping.eclass_session', 'parse_course_menus'),
+    ('scrapping.menu_handlers.notice_handler', 'NoticeMenuHandler._parse_notices'),
+    ('scrapping.menu_handlers.lecture_material_handler', 'LectureMaterialMenuHandler.parse_materials'),
+    ('scrapping.menu_handlers.lecture_material_handler', 'parse_article_detail'),
+    ('scrapping.menu_handlers.plan_handler', 'make_soup'),
+    ('scrapping.menu_handlers.plan_handler', 'PlanMenuHandler._extract_plan_info'),
+)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class Timings:
+    """여러 스레드에서 잰 시간을 모읍니다."""
+
+    def __init__(self):
+        self.values: List[float] = []
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self.values.append(seconds)
+
+
+def _timed(func: Callable, timings: Timings, clock: Callable[[], float] = time.perf_counter) -> Callable:
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timings.add(clock() - start)
+    return wrapper
+
+
+def _timed_async(func: Callable, timings: Timings) -> Callable:
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            timings.add(time.perf_counter() - start)
+    return wrapper
+
+
+def _instrument(request_timings: Timings, parse_timings: Timings) -> None:
+    import importlib
+    from scrapping.async_eclass_session import AsyncEclassSession
+    from scrapping.eclass_session import EclassSession
+
+    EclassSession._request = _timed(EclassSession._request, request_timings)
+    AsyncEclassSession._fetch = _timed_async(AsyncEclassSession._fetch, request_timings)
+    for module_name, name in PARSE_FUNCTIONS:
+        owner = importlib.import_module(module_name)
+        *path, attribute = name.split('.')
+        for part in path:
+            owner = getattr(owner, part)
+        setattr(owner, attribute, _timed(getattr(owner, attribute), parse_timings, time.thread_time))
+
+
+def run_scenario(scenario: str, base_url: str, workers: int, rate_limit: Optional[float]) -> Dict[str, Any]:
+    """새 프로세스에서 한 경로로 전체 수집을 한 번 실행하고 측정값을 반환합니다."""
+    # 설정을 읽기 전에 가짜 서버를 가리키게 하고, 쿠키·내보내기 파일은 임시 디렉토리에 씁니다.
+    os.environ['ECLASS_BASE_URL'] = base_url
+    workdir = tempfile.mkdtemp(prefix='eclass-bench-')
+    os.chdir(workdir)
+    with open('config.ini', 'w', encoding='utf-8') as file:
+        file.write("[credentials]\nusername = bench\npassword = bench\n")
+
+    import asyncio
+    import logging
+    import scrapping.async_eclass_session as async_eclass_session
+    import scrapping.eclass_session as eclass_session
+    import scrapping.menu_handlers.plan_handler as plan_handler
+    from scrapping.eclass_manager import EclassManager
+
+    logging.basicConfig(level=logging.WARNING)
+    eclass_session.COOKIE_DIR = os.path.join(workdir, 'cookies')
+    plan_handler.EXPORT_DIR = os.path.join(workdir, 'export')
+    # 기본 설정에서는 호스트별 속도 제한이 처리량을 정하므로 따로 주지 않으면 끕니다.
+    rate, burst = (rate_limit, rate_limit) if rate_limit else (1e9, 1e9)
+    for module in (eclass_session, async_eclass_session):
+        module.RATE_LIMIT_PER_SECOND, module.RATE_LIMIT_BURST = rate, burst
+
+    request_timings, parse_timings = Timings(), Timings()
+    _instrument(request_timings, parse_timings)
+
+    start = time.perf_counter()
+    try:
+        manager = EclassManager(use_cache=False)
+        if scenario == 'serial':
+            results = manager.crawl_all(max_workers=1)
+        elif scenario == 'threads':
+            results = manager.crawl_all(max_workers=workers)
+        else:
+            results = asyncio.run(manager.crawl_all_async(max_concurrency=workers))
+    finally:
+        os.chdir(tempfile.gettempdir())
+        shutil.rmtree(workdir, ignore_errors=True)
+    wall = time.perf_counter() - start
+
+    latencies = [value * 1000 for value in request_timings.values]
+    peak_rss = None
+    if resource is not None:
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux는 KB, macOS는 바이트 단위입니다.
+        peak_rss = peak_rss / 1024 if sys.platform != 'darwin' else peak_rss / 1024 / 1024
+    return {
+        'scenario': scenario,
+        'wall_s': wall,
+        'requests': len(latencies),
+        'requests_per_s': len(latencies) / wall if wall else 0.0,
+        'p50_ms': percentile(latencies, 0.50),
+        'p99_ms': percentile(latencies, 0.99),
+        'parse_ms': sum(parse_timings.values) * 1000,
+        'peak_rss_mb': peak_rss,
+        'courses': len(results),
+        'errors': sum(len(result.errors) for result in results),
+    }
+
+
+def start_server(options: ServerOptions):
+    """가짜 서버를 별도 프로세스로 띄웁니다. 같은 프로세스면 GIL을 나눠 써 측정이 흔들립니다."""
+    context = multiprocessing.get_context('spawn')
+    ready = context.Queue()
+    process = context.Process(target=serve, args=(options, '127.0.0.1', 0, ready), daemon=True)
+    process.start()
+    _, port = ready.get(timeout=30)
+    # aiohttp의 기본 쿠키 저장소는 IP 주소 호스트의 쿠키를 받지 않으므로 localhost로 접속합니다.
+    return process, f'http://localhost:{port}'
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float) -> List[str]:
+    """기준 결과보다 threshold 넘게 느려진 항목을 찾습니다."""
+    with open(baseline_path, 'r', encoding='utf-8') as file:
+        baseline = {entry['scenario']: entry for entry in json.load(file)['results']}
+    regressions = []
+    for result in results:
+        base = baseline.get(result['scenario'])
+        if not base:
+            continue
+        if result['requests_per_s'] < base['requests_per_s'] * (1 - threshold):
+            regressions.append(f"{result['scenario']}: 초당 요청 {base['requests_per_s']:.1f} → {result['requests_per_s']:.1f}")
+        if result['p99_ms'] > base['p99_ms'] * (1 + threshold):
+            regressions.append(f"{result['scenario']}: p99 {base['p99_ms']:.1f}ms → {result['p99_ms']:.1f}ms")
+        if result['parse_ms'] > base['parse_ms'] * (1 + threshold):
+            regressions.append(f"{result['scenario']}: 파싱 {base['parse_ms']:.1f}ms → {result['parse_ms']:.1f}ms")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="가짜 e-Class 서버를 상대로 한 전체 수집 벤치마크")
+    parser.add_argument('--courses', type=int, default=ServerOptions.courses, help="과목 수")
+    parser.add_argument('--notices', type=int, default=ServerOptions.notices, help="과목당 공지 수")
+    parser.add_argument('--materials', type=int, default=ServerOptions.materials, help="과목당 강의 자료 수")
+    parser.add_argument('--latency', type=float, default=10.0, help="서버 응답 지연(밀리초)")
+    parser.add_argument('--fixtures', help="녹화한 페이지(<엔드포인트>.html)가 있는 디렉토리")
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--workers', type=int, default=8, help="스레드 수 / asyncio 동시 요청 수")
+    parser.add_argument('--rate-limit', type=float, help="호스트별 초당 요청 수 (기본값: 제한 없음)")
+    parser.add_argument('--repeat', type=int, default=1, help="경로마다 반복 횟수 (벽시계 시간의 중앙값인 실행을 보고)")
+    parser.add_argument('--json', help="결과를 저장할 JSON 파일")
+    parser.add_argument('--baseline', help="비교할 이전 --json 결과")
+    parser.add_argument('--threshold', type=float, default=0.2, help="회귀로 볼 변화 비율")
+    args = parser.parse_args()
+
+    options = ServerOptions(args.courses, args.notices, args.materials, args.latency / 1000, args.fixtures)
+    server, base_url = start_server(options)
+    results = []
+    try:
+        context = multiprocessing.get_context('spawn')
+        for scenario in args.scenarios:
+            runs = []
+            for _ in range(args.repeat):
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    runs.append(executor.submit(run_scenario, scenario, base_url, args.workers, args.rate_limit).result())
+            runs.sort(key=lambda run: run['wall_s'])
+            results.append(runs[len(runs) // 2])
+    finally:
+        server.terminate()
+
+    print(f"과목 {args.courses}개, 공지 {args.notices}개, 자료 {args.materials}개, 지연 {args.latency:.0f}ms, "
+          f"동시성 {args.workers}")
+    print(f"{'경로':<8} {'시간(s)':>8} {'요청':>6} {'요청/s':>8} {'p50(ms)':>8} {'p99(ms)':>8} {'파싱(ms)':>9} {'RSS(MB)':>8} {'오류':>4}")
+    for result in results:
+        rss = f"{result['peak_rss_mb']:.1f}" if result['peak_rss_mb'] is not None else '-'
+        print(f"{result['scenario']:<8} {result['wall_s']:>8.2f} {result['requests']:>6} {result['requests_per_s']:>8.1f} "
+              f"{result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['parse_ms']:>9.1f} {rss:>8} {result['errors']:>4}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump({'options': vars(args), 'results': results}, file, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.threshold)
+        for regression in regressions:
+            print(f"회귀: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
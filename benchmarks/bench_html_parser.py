@@ -0,0 +1,140 @@
+"""
+HTML 파서 백엔드별 파싱 시간을 비교합니다.
+
+저장해 둔 페이지(예: debug/notice_list_*.html.gz)를 백엔드마다 문서 전체로 파싱했을 때와
+필요한 부분(Fragment)만 파싱했을 때의 시간을 잽니다. 파일을 주지 않으면 debug/ 아래에
+저장된 페이지(scrapping/debug_capture.py)를 쓰고, 그것도 없으면 실제 페이지와 비슷한
+크기의 예제 페이지를 만들어 씁니다. .gz 파일은 압축을 풀어 읽습니다.
+
+    python -m benchmarks.bench_html_parser [HTML 파일 또는 디렉토리 ...] [--repeat N]
+"""
+import argparse
+import glob
+import gzip
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from config import DEBUG_CAPTURE_DIR  # noqa: E402
+
+from scrapping.eclass_session import COURSE_LIST_ITEMS, COURSE_MENU_ITEMS  # noqa: E402
+from scrapping.html_parser import Fragment, available_backends, make_soup, parse_fragment  # noqa: E402
+from scrapping.menu_handlers.article_detail import ARTICLE_BODY  # noqa: E402
+from scrapping.menu_handlers.lecture_material_handler import MATERIAL_TABLE  # noqa: E402
+from scrapping.menu_handlers.notice_handler import NOTICE_ROWS  # noqa: E402
+
+# 파일 이름 접두사 → 그 페이지에서 실제로 쓰는 부분
+FRAGMENTS: Dict[str, Fragment] = {
+    'notice_list': NOTICE_ROWS,
+    'lecture_material': MATERIAL_TABLE,
+    'course_menu': COURSE_MENU_ITEMS,
+    'submain': COURSE_MENU_ITEMS,
+    'main': COURSE_LIST_ITEMS,
+    'article': ARTICLE_BODY,
+    'notice_view': ARTICLE_BODY,
+}
+
+_PAGE_FILLER = ''.join(
+    f'<div class="menu"><ul>{"".join(f"<li><a href=/m/{i}/{j}>메뉴 {j}</a></li>" for j in range(10))}</ul></div>'
+    for i in range(60)
+)
+
+
+def _sample_notice_list(rows: int = 200) -> str:
+    body = ''.join(
+        f'<tr style="cursor: pointer;"><td>{n}</td><td></td>'
+        f'<td onclick="pageMove(\'/ilos/st/course/notice_view_form.acl?ARTL_NUM={n}\')">'
+        f'<a class="site-link"><div class="subjt_top">공지 {n}</div>'
+        f'<div class="subjt_bottom"><span>교수</span><span>조회 {n * 3}</span></div></a></td>'
+        f'<td></td><td>2024.03.{n % 28 + 1:02d}</td></tr>'
+        for n in range(rows, 0, -1)
+    )
+    return f'<html><head><title>공지사항</title></head><body>{_PAGE_FILLER}<table class="bbslist"><tbody>{body}</tbody></table>{_PAGE_FILLER}</body></html>'
+
+
+def _sample_course_menus() -> str:
+    items = ''.join(
+        f'<li class="course_menu_item" id="st_{name}"><a href="/ilos/st/course/{name}_list_form.acl">{name}</a></li>'
+        for name in ('notice', 'lecture_material', 'plan', 'report', 'attendance', 'test', 'project', 'onlineLecture')
+    )
+    return f'<html><body>{_PAGE_FILLER}<ul>{items}</ul>{_PAGE_FILLER}</body></html>'
+
+
+SAMPLE_PAGES = {
+    'notice_list_sample.html': _sample_notice_list,
+    'course_menu_sample.html': _sample_course_menus,
+}
+
+
+def fragment_for(path: str) -> Optional[Fragment]:
+    name = os.path.basename(path)
+    for prefix, fragment in FRAGMENTS.items():
+        if name.startswith(prefix):
+            return fragment
+    return None
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """func를 repeat번 실행한 시간의 중앙값(밀리초)을 반환합니다."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def load_pages(paths: List[str]) -> List[Tuple[str, str]]:
+    files = []
+    for path in paths or [DEBUG_CAPTURE_DIR]:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '*.html')) + glob.glob(os.path.join(path, '*.html.gz'))))
+        elif os.path.isfile(path):
+            files.append(path)
+
+    if not files:
+        print("저장된 페이지가 없어 예제 페이지를 사용합니다.")
+        return [(name, build()) for name, build in SAMPLE_PAGES.items()]
+
+    pages = []
+    for path in files:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as file:
+            pages.append((os.path.basename(path), file.read()))
+    return pages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTML 파서 백엔드별 파싱 시간 비교")
+    parser.add_argument('paths', nargs='*', help="HTML(.html, .html.gz) 파일 또는 디렉토리 (기본값: debug/)")
+    parser.add_argument('--repeat', type=int, default=20, help="페이지당 반복 횟수")
+    args = parser.parse_args()
+
+    pages = load_pages(args.paths)
+    backends = available_backends()
+    print(f"사용 가능한 백엔드: {', '.join(backends)}")
+    print(f"{'페이지':<32} {'KB':>7} {'백엔드':<12} {'전체(ms)':>10} {'부분(ms)':>10} {'기준 대비':>9}")
+
+    for name, html in pages:
+        fragment = fragment_for(name)
+        baseline = measure(lambda: BeautifulSoup(html, 'html.parser'), args.repeat)
+        print(f"{name:<32} {len(html.encode('utf-8')) / 1024:>7.1f} {'(기존)':<12} {baseline:>10.2f} {'-':>10} {'1.0x':>9}")
+        for backend in backends:
+            full = measure(lambda: make_soup(html, backend), args.repeat)
+            if fragment:
+                partial = measure(lambda: parse_fragment(html, fragment, backend), args.repeat)
+                best = min(full, partial)
+                partial_text = f"{partial:.2f}"
+            else:
+                best, partial_text = full, '-'
+            print(f"{'':<32} {'':>7} {backend:<12} {full:>10.2f} {partial_text:>10} {baseline / best:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
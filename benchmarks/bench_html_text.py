@@ -0,0 +1,100 @@
+"""
+게시글 본문을 텍스트로 바꾸는 시간을 기존 방식과 html_to_text로 비교합니다.
+
+기존 방식은 <br>을 줄 바꿈 문자열로 바꾸고 <p> 뒤에 줄 바꿈을 끼워 넣어 트리를 고친 뒤,
+문자열을 +=로 이어 붙이고 줄을 다시 훑어 빈 줄을 지웠습니다. 트리를 고치므로 같은 트리로
+반복해 잴 수 없어, 반복마다 본문을 새로 파싱하고 변환에 든 시간만 잽니다.
+
+파일을 주지 않으면 문단, <br>, 목록, 표가 섞인 예제 본문을 크기별로 만들어 씁니다.
+저장해 둔 상세 페이지(예: debug/notice_view_form_*.html.gz)를 주면 그 페이지의 본문을 씁니다.
+
+    python -m benchmarks.bench_html_text [HTML 파일 ...] [--sizes 10 100 1000] [--repeat N]
+"""
+import argparse
+import gzip
+import os
+import statistics
+import sys
+import time
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapping.html_parser import parse_fragment  # noqa: E402
+from scrapping.html_text import html_to_text  # noqa: E402
+from scrapping.menu_handlers.article_detail import ARTICLE_BODY  # noqa: E402
+
+_PARAGRAPH = (
+    '<p>이번 주 강의는 휴강이며 보강은 다음 주 목요일 3교시에 진행합니다.<br>'
+    '과제 제출 기한은 <b>금요일 자정</b>까지이며 늦은 제출은 받지 않습니다.&nbsp;</p>\n'
+    '<p>&nbsp;</p>\n'
+)
+_LIST = '<ul><li>보고서 양식을 지켜 주세요.</li><li>참고 문헌을 밝혀 주세요.</li></ul>\n'
+_TABLE = '<table><tr><th>주차</th><th>내용</th></tr><tr><td>1</td><td>오리엔테이션</td></tr></table>\n'
+
+
+def sample_article(kilobytes: int) -> str:
+    """본문이 대략 kilobytes KB인 상세 페이지를 만듭니다."""
+    block = _PARAGRAPH * 4 + _LIST + '첫 줄<br>둘째 줄<br><br>' + _TABLE
+    count = max(1, kilobytes * 1024 // len(block.encode('utf-8')))
+    return f'<html><body><table><tr><td class="textviewer"><div>{block * count}</div></td></tr></table></body></html>'
+
+
+def legacy_text(soup, content_div) -> str:
+    """이전 parse_article_detail의 본문 추출 (트리를 고칩니다)."""
+    for br in content_div.find_all('br'):
+        br.replace_with('\n')
+
+    for p in content_div.find_all('p'):
+        p.insert_after(soup.new_string('\n'))
+
+    cleaned_content = ''
+    for element in content_div.contents:
+        if element.name == 'p':
+            cleaned_content += element.get_text(strip=False) + '\n'
+        elif isinstance(element, str):
+            cleaned_content += element
+
+    return '\n'.join([line for line in cleaned_content.splitlines() if line.strip() or line.isspace()])
+
+
+def measure(html: str, convert: Callable, repeat: int) -> Tuple[float, str]:
+    """반복마다 새로 파싱한 본문으로 convert에 든 시간의 중앙값(밀리초)과 마지막 결과를 반환합니다."""
+    timings, text = [], ''
+    for _ in range(repeat):
+        soup = parse_fragment(html, ARTICLE_BODY)
+        content_div = soup.find('td', class_='textviewer').find('div')
+        start = time.perf_counter()
+        text = convert(soup, content_div)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), text
+
+
+def load_pages(paths: List[str], sizes: List[int]) -> List[Tuple[str, str]]:
+    if not paths:
+        return [(f'sample_{size}KB', sample_article(size)) for size in sizes]
+    pages = []
+    for path in paths:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as file:
+            pages.append((os.path.basename(path), file.read()))
+    return pages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="게시글 본문 텍스트 변환 시간 비교")
+    parser.add_argument('paths', nargs='*', help="상세 페이지 HTML(.html, .html.gz) 파일 (없으면 예제 본문)")
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10, 100, 1000], help="예제 본문 크기(KB)")
+    parser.add_argument('--repeat', type=int, default=10, help="페이지당 반복 횟수")
+    args = parser.parse_args()
+
+    print(f"{'페이지':<28} {'KB':>8} {'기존(ms)':>10} {'새(ms)':>10} {'배율':>6} {'글자 수(기존→새)':>20}")
+    for name, html in load_pages(args.paths, args.sizes):
+        legacy_ms, legacy = measure(html, legacy_text, args.repeat)
+        new_ms, new = measure(html, lambda soup, content_div: html_to_text(content_div), args.repeat)
+        print(f"{name:<28} {len(html.encode('utf-8')) / 1024:>8.1f} {legacy_ms:>10.2f} {new_ms:>10.2f} "
+              f"{legacy_ms / new_ms:>5.1f}x {f'{len(legacy)}→{len(new)}':>20}")
+
+
+if __name__ == '__main__':
+    main()
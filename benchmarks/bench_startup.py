@@ -0,0 +1,135 @@
+"""
+명령줄 도구와 주요 모듈의 시작 시간을 재는 벤치마크입니다.
+
+대상마다 새 인터프리터를 띄워 다음을 보고합니다.
+
+- 프로세스 시작부터 끝까지의 벽시계 시간 (-X importtime 없이 잰 값)
+- -X importtime으로 잰 import 시간의 합과 불러온 모듈 수
+- 불러와서는 안 되는 무거운 의존성(requests, bs4, openai 등) 중 실제로 불러온 것
+- 자체 import 시간이 가장 긴 모듈들
+
+python -c pass도 함께 재므로 인터프리터 자체의 시작 시간과 비교할 수 있습니다.
+--json으로 결과를 저장하고 --baseline으로 이전 결과와 비교하면, 기준보다 느려졌거나
+무거운 의존성을 새로 불러오는 대상이 있을 때 종료 코드 1로 끝납니다.
+
+    python -m benchmarks.bench_startup --json startup.json
+    python -m benchmarks.bench_startup --baseline startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 이름 → 인터프리터 인자
+TARGETS = {
+    'python': ['-c', 'pass'],
+    'cli': ['main.py', '--help'],
+    'cli-export': ['main.py', 'export', '--help'],
+    'store': ['-c', 'import scrapping.store'],
+    'summarize': ['-c', 'import processing.ai_processing'],
+    'notion': ['-c', 'import processing.notion_sync'],
+    'crawler': ['-c', 'import scrapping.eclass_manager'],
+}
+
+# 짧은 명령에서 불러오면 시작이 눈에 띄게 느려지는 의존성
+HEAVY_MODULES = ('requests', 'bs4', 'openai', 'aiohttp', 'lxml', 'selectolax', 'tiktoken')
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """-X importtime 출력을 (모듈, 자체 μs, 누적 μs, 깊이) 목록으로 바꿉니다."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def run_target(arguments: List[str], repeat: int) -> Dict[str, Any]:
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    walls, runs = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *arguments], cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        walls.append((time.perf_counter() - start) * 1000)
+
+        completed = subprocess.run([sys.executable, '-X', 'importtime', *arguments], cwd=ROOT, env=env, check=True,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        runs.append(parse_importtime(completed.stderr))
+
+    walls.sort()
+    # 맨 위 단계 모듈의 누적 시간을 더하면 전체 import 시간이 됩니다.
+    runs.sort(key=lambda entries: sum(cumulative for _, _, cumulative, depth in entries if depth == 0))
+    entries = runs[len(runs) // 2]
+    modules = {name for name, _, _, _ in entries}
+    heaviest = sorted(entries, key=lambda entry: entry[1], reverse=True)[:5]
+    return {
+        'wall_ms': walls[len(walls) // 2],
+        'import_ms': sum(cumulative for _, _, cumulative, depth in entries if depth == 0) / 1000,
+        'modules': len(modules),
+        'heavy': [name for name in HEAVY_MODULES if name in modules],
+        'heaviest': [(name, self_us / 1000) for name, self_us, _, _ in heaviest],
+    }
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline_path: str, threshold: float) -> List[str]:
+    """기준 결과보다 threshold 넘게 느려졌거나 무거운 의존성을 새로 불러오는 대상을 찾습니다."""
+    with open(baseline_path, 'r', encoding='utf-8') as file:
+        baseline = json.load(file)['results']
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if result['import_ms'] > base['import_ms'] * (1 + threshold):
+            regressions.append(f"{name}: import {base['import_ms']:.1f}ms → {result['import_ms']:.1f}ms")
+        if result['wall_ms'] > base['wall_ms'] * (1 + threshold):
+            regressions.append(f"{name}: 시작 {base['wall_ms']:.1f}ms → {result['wall_ms']:.1f}ms")
+        added = sorted(set(result['heavy']) - set(base['heavy']))
+        if added:
+            regressions.append(f"{name}: 새로 불러오는 의존성 {', '.join(added)}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="명령줄 도구와 주요 모듈의 시작 시간 벤치마크")
+    parser.add_argument('--targets', nargs='+', choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument('--repeat', type=int, default=5, help="대상마다 반복 횟수 (중앙값을 보고)")
+    parser.add_argument('--top', action='store_true', help="대상마다 자체 import 시간이 긴 모듈을 함께 출력합니다")
+    parser.add_argument('--json', help="결과를 저장할 JSON 파일")
+    parser.add_argument('--baseline', help="비교할 이전 --json 결과")
+    parser.add_argument('--threshold', type=float, default=0.25, help="회귀로 볼 변화 비율")
+    args = parser.parse_args()
+
+    results = {name: run_target(TARGETS[name], args.repeat) for name in args.targets}
+
+    print(f"{'대상':<12} {'시작(ms)':>9} {'import(ms)':>11} {'모듈':>5}  무거운 의존성")
+    for name, result in results.items():
+        print(f"{name:<12} {result['wall_ms']:>9.1f} {result['import_ms']:>11.1f} {result['modules']:>5}  "
+              f"{', '.join(result['heavy']) or '-'}")
+        if args.top:
+            for module, self_ms in result['heaviest']:
+                print(f"{'':<12} {self_ms:>9.1f}  {module}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump({'python': sys.version.split()[0], 'results': results}, file, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.threshold)
+        for regression in regressions:
+            print(f"회귀: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,290 @@
+"""
+벤치마크용 가짜 e-Class 서버입니다.
+
+로그인부터 과목 목록, 강의실 진입, 공지사항·강의계획서·강의 자료 목록과 상세까지
+수집기가 실제로 보내는 요청에 실제 페이지와 같은 구조의 HTML을 돌려줍니다.
+--fixtures 디렉토리에 <엔드포인트>.html(예: notice_list.html)이 있으면 만든 페이지 대신
+그 파일을 그대로 돌려주므로, debug/에 저장된 실제 페이지(.html.gz)를 풀어 두면 그 페이지로도 잴 수 있습니다.
+
+    python -m benchmarks.fake_eclass_server --port 8900 --courses 10 --notices 60 --latency 20
+
+수집기는 ECLASS_BASE_URL=http://localhost:8900 으로 실행합니다.
+"""
+import argparse
+import json
+import os
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+SESSION_COOKIE = 'JSESSIONID'
+
+# 실제 페이지처럼 머리글·메뉴 등 수집에 쓰지 않는 부분으로 페이지 크기를 맞춥니다.
+_PAGE_FILLER = ''.join(
+    f'<div class="menu"><ul>{"".join(f"<li><a href=/m/{i}/{j}>메뉴 {j}</a></li>" for j in range(10))}</ul></div>'
+    for i in range(30)
+)
+
+_LOGIN_FORM = (
+    '<html><body><form action="/ilos/lo/login.acl" method="post">'
+    '<input name="usr_id"><input type="password" name="usr_pwd"></form></body></html>'
+)
+
+_MENUS = (
+    ('st_plan', '강의계획서', '/ilos/st/course/plan_form.acl'),
+    ('st_notice', '공지사항', '/ilos/st/course/notice_list_form.acl'),
+    ('st_lecture_material', '강의자료', '/ilos/st/course/lecture_material_list_form.acl'),
+)
+
+
+@dataclass
+class ServerOptions:
+    courses: int = 8
+    notices: int = 40         # 과목당 공지 수
+    materials: int = 12       # 과목당 강의 자료 수
+    latency: float = 0.0      # 응답마다 더할 지연(초)
+    fixtures: Optional[str] = None
+    pinned: int = 0           # 과목당 상단 고정 공지 수 (모든 페이지 맨 위에 반복됩니다)
+
+
+def _page(title: str, body: str) -> str:
+    return f'<html><head><title>{title}</title></head><body>{_PAGE_FILLER}{body}{_PAGE_FILLER}</body></html>'
+
+
+def course_id(index: int) -> str:
+    return f'A2024{index:05d}'
+
+
+def main_page(options: ServerOptions) -> str:
+    items = ''.join(
+        f'<li style="background: url(/ilos/images/course.gif) no-repeat;">'
+        f'<em class="sub_open" kj="{course_id(i)}">벤치마크 과목 {i} (BENCH{i:03d}-01)</em>'
+        f'<span>월{i % 9 + 1}-{i % 9 + 2}</span></li>'
+        for i in range(options.courses)
+    )
+    return _page('메인', f'<ul class="course_list">{items}</ul>')
+
+
+def submain_page() -> str:
+    items = ''.join(f'<li class="course_menu_item" id="{menu_id}"><a href="{url}">{name}</a></li>'
+                    for menu_id, name, url in _MENUS)
+    return _page('강의실', f'<ul>{items}</ul>')
+
+
+def _notice_row(course: str, label: str, article: int, title: str) -> str:
+    return (
+        f'<tr style="cursor: pointer;"><td>{label}</td><td></td>'
+        f'<td onclick="pageMove(\'/ilos/st/course/notice_view_form.acl?ARTL_NUM={article}&amp;ky={course}\')">'
+        f'<a class="site-link"><div class="subjt_top">{title}</div>'
+        f'<div class="subjt_bottom"><span>교수</span><span>조회 {article * 3}</span></div></a></td>'
+        f'<td></td><td>2024.03.{article % 28 + 1:02d}</td></tr>'
+    )
+
+
+def notice_list_page(options: ServerOptions, course: str, start: int, display: int) -> str:
+    newest = options.notices - (start - 1) * display
+    # 실제 서버처럼 고정 공지는 번호 칸에 '공지'를 쓰고 페이지마다 맨 위에 다시 나옵니다.
+    pinned = ''.join(_notice_row(course, '공지', 10000 + p, f'{course} 고정 공지 {p}')
+                     for p in range(1, options.pinned + 1))
+    rows = pinned + ''.join(_notice_row(course, str(n), n, f'{course} 공지 {n}')
+                            for n in range(newest, max(0, newest - display), -1))
+    return _page('공지사항', f'<table class="bbslist"><tbody>{rows}</tbody></table>')
+
+
+def plan_page(course: str) -> str:
+    def table(rows: Dict[str, str]) -> str:
+        return '<table>' + ''.join(f'<tr><th>{key}</th><td>{value}</td></tr>' for key, value in rows.items()) + '</table>'
+
+    def section(name: str, content: str) -> str:
+        return f'<div style="padding-top: 10px; font-weight: bold;">{name}</div>{content}'
+
+    weeks = '<table><tr><th>주차</th><th>내용</th><th>비고</th></tr>' + ''.join(
+        f'<tr><td>{week}</td><td>{course} {week}주차 강의 내용과 실습</td><td>{"과제" if week % 4 == 0 else ""}</td></tr>'
+        for week in range(1, 17)
+    ) + '</table>'
+    body = (
+        section('[수업기본정보]', table({'교과목명': f'과목 {course}', '학점': '3', '강의실': '미래관 101'}))
+        + section('[담당교수정보]', table({'성명': '홍길동', '이메일': 'prof@example.com'}))
+        + section('[강의계획]', table({'강의목표': '자료구조와 알고리즘 기초 ' * 20, '평가방법': '중간 30, 기말 40, 과제 30'}))
+        + section('[주별강의계획]', weeks)
+    )
+    return _page('강의계획서', body)
+
+
+def material_list_page(options: ServerOptions, course: str) -> str:
+    rows = ''.join(
+        f'<tr id="material_{course}{n:04d}"><td>{n}</td><td>{course} 강의 자료 {n}</td>'
+        f'<td>2024.03.{n % 28 + 1:02d}</td><td>1</td></tr>'
+        for n in range(options.materials, 0, -1)
+    )
+    return _page('강의자료', f'<table class="bbslist"><thead><tr><th>번호</th></tr></thead><tbody>{rows}</tbody></table>')
+
+
+def article_page(title: str, article: str) -> str:
+    paragraphs = ''.join(f'<p>{title} 본문 {i}번째 문단입니다. ' + '내용 ' * 30 + '</p><br>' for i in range(8))
+    files = f'<div id="tbody_file"><a href="/ilos/co/efile_download.acl?FILE={article}">{article}.pdf</a></div>'
+    return _page(title, f'<table><tr><td class="textviewer"><div>{paragraphs}</div>{files}</td></tr></table>')
+
+
+class FakeEclassHandler(BaseHTTPRequestHandler):
+    server: 'FakeEclassServer'
+    protocol_version = 'HTTP/1.1'
+    # 헤더와 본문을 따로 보내므로 Nagle 알고리즘이 켜져 있으면 응답마다 지연 ACK만큼 늦어집니다.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._dispatch({})
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get('Content-Length') or 0)
+        form = parse_qs(self.rfile.read(length).decode('utf-8')) if length else {}
+        self._dispatch({key: values[-1] for key, values in form.items()})
+
+    def _dispatch(self, form: Dict[str, str]) -> None:
+        url = urlsplit(self.path)
+        form = {**{key: values[-1] for key, values in parse_qs(url.query).items()}, **form}
+        endpoint = os.path.basename(url.path)
+        options = self.server.options
+        if options.latency:
+            time.sleep(options.latency)
+        self.server.count(endpoint)
+
+        if endpoint == 'login.acl':
+            token = self.server.login()
+            self._send('<script>document.location.href="/ilos/main/main_form.acl";</script>',
+                       cookie=f'{SESSION_COOKIE}={token}; Path=/')
+            return
+
+        session = self._session()
+        if session is None:
+            self._send(_LOGIN_FORM)
+            return
+
+        fixture = self.server.fixture(endpoint)
+        if fixture is not None:
+            self._send(fixture)
+        elif endpoint == 'main_form.acl':
+            self._send(main_page(options))
+        elif endpoint == 'eclass_room2.acl':
+            self.server.sessions[session] = form.get('KJKEY', '')
+            self._send(json.dumps({'isError': False, 'returnURL': self._absolute('/ilos/st/course/submain_form.acl')}),
+                       content_type='application/json')
+        elif endpoint == 'submain_form.acl':
+            self._send(submain_page())
+        elif endpoint == 'notice_list.acl':
+            self._send(notice_list_page(options, form.get('ky', ''), int(form.get('start') or 1),
+                                        int(form.get('display') or 20)))
+        elif endpoint == 'plan_view.acl':
+            # 실제 서버처럼 강의실에 진입한 과목의 강의계획서를 돌려줍니다.
+            self._send(plan_page(self.server.sessions[session]))
+        elif endpoint == 'lecture_material_list.acl':
+            self._send(material_list_page(options, form.get('ky', '')))
+        elif endpoint in ('lecture_material_view_form.acl', 'notice_view_form.acl'):
+            article = form.get('ARTL_NUM', '')
+            self._send(article_page(f"{form.get('ky', '')} 글 {article}", article))
+        else:
+            self._send(_page('없음', ''), status=404)
+
+    def _session(self) -> Optional[str]:
+        for part in (self.headers.get('Cookie') or '').split(';'):
+            name, _, value = part.strip().partition('=')
+            if name == SESSION_COOKIE and value in self.server.sessions:
+                return value
+        return None
+
+    def _absolute(self, path: str) -> str:
+        # 쿠키가 같은 호스트로 가도록 요청에 쓴 주소 그대로 돌려줍니다.
+        return f"http://{self.headers.get('Host') or '%s:%d' % self.server.server_address[:2]}{path}"
+
+    def _send(self, body: str, status: int = 200, content_type: str = 'text/html',
+              cookie: Optional[str] = None) -> None:
+        payload = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        if cookie:
+            self.send_header('Set-Cookie', cookie)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class FakeEclassServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, options: ServerOptions):
+        super().__init__(address, FakeEclassHandler)
+        self.options = options
+        self.sessions: Dict[str, str] = {}  # 세션 토큰 → 진입한 과목 ID
+        self.requests: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._fixtures: Dict[str, Optional[str]] = {}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def login(self) -> str:
+        token = secrets.token_hex(16)
+        self.sessions[token] = ''
+        return token
+
+    def count(self, endpoint: str) -> None:
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+    def fixture(self, endpoint: str) -> Optional[str]:
+        if not self.options.fixtures:
+            return None
+        if endpoint not in self._fixtures:
+            path = os.path.join(self.options.fixtures, endpoint.replace('.acl', '.html'))
+            content = None
+            if os.path.isfile(path):
+                with open(path, 'r', encoding='utf-8') as file:
+                    content = file.read()
+            self._fixtures[endpoint] = content
+        return self._fixtures[endpoint]
+
+
+def serve(options: ServerOptions, host: str = '127.0.0.1', port: int = 0,
+          ready: Optional[object] = None) -> None:
+    """서버를 띄우고 멈출 때까지 요청을 처리합니다. ready가 있으면 (host, port)를 put합니다."""
+    server = FakeEclassServer((host, port), options)
+    if ready is not None:
+        ready.put(server.server_address[:2])
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def parse_options(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="벤치마크용 가짜 e-Class 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--courses', type=int, default=ServerOptions.courses, help="과목 수")
+    parser.add_argument('--notices', type=int, default=ServerOptions.notices, help="과목당 공지 수")
+    parser.add_argument('--materials', type=int, default=ServerOptions.materials, help="과목당 강의 자료 수")
+    parser.add_argument('--pinned', type=int, default=ServerOptions.pinned, help="과목당 상단 고정 공지 수")
+    parser.add_argument('--latency', type=float, default=0.0, help="응답마다 더할 지연(밀리초)")
+    parser.add_argument('--fixtures', help="<엔드포인트>.html 파일이 있는 디렉토리")
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    args = parse_options()
+    options = ServerOptions(args.courses, args.notices, args.materials, args.latency / 1000, args.fixtures, args.pinned)
+    print(f"가짜 e-Class 서버: http://{args.host}:{args.port} (과목 {args.courses}개, 공지 {args.notices}개, "
+          f"자료 {args.materials}개, 지연 {args.latency:.0f}ms)")
+    serve(options, args.host, args.port)
+
+
+if __name__ == '__main__':
+    main()
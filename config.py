@@ -1,12 +1,145 @@
 import configparser
 import os
 
-BASE_URL = "https://eclass.seoultech.ac.kr"
+# ECLASS_BASE_URL 환경 변수로 다른 서버(예: benchmarks/fake_eclass_server.py)를 가리킬 수 있습니다.
+BASE_URL = os.environ.get('ECLASS_BASE_URL', "https://eclass.seoultech.ac.kr").rstrip('/')
 LOGIN_URL = f"{BASE_URL}/ilos/lo/login.acl"
 MAIN_URL = f"{BASE_URL}/ilos/main/main_form.acl"
 COURSE_ACCESS_URL = f"{BASE_URL}/ilos/st/course/eclass_room2.acl"
 SUBMAIN_URL = f"{BASE_URL}/ilos/st/course/submain_form.acl"
 
+# 전체 수집(crawl) 시 동시에 실행할 작업 수
+CRAWL_MAX_WORKERS = 8
+# 비동기 세션에서 동시에 진행할 최대 요청 수
+ASYNC_MAX_CONCURRENCY = 16
+
+# HTTP 요청 설정
+REQUEST_CONNECT_TIMEOUT = 5  # 초
+REQUEST_READ_TIMEOUT = 30  # 초
+HTTP_POOL_MAXSIZE = 16  # 호스트당 유지할 연결 수
+REQUEST_MAX_RETRIES = 3
+REQUEST_BACKOFF_BASE = 0.5  # 초
+REQUEST_BACKOFF_MAX = 10  # 초
+RATE_LIMIT_PER_SECOND = 5  # 호스트당 초당 요청 수
+RATE_LIMIT_BURST = 10
+
+# 로그인 쿠키를 저장할 디렉토리 (계정별로 파일이 하나씩 생깁니다)
+COOKIE_DIR = os.path.join(os.path.dirname(__file__), '.eclass_cookies')
+
+# 공지사항 목록을 한 번에 요청할 개수
+NOTICE_PAGE_SIZE = 20
+# 강의 자료 상세 페이지를 동시에 요청할 개수
+MATERIAL_DETAIL_WORKERS = 4
+# 수집할 때 새 공지의 상세 페이지(본문, 첨부 파일)도 가져올지 여부와 동시에 요청할 개수
+NOTICE_FETCH_CONTENT = True
+NOTICE_DETAIL_WORKERS = 4
+
+# 첨부 파일 다운로드 설정
+DOWNLOAD_DIR = os.path.join(os.path.dirname(__file__), 'downloads')
+DOWNLOAD_MAX_WORKERS = 4
+DOWNLOAD_CHUNK_SIZE = 256 * 1024  # 바이트
+
+# 응답 캐시 설정
+RESPONSE_CACHE_ENABLED = True
+RESPONSE_CACHE_DIR = os.path.join(os.path.dirname(__file__), '.eclass_cache')
+# 엔드포인트별 캐시 유지 시간(초). 여기에 없는 엔드포인트는 캐시하지 않습니다.
+RESPONSE_CACHE_TTLS = {
+    'notice_list.acl': 5 * 60,
+    'plan_view.acl': 24 * 60 * 60,
+    'lecture_material_list.acl': 10 * 60,
+}
+# 폼에 과목 키가 없어 서버 세션의 '현재 과목'에 따라 응답이 달라지는 엔드포인트.
+# 캐시 키에 진입한 과목 ID를 넣고, 진입한 과목이 없으면 캐시하지 않습니다.
+RESPONSE_CACHE_COURSE_SCOPED = ('plan_view.acl',)
+
+# 수집 결과와 요약을 저장할 SQLite 파일
+STORE_PATH = os.path.join(os.path.dirname(__file__), 'eclass.db')
+
+# 원본 HTML 디버그 저장 설정
+# 파싱에 실패한 응답은 항상, 정상 응답은 엔드포인트마다 SAMPLE_EVERY번에 한 번 gzip으로 저장합니다. (0이면 실패만)
+DEBUG_CAPTURE_ENABLED = True
+DEBUG_CAPTURE_DIR = os.path.join(os.path.dirname(__file__), 'debug')
+DEBUG_CAPTURE_SAMPLE_EVERY = 100
+DEBUG_CAPTURE_MAX_BYTES = 20 * 1024 * 1024  # 넘으면 오래된 파일부터 지웁니다
+DEBUG_CAPTURE_QUEUE_SIZE = 32  # 저장을 기다리는 응답 수. 가득 차면 버립니다
+
+# 검색 결과에 보여줄 본문 발췌 길이(글자 수)
+SEARCH_SNIPPET_CHARS = 80
+
+# 변경 이벤트(created/updated/deleted)를 한 줄씩 덧붙이는 JSONL 파일
+CHANGE_FEED_PATH = os.path.join(os.path.dirname(__file__), 'changes.jsonl')
+
+# 데몬 모드(--daemon) 폴링 설정
+# 메뉴별 첫 폴링 주기(초). 변경이 감지되면 짧아지고 없으면 최대 주기까지 길어집니다.
+POLL_INTERVALS = {
+    'NOTICE': 5 * 60,
+    'ASSIGNMENT': 15 * 60,
+    'LECTURE_MATERIAL': 30 * 60,
+    'ONLINE_LECTURE': 60 * 60,
+    'EXAM': 6 * 60 * 60,
+    'TEAM_PROJECT': 6 * 60 * 60,
+    'ATTENDANCE': 12 * 60 * 60,
+    'PLAN': 24 * 60 * 60,
+}
+POLL_DEFAULT_INTERVAL = 60 * 60
+POLL_MIN_INTERVAL = 2 * 60
+POLL_MAX_INTERVAL = 3 * 24 * 60 * 60
+POLL_JITTER = 0.2  # 주기의 ±20%
+# 모든 과목이 나눠 쓰는 시간당 HTTP 요청 수 (상세 페이지, 과목 진입, 과목 목록 요청 포함)
+POLL_BUDGET_PER_HOUR = 120
+# 과목 목록과 메뉴를 다시 읽는 주기(초)
+POLL_COURSE_REFRESH_INTERVAL = 24 * 60 * 60
+
+# 여러 계정 수집(crawl --accounts) 설정
+# config.ini에 계정마다 [credentials:<이름>] 섹션을 둡니다. (rate_limit, rate_burst로 계정별 속도 지정 가능)
+# 모든 수강생에게 같은 내용이 보이는 메뉴. 여러 계정이 함께 듣는 과목은 이 메뉴를 한 계정만 수집합니다.
+SHARED_MENU_TYPES = ('PLAN', 'NOTICE', 'LECTURE_MATERIAL')
+# 동시에 실행할 계정 프로세스 수 (None이면 CPU 코어 수)
+MULTI_ACCOUNT_MAX_PROCESSES = None
+
+# 요청·파싱·요약 지표(scrapping/metrics.py)의 히스토그램 경계(초)
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# HTML 파서 백엔드: 'auto', 'selectolax', 'lxml', 'html.parser'
+# 'auto'는 설치된 것 중 가장 빠른 백엔드를 사용합니다.
+HTML_PARSER_BACKEND = 'auto'
+
+# 강의계획서 등 텍스트로 내보낸 파일이 저장되는 디렉토리 (요약 입력)
+EXPORT_DIR = os.path.join(os.path.dirname(__file__), 'scrapping', 'export')
+
+# 요약(OpenAI API) 설정. 엔드포인트와 키는 config.ini의 [api] 섹션(key, base_url)에서 읽습니다.
+SUMMARY_MODEL = 'gpt-4o-mini'
+SUMMARY_MAX_WORKERS = 8
+SUMMARY_REQUESTS_PER_MINUTE = 500
+SUMMARY_TOKENS_PER_MINUTE = 200_000
+# 토큰 예산을 잡을 때 응답 길이로 미리 잡아 둘 토큰 수
+SUMMARY_RESPONSE_TOKENS = 1024
+# 긴 문서는 모델별로 이 토큰 수 이하의 조각으로 나눠 요약한 뒤 합칩니다.
+SUMMARY_CHUNK_TOKENS = {
+    'gpt-4o-mini': 12_000,
+    'gpt-4o': 12_000,
+    'gpt-3.5-turbo': 3_000,
+}
+SUMMARY_DEFAULT_CHUNK_TOKENS = 4_000
+SUMMARY_MAX_RETRIES = 5
+SUMMARY_BACKOFF_BASE = 1.0  # 초
+SUMMARY_BACKOFF_MAX = 60  # 초
+
+# 요약 캐시 설정. 입력 텍스트·모델·프롬프트가 같으면 API를 다시 호출하지 않습니다.
+SUMMARY_CACHE_ENABLED = True
+SUMMARY_CACHE_DIR = os.path.join(os.path.dirname(__file__), '.summary_cache')
+SUMMARY_CACHE_MAX_ENTRIES = 5000
+SUMMARY_CACHE_MAX_AGE = 90 * 24 * 60 * 60  # 초
+
+# Notion 동기화 설정. 토큰과 데이터베이스 ID는 config.ini의 [notion] 섹션에서 읽고,
+# base_url을 적으면 NOTION_API_URL 대신 사용합니다. (예: 로컬 모의 서버)
+NOTION_API_URL = 'https://api.notion.com/v1'
+NOTION_VERSION = '2022-06-28'
+# Notion은 통합(integration)마다 평균 초당 3회 요청을 허용합니다.
+NOTION_REQUESTS_PER_SECOND = 3
+NOTION_BATCH_SIZE = 50
+NOTION_MAX_RETRIES = 5
+
 def get_config():
     config = configparser.ConfigParser()
     config_path = os.path.join(os.path.dirname(__file__), 'config.ini')
@@ -1,11 +1,206 @@
-from scrapping.eclass_manager import EclassManager
+"""
+e-Class 수집 도구의 명령줄 진입점입니다.
+
+    python main.py                     # 대화형 메뉴 (interactive와 같음)
+    python main.py crawl --changes     # 모든 과목과 메뉴를 수집
+    python main.py daemon              # 로그인을 유지한 채 메뉴별 주기로 폴링
+    python main.py summarize           # 내보낸 텍스트 파일 요약
+    python main.py export --notion     # 저장소를 Notion으로 동기화
+    python main.py search 중간고사       # 저장된 공지, 자료, 강의계획서 전문 검색
+
+cron에서 자주 실행하는 짧은 명령이 빨리 시작하도록 requests, bs4, openai 같은 무거운
+의존성과 핸들러 모듈은 각 명령 함수 안에서, 실제로 쓸 때 불러옵니다.
+"""
+import argparse
 import logging
 
+from config import (
+    ASYNC_MAX_CONCURRENCY, CRAWL_MAX_WORKERS, STORE_PATH, CHANGE_FEED_PATH, EXPORT_DIR, SUMMARY_MAX_WORKERS,
+)
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def main():
-    manager = EclassManager()
-    manager.run()
+def parse_args(argv=None):
+    # 모든 명령이 함께 쓰는 옵션
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--db', default=STORE_PATH, help="수집 결과를 저장할 SQLite 파일")
+    common.add_argument('--no-cache', action='store_true', help="응답 캐시(summarize에서는 요약 캐시)를 사용하지 않습니다")
+    common.add_argument('--metrics', metavar='FILE', help="요청·파싱 지표를 Prometheus 텍스트 형식으로 FILE에 씁니다 (실행이 끝날 때)")
+    common.add_argument('--metrics-port', type=int, metavar='PORT', help="실행 중 http://127.0.0.1:PORT/metrics 에서 지표를 제공합니다")
+    common.add_argument('--profile', metavar='DIR', help="핸들러별 cProfile 결과를 DIR/<핸들러>.prof로 저장합니다 (--workers 1 권장)")
+
+    parser = argparse.ArgumentParser(description="e-Class 정보 수집")
+    # 명령 없이 실행하면 대화형 메뉴를 띄웁니다.
+    parser.set_defaults(command='interactive', func=interactive, report=True, **vars(common.parse_args([])))
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
+
+    crawl_parser = subparsers.add_parser('crawl', parents=[common], help="입력 없이 모든 과목과 메뉴를 수집합니다")
+    crawl_parser.set_defaults(func=crawl)
+    crawl_parser.add_argument('--workers', type=int, default=CRAWL_MAX_WORKERS, help="동시에 실행할 최대 작업 수")
+    crawl_parser.add_argument('--async', dest='use_async', action='store_true', help="asyncio 세션으로 수집합니다")
+    crawl_parser.add_argument('--concurrency', type=int, default=ASYNC_MAX_CONCURRENCY, help="--async 사용 시 동시에 진행할 최대 요청 수")
+    crawl_parser.add_argument('--download', action='store_true', help="수집 후 공지사항과 강의 자료의 첨부 파일을 내려받습니다 (--async와 함께 쓸 수 없음)")
+    crawl_parser.add_argument('--output', default='crawl_results.json', help="수집 결과를 저장할 JSON 파일")
+    crawl_parser.add_argument('--changes', nargs='?', const=CHANGE_FEED_PATH, metavar='FEED',
+                              help="이전 수집과 비교해 바뀐 항목만 이벤트로 FEED(JSONL)에 기록하고, 이미 본 공지 이후는 읽지 않습니다")
+    crawl_parser.add_argument('--notion', action='store_true', help="수집 후 저장소를 Notion 데이터베이스로 동기화합니다")
+    crawl_parser.add_argument('--accounts', nargs='*', metavar='PROFILE',
+                              help="config.ini의 [credentials:<PROFILE>] 계정들을 계정마다 별도 프로세스에서 수집해 합칩니다 "
+                                   "(이름을 생략하면 모든 프로필)")
+
+    daemon_parser = subparsers.add_parser('daemon', parents=[common],
+                                          help="로그인을 유지한 채 메뉴별 주기로 계속 폴링하며 변경 사항을 피드에 기록합니다")
+    daemon_parser.set_defaults(func=daemon)
+    daemon_parser.add_argument('--changes', default=CHANGE_FEED_PATH, metavar='FEED', help="변경 이벤트를 기록할 JSONL 파일")
+
+    summarize_parser = subparsers.add_parser('summarize', parents=[common], help="내보낸 텍스트 파일을 요약합니다")
+    summarize_parser.set_defaults(func=summarize)
+    summarize_parser.add_argument('--input-dir', default=EXPORT_DIR, help="요약할 .txt 파일이 있는 디렉토리")
+    summarize_parser.add_argument('--output', default='summaries.jsonl', help="요약을 덧붙일 JSONL 파일")
+    summarize_parser.add_argument('--markdown', nargs='?', const='summaries.md', metavar='FILE',
+                                  help="요약을 마크다운 FILE로도 씁니다")
+    summarize_parser.add_argument('--workers', type=int, default=SUMMARY_MAX_WORKERS, help="동시에 진행할 최대 요약 요청 수")
+
+    export_parser = subparsers.add_parser('export', parents=[common], help="저장소와 요약을 내보냅니다")
+    export_parser.set_defaults(func=export)
+    export_parser.add_argument('--notion', action='store_true',
+                               help="저장소의 과목, 공지, 자료, 강의계획, 요약을 Notion 데이터베이스로 동기화합니다")
+    export_parser.add_argument('--markdown', metavar='FILE', help="요약 JSONL(--summaries)을 마크다운 FILE로 씁니다")
+    export_parser.add_argument('--summaries', default='summaries.jsonl', help="--markdown으로 변환할 요약 JSONL 파일")
+
+    # 검색은 저장소만 읽으므로 수집·지표 옵션 없이 --db만 받습니다.
+    search_parser = subparsers.add_parser('search', help="저장된 공지사항, 강의 자료, 강의계획서를 검색합니다 (오프라인)")
+    search_parser.set_defaults(func=search, report=False)
+    search_parser.add_argument('query', help="검색어 (여러 단어는 모두 포함한 글을 찾습니다)")
+    search_parser.add_argument('--db', default=STORE_PATH, help="검색할 SQLite 파일")
+    search_parser.add_argument('--course', metavar='ID', help="이 과목의 글만 찾습니다")
+    search_parser.add_argument('--kind', nargs='+', choices=['notice', 'material', 'plan'], help="찾을 글 종류")
+    search_parser.add_argument('--limit', type=int, default=20, help="보여줄 최대 결과 수")
+    search_parser.add_argument('--rebuild', action='store_true', help="검색 전에 색인을 처음부터 다시 만듭니다")
+
+    interactive_parser = subparsers.add_parser('interactive', parents=[common], help="과목과 메뉴를 골라 가며 확인합니다 (기본값)")
+    interactive_parser.set_defaults(func=interactive)
+
+    args = parser.parse_args(argv)
+    if args.command == 'export' and not (args.notion or args.markdown):
+        export_parser.error("--notion 또는 --markdown 중 하나 이상을 지정하세요.")
+    if args.command == 'crawl' and args.accounts is not None and (args.use_async or args.download):
+        crawl_parser.error("--accounts는 --async, --download와 함께 쓸 수 없습니다.")
+    if args.command == 'crawl' and args.use_async and args.download:
+        # 첨부 파일은 동기 세션(EclassSession)으로 내려받으므로 asyncio 수집 뒤에는 실행하지 않습니다.
+        crawl_parser.error("--async는 --download와 함께 쓸 수 없습니다.")
+    return args
+
+def crawl(args):
+    import asyncio
+    import json
+    from scrapping.change_detector import ChangeDetector
+    from scrapping.eclass_manager import EclassManager
+    from scrapping.store import EclassStore
+
+    with EclassStore(args.db) as store:
+        detector = ChangeDetector(store, feed_path=args.changes) if args.changes else None
+        if args.accounts is not None:
+            from scrapping.multi_account import crawl_accounts, list_profiles
+            results = crawl_accounts(args.accounts or list_profiles(), use_cache=not args.no_cache,
+                                     max_workers=args.workers, change_detector=detector)
+        else:
+            manager = EclassManager(use_cache=not args.no_cache, change_detector=detector)
+            if args.use_async:
+                results = asyncio.run(manager.crawl_all_async(max_concurrency=args.concurrency))
+            else:
+                results = manager.crawl_all(max_workers=args.workers)
+                if args.download:
+                    manager.download_attachments(results)
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump([result.to_dict() for result in results], file, ensure_ascii=False, indent=4, default=str)
+        logging.info(f"수집 결과가 {args.output}에 저장되었습니다.")
+        store.save_crawl_results(results)
+        if args.notion:
+            from processing.notion_sync import sync_to_notion
+            sync_to_notion(store)
+
+def daemon(args):
+    from scrapping.change_detector import ChangeDetector
+    from scrapping.eclass_manager import EclassManager
+    from scrapping.scheduler import run_daemon
+    from scrapping.store import EclassStore
+
+    with EclassStore(args.db) as store:
+        detector = ChangeDetector(store, feed_path=args.changes)
+        run_daemon(EclassManager(use_cache=not args.no_cache, change_detector=detector), store)
+
+def summarize(args):
+    from processing.ai_processing import jsonl_to_markdown, process_text_files
+    from scrapping.store import EclassStore
+
+    with EclassStore(args.db) as store:
+        process_text_files(args.input_dir, args.output, max_workers=args.workers,
+                           use_cache=not args.no_cache, store=store)
+    if args.markdown:
+        jsonl_to_markdown(args.output, args.markdown)
+
+def export(args):
+    if args.notion:
+        from processing.notion_sync import sync_to_notion
+        from scrapping.store import EclassStore
+
+        with EclassStore(args.db) as store:
+            sync_to_notion(store)
+    if args.markdown:
+        from processing.ai_processing import jsonl_to_markdown
+        jsonl_to_markdown(args.summaries, args.markdown)
+
+def search(args):
+    import time
+    from scrapping.store import EclassStore
+
+    with EclassStore(args.db) as store:
+        if not store.search_enabled:
+            return
+        if args.rebuild:
+            counts = store.rebuild_search_index()
+            logging.info(f"검색 색인을 다시 만들었습니다: {counts}")
+        start = time.perf_counter()
+        hits = store.search(args.query, limit=args.limit, course_id=args.course, kinds=args.kind)
+        elapsed = (time.perf_counter() - start) * 1000
+
+    kind_names = {'notice': '공지', 'material': '자료', 'plan': '계획'}
+    for index, hit in enumerate(hits, 1):
+        key = f" ({hit.item_key})" if hit.item_key != hit.title else ""
+        print(f"{index}. [{kind_names[hit.kind]}] {hit.course_name or hit.course_id} - {hit.title}{key}")
+        if hit.snippet:
+            print(f"   {hit.snippet}")
+    print(f"\n결과 {len(hits)}개 ({elapsed:.1f}ms)")
+
+def interactive(args):
+    from scrapping.eclass_manager import EclassManager
+
+    EclassManager(use_cache=not args.no_cache).run()
+
+def report_metrics(args):
+    from scrapping import metrics
+
+    print("\n=== 요청·파싱 지표 ===")
+    print(metrics.REGISTRY.summary_table())
+    if args.metrics:
+        metrics.REGISTRY.write_prometheus(args.metrics)
+        logging.info(f"지표가 {args.metrics}에 저장되었습니다.")
+    metrics.PROFILER.dump()
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.metrics_port or args.profile:
+        from scrapping import metrics
+        if args.metrics_port:
+            metrics.serve_metrics(args.metrics_port)
+        if args.profile:
+            metrics.PROFILER.enable(args.profile)
+    try:
+        args.func(args)
+    finally:
+        if args.report:
+            report_metrics(args)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,89 +1,270 @@
 import os
-import configparser
-from openai import OpenAI
-import json
+import hashlib
+import logging
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Optional, Tuple
 
-# 설정 파일 읽기
-config = configparser.ConfigParser()
-config.read('config.ini')
+from config import (
+    get_config, EXPORT_DIR,
+    SUMMARY_MODEL, SUMMARY_MAX_WORKERS, SUMMARY_REQUESTS_PER_MINUTE, SUMMARY_TOKENS_PER_MINUTE,
+    SUMMARY_RESPONSE_TOKENS, SUMMARY_MAX_RETRIES, SUMMARY_BACKOFF_BASE, SUMMARY_BACKOFF_MAX,
+    SUMMARY_CACHE_ENABLED, SUMMARY_CACHE_DIR, SUMMARY_CACHE_MAX_ENTRIES, SUMMARY_CACHE_MAX_AGE,
+)
+from processing.chunking import chunk_text, count_tokens
+from processing.summary_cache import SummaryCache
+from processing.summary_log import SummaryLog, iter_records
+from scrapping import metrics
+from scrapping.rate_limiter import TokenBucket
+from scrapping.store import EclassStore
+from scrapping.retry import RETRYABLE_STATUS_CODES, backoff_delay, parse_retry_after
 
-# OpenAI 클라이언트 초기화
-client = OpenAI(api_key=config['api']['key'])
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+SYSTEM_PROMPT = "You are a helpful assistant that summarizes text."
+USER_PROMPT = "한글로 텍스트를 요약해봐:\n\n{text}"
+# 긴 문서를 조각별로 요약(map)한 뒤 합칠(reduce) 때 쓰는 프롬프트
+CHUNK_PROMPT = "다음은 긴 문서의 일부야. 이 부분의 내용을 한글로 요약해봐:\n\n{text}"
+REDUCE_PROMPT = "다음은 한 문서를 부분별로 요약한 내용이야. 하나의 요약으로 합쳐서 한글로 정리해봐:\n\n{text}"
+
+
+# OpenAI 클라이언트 생성
+def create_client(config=None) -> 'OpenAI':
+    """
+    config.ini의 [api] 섹션으로 클라이언트를 만듭니다.
+
+    base_url을 지정하면 OpenAI 호환 서버(로컬 테스트 서버 등)로 요청을 보냅니다.
+    재시도는 BatchSummarizer가 직접 하므로 클라이언트 자체 재시도는 끕니다.
+    """
+    from openai import OpenAI  # openai는 불러오는 데 1초 가까이 걸리므로 요약할 때만 가져옵니다.
+
+    api = (config or get_config())['api']
+    return OpenAI(api_key=api['key'], base_url=api.get('base_url') or None, max_retries=0)
 
 # 텍스트 파일 읽기 함수
 def read_text_file(file_path):
     with open(file_path, 'r', encoding='utf-8') as file:
         return file.read()
 
+def text_sha256(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def _api_errors():
+    # except 절의 식은 예외가 났을 때만 평가되므로, 클라이언트를 만든 뒤에만 openai를 가져옵니다.
+    from openai import APIConnectionError, APIStatusError
+    return APIStatusError, APIConnectionError
+
+def request_summary(text, client: 'OpenAI', model: str = SUMMARY_MODEL, prompt: str = USER_PROMPT):
+    # summarize_text와 BatchSummarizer의 모든 API 호출이 여기를 지나므로 지표도 여기서 기록합니다.
+    started = time.perf_counter()
+    try:
+        completion = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt.format(text=text)}
+            ]
+        )
+    except _api_errors() as e:
+        metrics.observe('summary_request_seconds', time.perf_counter() - started, model=model)
+        metrics.inc('summary_requests_total', model=model, status=str(getattr(e, 'status_code', None) or 'error'))
+        raise
+    metrics.observe('summary_request_seconds', time.perf_counter() - started, model=model)
+    metrics.inc('summary_requests_total', model=model, status='ok')
+    usage = getattr(completion, 'usage', None)
+    if usage:
+        metrics.inc('summary_tokens_total', usage.total_tokens, model=model)
+    return completion
+
 # ChatGPT를 사용한 텍스트 요약 함수
-def summarize_text(text):
-    completion = client.chat.completions.create(
-        model="gpt-4o-mini",  # 또는 사용 가능한 다른 모델
-        messages=[
-            {"role": "system", "content": "You are a helpful assistant that summarizes text."},
-            {"role": "user", "content": f"한글로 텍스트를 요약해봐:\n\n{text}"}
-        ]
-    )
-    return completion.choices[0].message.content
-
-# 결과 저장 함수
-def save_result(file_name, content):
-    with open(file_name, 'w', encoding='utf-8') as file:
-        json.dump(content, file, ensure_ascii=False, indent=4)
+def summarize_text(text, client: 'OpenAI', model: str = SUMMARY_MODEL):
+    return request_summary(text, client, model).choices[0].message.content
+
+
+class BatchSummarizer:
+    """
+    여러 텍스트를 스레드 풀에서 동시에 요약합니다.
+
+    요청 전에 분당 요청 수(RPM)와 분당 토큰 수(TPM) 버킷에서 예산을 받아 두고,
+    429와 5xx, 연결 오류는 Retry-After 또는 지수 백오프만큼 기다렸다가 다시 시도합니다.
+    cache가 있으면 같은 입력의 요약은 API 호출 없이 캐시에서 돌려줍니다.
+
+    모델의 조각 크기(SUMMARY_CHUNK_TOKENS)를 넘는 문서는 섹션 단위 조각으로 나눠
+    동시에 요약하고, 부분 요약들을 다시 요약해 하나로 합칩니다. 동시에 진행하는
+    API 요청은 파일과 조각을 합쳐 max_workers개를 넘지 않습니다.
+    """
+
+    def __init__(self, client: Optional['OpenAI'] = None, model: str = SUMMARY_MODEL,
+                 max_workers: int = SUMMARY_MAX_WORKERS,
+                 requests_per_minute: float = SUMMARY_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = SUMMARY_TOKENS_PER_MINUTE,
+                 max_retries: int = SUMMARY_MAX_RETRIES,
+                 cache: Optional[SummaryCache] = None,
+                 chunk_tokens: Optional[int] = None):
+        self.client = client or create_client()
+        self.cache = cache
+        self.model = model
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.chunk_tokens = chunk_tokens
+        self._request_slots = threading.BoundedSemaphore(max_workers)
+        self._chunk_executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._request_bucket = TokenBucket(requests_per_minute / 60, requests_per_minute)
+        self._token_bucket = TokenBucket(tokens_per_minute / 60, tokens_per_minute)
+
+    def summarize(self, text: str) -> str:
+        chunks = chunk_text(text, self.model, self.chunk_tokens)
+        if len(chunks) == 1:
+            return self._complete(text, USER_PROMPT)
+
+        logging.debug(f"{len(chunks)}개 조각으로 나눠 요약합니다.")
+        partials = list(self._chunk_executor.map(lambda chunk: self._complete(chunk, CHUNK_PROMPT), chunks))
+        # 부분 요약을 합쳐도 한도를 넘으면 묶음별로 한 번 더 줄입니다.
+        while True:
+            groups = chunk_text('\n\n'.join(partials), self.model, self.chunk_tokens)
+            if len(groups) == 1 or len(groups) >= len(partials):
+                return self._complete('\n\n'.join(partials), REDUCE_PROMPT)
+            partials = list(self._chunk_executor.map(lambda group: self._complete(group, REDUCE_PROMPT), groups))
+
+    def close(self) -> None:
+        self._chunk_executor.shutdown()
+
+    def _complete(self, text: str, prompt: str) -> str:
+        if self.cache is None:
+            return self._request(text, prompt)
+
+        # 조각 단위로 캐시하므로 긴 문서의 한 섹션만 바뀌면 그 조각과 reduce만 다시 요청합니다.
+        key = self.cache.make_key(text, self.model, SYSTEM_PROMPT + prompt)
+        summary = self.cache.get(key)
+        if summary is None:
+            summary = self._request(text, prompt)
+            self.cache.put(key, summary)
+        return summary
+
+    def _request(self, text: str, prompt: str) -> str:
+        estimated = min(count_tokens(prompt.format(text=text), self.model) + SUMMARY_RESPONSE_TOKENS,
+                        self._token_bucket.capacity)
+        for attempt in range(self.max_retries + 1):
+            self._request_bucket.acquire()
+            self._token_bucket.acquire(estimated)
+            try:
+                with self._request_slots:
+                    completion = request_summary(text, self.client, self.model, prompt)
+            except _api_errors() as e:
+                status_code = getattr(e, 'status_code', None)
+                retryable = status_code is None or status_code in RETRYABLE_STATUS_CODES
+                if not retryable or attempt == self.max_retries:
+                    raise
+                delay = self._retry_delay(e, attempt)
+                logging.warning(f"요약 요청 실패({status_code or e.__class__.__name__}), "
+                                f"{delay:.1f}초 후 다시 시도합니다 ({attempt + 1}/{self.max_retries})")
+                metrics.inc('summary_request_retries_total', model=self.model)
+                time.sleep(delay)
+                continue
+
+            usage = getattr(completion, 'usage', None)
+            if usage and usage.total_tokens > estimated:
+                # 어림한 것보다 많이 쓴 토큰은 다음 요청들이 기다리도록 버킷에서 더 뺍니다.
+                self._token_bucket.reserve(usage.total_tokens - estimated)
+            return completion.choices[0].message.content
+
+    def summarize_files(self, file_paths: Iterable[str]) -> Iterator[Dict[str, str]]:
+        """
+        파일들을 동시에 요약하고, 요약이 끝나는 대로 {'file_name', 'sha256', 'summary'}를 내놓습니다.
+        실패한 파일은 로그만 남기고 건너뜁니다.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._summarize_file, path): path for path in file_paths}
+            for future in as_completed(futures):
+                file_name = os.path.basename(futures.pop(future))
+                try:
+                    sha256, summary = future.result()
+                except Exception as e:
+                    # 한 파일의 실패로 나머지 요약을 버리지 않습니다.
+                    logging.error(f"{file_name} 요약 중 오류 발생: {e}")
+                    continue
+                yield {"file_name": file_name, "sha256": sha256, "summary": summary}
+
+    def _summarize_file(self, file_path: str) -> Tuple[str, str]:
+        logging.info(f"Summarizing {os.path.basename(file_path)}...")
+        text = read_text_file(file_path)
+        return text_sha256(text), self.summarize(text)
+
+    @staticmethod
+    def _retry_delay(error: Exception, attempt: int) -> float:
+        response = getattr(error, 'response', None)
+        retry_after = parse_retry_after(response.headers.get('Retry-After')) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, SUMMARY_BACKOFF_MAX)
+        return backoff_delay(attempt, SUMMARY_BACKOFF_BASE, SUMMARY_BACKOFF_MAX)
 
 # 메인 처리 함수
-def process_text_files():
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    export_path = os.path.join(current_dir, '..', 'scrapping', 'export')
-
-    input_dir = export_path  # 입력 파일이 있는 디렉토리 경로
-    output_file = 'summaries.json'  # 결과를 저장할 파일 이름
-    summaries = []
-
-    for file_name in os.listdir(input_dir):
-        if file_name.endswith('.txt'):
-            file_path = os.path.join(input_dir, file_name)
-            text = read_text_file(file_path)
-            
-            print(f"Summarizing {file_name}...")
-            summary = summarize_text(text)
-            
-            summaries.append({
-                "file_name": file_name,
-                "summary": summary
-            })
-    
-    save_result(output_file, summaries)
-    print(f"Summaries saved to {output_file}")
-
-# JSON을 마크다운으로 변환하는 함수
-def json_to_markdown(json_file_path, markdown_file_path):
-    # JSON 파일 읽기
-    with open(json_file_path, 'r', encoding='utf-8') as json_file:
-        summaries = json.load(json_file)
-    
-    # 마크다운 내용 생성
-    markdown_content = "# 텍스트 파일 요약\n\n"
-    
-    for item in summaries:
-        file_name = item['file_name']
-        summary = item['summary']
-        
-        markdown_content += f"## {file_name}\n\n"
-        markdown_content += f"{summary}\n\n"
-        markdown_content += "---\n\n"  # 각 요약 사이에 구분선 추가
-    
-    # 마크다운 파일 저장
+def process_text_files(input_dir: str = EXPORT_DIR, output_file: str = 'summaries.jsonl',
+                       max_workers: int = SUMMARY_MAX_WORKERS, use_cache: bool = SUMMARY_CACHE_ENABLED,
+                       store: Optional[EclassStore] = None):
+    """
+    input_dir의 .txt 파일을 요약해 output_file(JSONL)에 한 줄씩 덧붙입니다.
+
+    이전 실행에서 같은 내용으로 이미 요약한 파일은 건너뛰므로, 중단된 실행은 다시
+    실행하면 이어서 진행됩니다. 내용이 바뀐 파일은 새 레코드로 덧붙습니다.
+    store를 주면 각 요약을 summaries 표에도 저장합니다.
+    """
+    file_paths = [os.path.join(input_dir, file_name)
+                  for file_name in sorted(os.listdir(input_dir)) if file_name.endswith('.txt')]
+
+    with SummaryLog(output_file) as summary_log:
+        completed = summary_log.completed()
+        pending = [path for path in file_paths
+                   if completed.get(os.path.basename(path)) != text_sha256(read_text_file(path))]
+        if len(pending) < len(file_paths):
+            logging.info(f"이미 요약한 파일 {len(file_paths) - len(pending)}개를 건너뜁니다.")
+
+        cache = SummaryCache(SUMMARY_CACHE_DIR, SUMMARY_CACHE_MAX_ENTRIES, SUMMARY_CACHE_MAX_AGE) if use_cache else None
+        summarizer = BatchSummarizer(max_workers=max_workers, cache=cache)
+        written = 0
+        try:
+            for record in summarizer.summarize_files(pending):
+                summary_log.append(record)
+                if store:
+                    store.upsert_summaries([record])
+                written += 1
+        finally:
+            summarizer.close()
+
+    if cache:
+        cache.prune()
+        cache.log_stats()
+    logging.info(f"Summaries saved to {output_file} ({written}/{len(pending)})")
+
+# JSONL을 마크다운으로 변환하는 함수
+def jsonl_to_markdown(jsonl_file_path, markdown_file_path):
+    # 같은 파일의 레코드가 여러 개면 마지막 것만 씁니다. 첫 번째 읽기에서는 위치만 기억합니다.
+    latest = {}
+    for index, record in enumerate(iter_records(jsonl_file_path)):
+        latest[record['file_name']] = index
+
+    # 레코드를 하나씩 읽어 바로 파일에 씁니다.
     with open(markdown_file_path, 'w', encoding='utf-8') as md_file:
-        md_file.write(markdown_content)
+        md_file.write("# 텍스트 파일 요약\n\n")
+        for index, record in enumerate(iter_records(jsonl_file_path)):
+            if latest[record['file_name']] != index:
+                continue
+            md_file.write(f"## {record['file_name']}\n\n")
+            md_file.write(f"{record['summary']}\n\n")
+            md_file.write("---\n\n")  # 각 요약 사이에 구분선 추가
 
     print(f"마크다운 파일이 생성되었습니다: {markdown_file_path}")
 
-# 실행
+# 실행 (저장소 루트에서: python -m processing.ai_processing)
 if __name__ == "__main__":
-    process_text_files()
-    
-    # JSON을 마크다운으로 변환
-    json_file = 'summaries.json'
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    with EclassStore() as store:
+        process_text_files(store=store)
+    print(metrics.REGISTRY.summary_table())
+
+    # JSONL을 마크다운으로 변환
+    jsonl_file = 'summaries.jsonl'
     markdown_file = 'summaries.md'
-    json_to_markdown(json_file, markdown_file)
\ No newline at end of file
+    jsonl_to_markdown(jsonl_file, markdown_file)
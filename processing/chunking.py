@@ -0,0 +1,111 @@
+import re
+from functools import lru_cache
+from typing import List
+
+from config import SUMMARY_CHUNK_TOKENS, SUMMARY_DEFAULT_CHUNK_TOKENS
+
+# PlanMenuHandler._generate_text가 만드는 "[주별강의계획]" 같은 섹션 제목 줄
+SECTION_HEADER = re.compile(r'^\[[^\]\n]+\]\s*$', re.MULTILINE)
+
+
+@lru_cache(maxsize=None)
+def _tiktoken():
+    # tiktoken은 불러오는 데 시간이 걸리므로 처음 토큰을 셀 때 가져옵니다.
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    return tiktoken
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    tiktoken = _tiktoken()
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding('o200k_base')
+
+
+def count_tokens(text: str, model: str) -> int:
+    """
+    text의 토큰 수를 셉니다. tiktoken이 없으면 넉넉하게 어림합니다.
+    (한글 한 글자, 즉 UTF-8 3바이트를 토큰 하나로 봅니다.)
+    """
+    if _tiktoken() is not None:
+        return len(_encoding(model).encode(text, disallowed_special=()))
+    return len(text.encode('utf-8')) // 3 + 1
+
+
+def chunk_tokens_for(model: str) -> int:
+    return SUMMARY_CHUNK_TOKENS.get(model, SUMMARY_DEFAULT_CHUNK_TOKENS)
+
+
+def split_sections(text: str) -> List[str]:
+    """섹션 제목 줄 앞에서 나눕니다. 첫 제목 앞의 내용은 별도 섹션이 됩니다."""
+    starts = [match.start() for match in SECTION_HEADER.finditer(text)]
+    bounds = [0] + [start for start in starts if start > 0] + [len(text)]
+    sections = (text[begin:end] for begin, end in zip(bounds, bounds[1:]))
+    return [section for section in sections if section.strip()]
+
+
+def chunk_text(text: str, model: str, max_tokens: int = None) -> List[str]:
+    """
+    섹션 경계를 지키면서 max_tokens 이하의 조각으로 나눕니다.
+
+    이어지는 섹션은 한도 안에서 한 조각에 모읍니다. 한 섹션이 한도를 넘으면 빈 줄,
+    줄 단위로 차례로 나누고, 나뉜 조각 앞에는 섹션 제목을 다시 붙여 맥락을 유지합니다.
+    """
+    max_tokens = max_tokens or chunk_tokens_for(model)
+    if count_tokens(text, model) <= max_tokens:
+        return [text]
+
+    pieces = []
+    for section in split_sections(text):
+        pieces.extend(_split_section(section, model, max_tokens))
+    return _pack(pieces, model, max_tokens)
+
+
+def _split_section(section: str, model: str, max_tokens: int) -> List[str]:
+    if count_tokens(section, model) <= max_tokens:
+        return [section]
+
+    header = ''
+    match = SECTION_HEADER.match(section)
+    if match:
+        header = match.group(0).strip() + '\n'
+        section = section[match.end():]
+    budget = max(1, max_tokens - count_tokens(header, model))
+
+    parts = []
+    for separator in ('\n\n', '\n'):
+        parts = [part + separator for part in section.split(separator) if part.strip()]
+        if all(count_tokens(part, model) <= budget for part in parts):
+            break
+    else:
+        # 한 줄이 한도를 넘는 경우입니다. 글자 수로 자릅니다.
+        parts = [piece for part in parts for piece in _split_by_length(part, model, budget)]
+
+    return [header + chunk for chunk in _pack(parts, model, budget)]
+
+
+def _split_by_length(text: str, model: str, max_tokens: int) -> List[str]:
+    if count_tokens(text, model) <= max_tokens:
+        return [text]
+    middle = len(text) // 2
+    return _split_by_length(text[:middle], model, max_tokens) + _split_by_length(text[middle:], model, max_tokens)
+
+
+def _pack(parts: List[str], model: str, max_tokens: int) -> List[str]:
+    """순서를 유지하며 이어지는 조각들을 max_tokens 안에서 하나로 합칩니다."""
+    chunks, current, current_tokens = [], [], 0
+    for part in parts:
+        tokens = count_tokens(part, model)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(''.join(current))
+            current, current_tokens = [], 0
+        current.append(part)
+        current_tokens += tokens
+    if current:
+        chunks.append(''.join(current))
+    return chunks
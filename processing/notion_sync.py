@@ -0,0 +1,255 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Tuple
+
+import requests
+
+from config import (
+    get_config, NOTION_API_URL, NOTION_VERSION, NOTION_REQUESTS_PER_SECOND, NOTION_BATCH_SIZE,
+    NOTION_MAX_RETRIES, REQUEST_BACKOFF_BASE, REQUEST_BACKOFF_MAX, REQUEST_CONNECT_TIMEOUT, REQUEST_READ_TIMEOUT,
+)
+from scrapping.rate_limiter import TokenBucket
+from scrapping.retry import RETRYABLE_STATUS_CODES, backoff_delay, parse_retry_after
+from scrapping.store import EclassStore, WEEKLY_PLAN_SECTION
+
+# Notion rich_text 한 덩어리의 최대 길이
+RICH_TEXT_LIMIT = 2000
+
+# 동기화하는 항목 종류. config.ini [notion] 섹션에 같은 이름으로 데이터베이스 ID를 적습니다.
+# (예: notices_database = 0123...) ID가 없는 항목은 건너뜁니다. 과목을 먼저 동기화해야 관계 속성을 채울 수 있습니다.
+ENTITIES = ('courses', 'notices', 'materials', 'plan_weeks', 'summaries')
+
+
+class NotionError(RuntimeError):
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class PageRow(NamedTuple):
+    key: str                     # 로컬 자연 키 (예: "과목ID:글번호")
+    properties: Dict[str, Any]   # Notion 속성 이름 → 속성 값
+
+
+def title(text: str) -> Dict[str, Any]:
+    return {'title': [{'text': {'content': (text or '')[:RICH_TEXT_LIMIT]}}]}
+
+
+def rich_text(text: Optional[str]) -> Dict[str, Any]:
+    text = text or ''
+    chunks = [text[i:i + RICH_TEXT_LIMIT] for i in range(0, len(text), RICH_TEXT_LIMIT)][:100]
+    return {'rich_text': [{'text': {'content': chunk}} for chunk in chunks]}
+
+
+def url(value: Optional[str]) -> Dict[str, Any]:
+    return {'url': value or None}
+
+
+def relation(page_id: Optional[str]) -> Dict[str, Any]:
+    return {'relation': [{'id': page_id}] if page_id else []}
+
+
+def property_hash(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+class NotionClient:
+    """
+    Notion API 클라이언트입니다.
+
+    초당 요청 수를 NOTION_REQUESTS_PER_SECOND로 제한하고, 429와 5xx는 Retry-After 또는
+    지수 백오프만큼 기다렸다가 다시 시도합니다. base_url을 바꾸면 모의 서버로 요청합니다.
+    """
+
+    def __init__(self, token: str, base_url: str = NOTION_API_URL,
+                 requests_per_second: float = NOTION_REQUESTS_PER_SECOND,
+                 max_retries: int = NOTION_MAX_RETRIES):
+        self.base_url = base_url.rstrip('/')
+        self.max_retries = max_retries
+        self.bucket = TokenBucket(requests_per_second, requests_per_second)
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Authorization': f'Bearer {token}',
+            'Notion-Version': NOTION_VERSION,
+            'Content-Type': 'application/json',
+        })
+
+    def create_page(self, database_id: str, properties: Dict[str, Any]) -> str:
+        response = self._request('POST', '/pages', {'parent': {'database_id': database_id}, 'properties': properties})
+        return response['id']
+
+    def update_page(self, page_id: str, properties: Dict[str, Any]) -> None:
+        self._request('PATCH', f'/pages/{page_id}', {'properties': properties})
+
+    def _request(self, method: str, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                response = self.session.request(method, self.base_url + path, json=payload,
+                                                timeout=(REQUEST_CONNECT_TIMEOUT, REQUEST_READ_TIMEOUT))
+            except requests.RequestException as e:
+                if attempt == self.max_retries:
+                    raise NotionError(f"Notion 요청 실패: {e}") from e
+                time.sleep(backoff_delay(attempt, REQUEST_BACKOFF_BASE, REQUEST_BACKOFF_MAX))
+                continue
+
+            if response.status_code in RETRYABLE_STATUS_CODES and attempt < self.max_retries:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                delay = min(retry_after, REQUEST_BACKOFF_MAX) if retry_after is not None \
+                    else backoff_delay(attempt, REQUEST_BACKOFF_BASE, REQUEST_BACKOFF_MAX)
+                logging.warning(f"Notion 응답 {response.status_code}, {delay:.1f}초 후 다시 시도합니다.")
+                time.sleep(delay)
+                continue
+            if response.status_code >= 400:
+                raise NotionError(f"Notion 응답 {response.status_code}: {response.text[:200]}", response.status_code)
+            return response.json()
+
+
+class NotionSync:
+    """
+    EclassStore의 데이터를 Notion 데이터베이스 행으로 동기화합니다.
+
+    만든 페이지 ID와 속성별 해시를 로컬 저장소(notion_pages 표)에 기록해 두므로,
+    Notion을 먼저 조회하지 않고 새 항목은 만들고 바뀐 속성만 보냅니다.
+    요청은 NOTION_BATCH_SIZE개씩 동시에 보내고, 결과는 묶음마다 한 트랜잭션으로 기록합니다.
+    """
+
+    def __init__(self, store: EclassStore, client: NotionClient, databases: Dict[str, str],
+                 batch_size: int = NOTION_BATCH_SIZE):
+        self.store = store
+        self.client = client
+        self.databases = databases
+        self.batch_size = batch_size
+        self.stats = {'created': 0, 'updated': 0, 'unchanged': 0, 'failed': 0}
+        self._stats_lock = threading.Lock()
+
+    def sync(self) -> Dict[str, int]:
+        for entity in ENTITIES:
+            database_id = self.databases.get(entity)
+            if database_id:
+                self.sync_entity(entity, database_id, getattr(self, f'_{entity}_rows')())
+        logging.info(f"Notion 동기화: 생성 {self.stats['created']}, 갱신 {self.stats['updated']}, "
+                     f"변경 없음 {self.stats['unchanged']}, 실패 {self.stats['failed']}")
+        return self.stats
+
+    def sync_entity(self, entity: str, database_id: str, rows: Iterator[PageRow]) -> None:
+        known = self.store.get_notion_pages(entity)
+        operations = []
+        for row in rows:
+            hashes = {name: property_hash(value) for name, value in row.properties.items()}
+            page_id, previous = known.get(row.key, (None, {}))
+            changed = {name: value for name, value in row.properties.items() if previous.get(name) != hashes[name]}
+            if not changed:
+                self._count('unchanged')
+                continue
+            operations.append((row.key, page_id, changed, row.properties, hashes))
+
+        # 요청 속도는 client의 버킷이 제한하므로 동시에 보내도 초당 한도를 넘지 않습니다.
+        with ThreadPoolExecutor(max_workers=max(1, int(self.client.bucket.rate))) as executor:
+            for start in range(0, len(operations), self.batch_size):
+                batch = operations[start:start + self.batch_size]
+                results = list(executor.map(lambda op: self._apply(database_id, *op), batch))
+                self.store.save_notion_pages(entity, [result for result in results if result])
+
+    def _apply(self, database_id: str, key: str, page_id: Optional[str], changed: Dict[str, Any],
+               properties: Dict[str, Any], hashes: Dict[str, str]) -> Optional[Tuple[str, str, Dict[str, str]]]:
+        try:
+            if page_id:
+                try:
+                    self.client.update_page(page_id, changed)
+                    self._count('updated')
+                    return key, page_id, hashes
+                except NotionError as e:
+                    if e.status_code != 404:
+                        raise
+                    # Notion에서 직접 지운 페이지는 모든 속성으로 다시 만듭니다.
+                    logging.warning(f"Notion 페이지 {page_id}({key})가 없어 다시 만듭니다.")
+            page_id = self.client.create_page(database_id, properties)
+            self._count('created')
+        except NotionError as e:
+            # 실패한 항목은 기록하지 않으므로 다음 동기화에서 다시 시도합니다.
+            logging.error(f"Notion 동기화 실패({key}): {e}")
+            self._count('failed')
+            return None
+        return key, page_id, hashes
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _course_pages(self) -> Dict[str, str]:
+        return {key: page_id for key, (page_id, _) in self.store.get_notion_pages('courses').items()}
+
+    def _courses_rows(self) -> Iterator[PageRow]:
+        for row in self.store.query("SELECT id, name, code, time FROM courses ORDER BY id"):
+            yield PageRow(row['id'], {
+                '이름': title(row['name']),
+                '코드': rich_text(row['code']),
+                '시간': rich_text(row['time']),
+            })
+
+    def _notices_rows(self) -> Iterator[PageRow]:
+        course_pages = self._course_pages()
+        for row in self.store.query("SELECT * FROM notices ORDER BY course_id, number"):
+            yield PageRow(f"{row['course_id']}:{row['number']}", {
+                '제목': title(row['title']),
+                '번호': rich_text(row['number']),
+                '작성자': rich_text(row['author']),
+                '날짜': rich_text(row['date']),
+                '링크': url(row['detail_url']),
+                '과목': relation(course_pages.get(row['course_id'])),
+            })
+
+    def _materials_rows(self) -> Iterator[PageRow]:
+        course_pages = self._course_pages()
+        for row in self.store.query("SELECT * FROM materials ORDER BY course_id, article_num"):
+            yield PageRow(f"{row['course_id']}:{row['article_num']}", {
+                '제목': title(row['title']),
+                '번호': rich_text(row['number']),
+                '날짜': rich_text(row['date']),
+                '파일': rich_text(row['file']),
+                '내용': rich_text(row['content']),
+                '과목': relation(course_pages.get(row['course_id'])),
+            })
+
+    def _plan_weeks_rows(self) -> Iterator[PageRow]:
+        course_pages = self._course_pages()
+        rows = self.store.query(
+            "SELECT p.*, c.name AS course_name FROM plan_sections p LEFT JOIN courses c ON c.id = p.course_id "
+            "WHERE p.section = ? ORDER BY p.course_id, p.position", (WEEKLY_PLAN_SECTION,))
+        for row in rows:
+            yield PageRow(f"{row['course_id']}:{row['item_key']}", {
+                '주차': title(f"{row['course_name'] or row['course_id']} {row['item_key']}주차"),
+                '내용': rich_text(row['value']),
+                '비고': rich_text(row['note']),
+                '과목': relation(course_pages.get(row['course_id'])),
+            })
+
+    def _summaries_rows(self) -> Iterator[PageRow]:
+        for row in self.store.query("SELECT file_name, summary FROM summaries ORDER BY file_name"):
+            yield PageRow(row['file_name'], {
+                '파일': title(row['file_name']),
+                '요약': rich_text(row['summary']),
+            })
+
+
+def sync_to_notion(store: EclassStore, config=None) -> Dict[str, int]:
+    """config.ini의 [notion] 섹션(token, base_url, <항목>_database)으로 동기화합니다."""
+    config = config or get_config()
+    if not config.has_section('notion'):
+        logging.error("config.ini에 [notion] 섹션이 없어 Notion 동기화를 건너뜁니다.")
+        return {}
+    notion = config['notion']
+    client = NotionClient(notion['token'], notion.get('base_url') or NOTION_API_URL)
+    databases = {entity: notion.get(f'{entity}_database') for entity in ENTITIES}
+    return NotionSync(store, client, databases).sync()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    with EclassStore() as store:
+        sync_to_notion(store)
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import unicodedata
+from typing import Optional
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """공백 차이와 유니코드 정규화 차이만 있는 텍스트가 같은 키를 갖도록 정리합니다."""
+    return _WHITESPACE.sub(' ', unicodedata.normalize('NFC', text)).strip()
+
+
+class SummaryCache:
+    """
+    요약 결과를 디스크에 저장하는 캐시입니다.
+
+    키는 (정규화한 입력 텍스트, 모델, 프롬프트)의 해시이므로 내보낸 파일이 바뀌지 않았다면
+    API를 다시 호출하지 않습니다. 적중한 항목은 파일 수정 시각을 갱신하고, prune()은
+    max_age보다 오래된 항목을 지운 뒤 max_entries를 넘는 만큼 오래 쓰이지 않은 항목부터 지웁니다.
+    """
+
+    def __init__(self, directory: str, max_entries: int, max_age: float):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evicted': 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text: str, model: str, prompt: str) -> str:
+        raw = json.dumps([normalize_text(text), model, prompt], ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+            if time.time() - entry['stored_at'] >= self.max_age:
+                os.remove(path)
+                raise FileNotFoundError(path)
+            os.utime(path)
+        except FileNotFoundError:
+            self._count('misses')
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logging.warning(f"요약 캐시 항목을 읽을 수 없습니다({key}): {e}")
+            self._count('misses')
+            return None
+        self._count('hits')
+        return entry['summary']
+
+    def put(self, key: str, summary: str) -> None:
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.entry-')
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump({'summary': summary, 'stored_at': time.time()}, file, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning(f"요약 캐시 저장 중 오류 발생: {e}")
+            return
+        self._count('stores')
+
+    def prune(self) -> int:
+        """오래되었거나 개수 제한을 넘는 항목을 지우고 지운 개수를 반환합니다."""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.json'):
+                    path = os.path.join(root, name)
+                    try:
+                        entries.append((os.path.getmtime(path), path))
+                    except OSError:
+                        continue
+
+        now = time.time()
+        entries.sort(reverse=True)  # 최근에 쓰인 순서
+        expired = [path for mtime, path in entries if now - mtime >= self.max_age]
+        kept = [path for mtime, path in entries if now - mtime < self.max_age]
+        removed = 0
+        for path in expired + kept[self.max_entries:]:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                continue
+        with self._lock:
+            self.stats['evicted'] += removed
+        return removed
+
+    def log_stats(self) -> None:
+        stats = self.stats
+        logging.info(
+            f"요약 캐시: 적중 {stats['hits']}, 미적중 {stats['misses']}, "
+            f"저장 {stats['stores']}, 정리 {stats['evicted']}")
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
@@ -0,0 +1,83 @@
+import json
+import logging
+import os
+import threading
+from typing import Dict, Iterator
+
+
+def iter_records(path: str) -> Iterator[Dict[str, str]]:
+    """JSONL 파일의 레코드를 한 줄씩 읽습니다. 깨진 줄은 건너뜁니다."""
+    try:
+        file = open(path, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        return
+    with file:
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                logging.warning(f"{path}:{line_number} 줄을 읽을 수 없어 건너뜁니다.")
+
+
+class SummaryLog:
+    """
+    요약 결과를 한 줄에 하나씩 덧붙이는 JSONL 파일입니다.
+
+    레코드마다 flush와 fsync를 하므로 중간에 프로세스가 죽어도 이미 쓴 요약은 남고,
+    다음 실행은 completed()로 끝난 파일을 확인해 이어서 진행합니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._truncate_partial_line()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def completed(self) -> Dict[str, str]:
+        """이미 요약한 파일 이름 → 그때 입력의 sha256. 같은 파일이 여러 번 있으면 마지막 것입니다."""
+        return {record['file_name']: record.get('sha256', '') for record in iter_records(self.path)}
+
+    def append(self, record: Dict[str, str]) -> None:
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> 'SummaryLog':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _truncate_partial_line(self) -> None:
+        # 쓰는 도중 중단되어 줄바꿈 없이 끝난 마지막 레코드는 잘라 냅니다.
+        # 파일 전체를 읽지 않도록 끝에서부터 블록 단위로 마지막 줄바꿈을 찾습니다.
+        try:
+            file = open(self.path, 'rb+')
+        except FileNotFoundError:
+            return
+        with file:
+            end = file.seek(0, os.SEEK_END)
+            if end == 0:
+                return
+            file.seek(end - 1)
+            if file.read(1) == b'\n':
+                return
+
+            position = end
+            while position > 0:
+                start = max(0, position - 65536)
+                file.seek(start)
+                newline = file.read(position - start).rfind(b'\n')
+                if newline != -1:
+                    position = start + newline + 1
+                    break
+                position = start
+            logging.warning(f"{self.path}의 마지막 레코드가 완전하지 않아 잘라 냅니다.")
+            file.truncate(position)
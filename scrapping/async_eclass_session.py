@@ -0,0 +1,345 @@
+import asyncio
+import configparser
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import aiohttp
+from yarl import URL
+
+from config import (
+    LOGIN_URL, MAIN_URL, COURSE_ACCESS_URL, ASYNC_MAX_CONCURRENCY,
+    REQUEST_CONNECT_TIMEOUT, REQUEST_READ_TIMEOUT, REQUEST_MAX_RETRIES,
+    REQUEST_BACKOFF_BASE, REQUEST_BACKOFF_MAX, RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST,
+    RESPONSE_CACHE_ENABLED, RESPONSE_CACHE_DIR, RESPONSE_CACHE_TTLS, RESPONSE_CACHE_COURSE_SCOPED,
+)
+from . import metrics
+from .response_cache import CacheEntry, ResponseCache
+from .course_registry import CourseRegistry
+from .cookie_store import cookie_from_morsel, load_cookie_jar, save_cookie_jar
+from .rate_limiter import HostRateLimiter
+from .retry import RETRYABLE_STATUS_CODES, backoff_delay, parse_retry_after
+from .eclass_session import (
+    Course,
+    CourseAccessError,
+    EclassRequestError,
+    MenuType,
+    DEFAULT_HEADERS,
+    build_course_access_data,
+    build_login_data,
+    credentials_section,
+    default_cookie_path,
+    is_login_page,
+    is_login_success,
+    load_session_config,
+    parse_course_list,
+    parse_course_menus,
+)
+
+
+class _FetchedResponse(NamedTuple):
+    status: int
+    url: str
+    text: str
+    headers: Dict[str, str]
+
+
+class AsyncEclassSession:
+    """
+    EclassSession의 asyncio 버전입니다.
+
+    하나의 aiohttp 세션과 쿠키 저장소를 모든 요청이 공유하고, 동시에 진행되는
+    요청 수는 max_concurrency로 제한합니다. 메서드 이름과 반환값은 EclassSession과
+    같으므로 핸들러의 collect_async에서 그대로 사용할 수 있습니다.
+    """
+
+    def __init__(self, config_path: str = 'config.ini', max_concurrency: int = ASYNC_MAX_CONCURRENCY,
+                 cookie_jar: Optional[aiohttp.CookieJar] = None, config: Optional[configparser.ConfigParser] = None,
+                 cookie_path: Optional[str] = None, use_cache: bool = RESPONSE_CACHE_ENABLED,
+                 profile: Optional[str] = None):
+        self.user_id = None
+        section = credentials_section(profile)
+        self.config = config if config is not None else load_session_config(config_path, section)
+        credentials = self.config[section]
+        self.headers = dict(DEFAULT_HEADERS)
+        self.username = credentials['username']
+        self.password = credentials['password']
+        self.cookie_path = cookie_path or default_cookie_path(self.username)
+        self.cache = ResponseCache(RESPONSE_CACHE_DIR, RESPONSE_CACHE_TTLS, namespace=self.username,
+                                   course_scoped=RESPONSE_CACHE_COURSE_SCOPED) if use_cache else None
+        self.max_concurrency = max_concurrency
+        self.cookie_jar = cookie_jar
+        self._client: Optional[aiohttp.ClientSession] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.timeout = aiohttp.ClientTimeout(connect=REQUEST_CONNECT_TIMEOUT, sock_read=REQUEST_READ_TIMEOUT)
+        self.max_retries = REQUEST_MAX_RETRIES
+        self.rate_limiter = HostRateLimiter(credentials.getfloat('rate_limit', RATE_LIMIT_PER_SECOND),
+                                            credentials.getfloat('rate_burst', RATE_LIMIT_BURST))
+        self._login_lock = asyncio.Lock()
+        self._login_generation = 0
+
+        self._course_cond = asyncio.Condition()
+        self._course_users = 0
+        self.courses = CourseRegistry()
+
+    async def __aenter__(self) -> 'AsyncEclassSession':
+        self._ensure_client()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    def _ensure_client(self) -> aiohttp.ClientSession:
+        if self._client is None or self._client.closed:
+            if self.cookie_jar is None:
+                self.cookie_jar = aiohttp.CookieJar()
+            self._client = aiohttp.ClientSession(
+                headers=self.headers,
+                cookie_jar=self.cookie_jar,
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+                timeout=self.timeout,
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None and not self._client.closed:
+            await self._client.close()
+
+    async def _fetch_text(self, method: str, url: str, data: Optional[Dict[str, Any]] = None,
+                          relogin: bool = True) -> str:
+        """응답 캐시를 거쳐 본문을 가져옵니다. EclassSession._fetch_text와 같은 규칙을 따릅니다."""
+        ttl = self.cache.ttl_for(url) if self.cache else None
+        key = self.cache.make_key(method, url, data, self.courses.entered_course) if ttl is not None else None
+        if key is None:
+            return (await self._fetch(method, url, data, relogin=relogin)).text
+
+        entry = self.cache.get(key)
+        if entry and entry.is_fresh(ttl):
+            self.cache.record_hit(url)
+            return entry.body
+
+        headers = entry.conditional_headers() if entry else {}
+        response = await self._fetch(method, url, data, headers=headers, relogin=relogin)
+        if response.status == 304 and entry:
+            entry.stored_at = time.time()
+            self.cache.put(key, entry)
+            self.cache.record_revalidated(url)
+            return entry.body
+
+        self.cache.record_miss(url)
+        if not is_login_page(response.url, response.text):
+            self.cache.put(key, CacheEntry(
+                url=url,
+                body=response.text,
+                stored_at=time.time(),
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+            ))
+        return response.text
+
+    async def _fetch(self, method: str, url: str, data: Optional[Dict[str, Any]] = None,
+                     headers: Optional[Dict[str, str]] = None, relogin: bool = True) -> _FetchedResponse:
+        """
+        EclassSession._request와 같은 정책(속도 제한, 타임아웃, 백오프 재시도)으로 요청합니다.
+
+        :raises EclassRequestError: 재시도 후에도 실패했거나 재시도할 수 없는 오류인 경우
+        """
+        client = self._ensure_client()
+        generation = self._login_generation
+        last_error = None
+        status_code = None
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire_async(url)
+            retry_after = None
+            started = None
+            try:
+                async with self._semaphore:
+                    # 동시성 제한을 기다린 시간은 빼고 잽니다.
+                    started = time.perf_counter()
+                    async with client.request(method, url, data=data, headers=headers) as response:
+                        status_code = response.status
+                        if status_code in RETRYABLE_STATUS_CODES:
+                            metrics.record_request(url, str(status_code), time.perf_counter() - started)
+                            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                            last_error = aiohttp.ClientResponseError(
+                                response.request_info, response.history, status=status_code, message=response.reason or '')
+                        else:
+                            try:
+                                response.raise_for_status()
+                            except aiohttp.ClientResponseError as e:
+                                metrics.record_request(url, str(status_code), time.perf_counter() - started)
+                                raise EclassRequestError(f"{method} {url} 요청 실패: {e}", status_code) from e
+                            text = await response.text()
+                            size = response.content_length if response.content_length is not None else len(text.encode('utf-8'))
+                            metrics.record_request(url, str(status_code), time.perf_counter() - started, size)
+                            fetched = _FetchedResponse(status_code, str(response.url), text, dict(response.headers))
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if started is not None:
+                    metrics.record_request(url, 'error', time.perf_counter() - started)
+                last_error = e
+            except aiohttp.ClientError as e:
+                if started is not None:
+                    metrics.record_request(url, 'error', time.perf_counter() - started)
+                raise EclassRequestError(f"{method} {url} 요청 실패: {e}") from e
+            else:
+                if status_code not in RETRYABLE_STATUS_CODES:
+                    if relogin and self.user_id and is_login_page(fetched.url, fetched.text):
+                        await self._relogin(generation)
+                        return await self._fetch(method, url, data, headers=headers, relogin=False)
+                    return fetched
+
+            if attempt < self.max_retries:
+                delay = min(retry_after, REQUEST_BACKOFF_MAX) if retry_after is not None else backoff_delay(attempt, REQUEST_BACKOFF_BASE, REQUEST_BACKOFF_MAX)
+                logging.warning(f"{method} {url} 요청 실패({last_error}), {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+                metrics.record_retry(url)
+                await asyncio.sleep(delay)
+
+        raise EclassRequestError(f"{method} {url} 요청이 {self.max_retries + 1}회 모두 실패했습니다: {last_error}", status_code) from last_error
+
+    async def login(self) -> bool:
+        login_data = build_login_data(self.username, self.password)
+        try:
+            text = await self._fetch_text("POST", LOGIN_URL, login_data, relogin=False)
+            if is_login_success(text):
+                self.user_id = self.username  # 로그인 성공 시 user_id 설정
+                self._login_generation += 1
+                self.courses.leave()
+                self.save_cookies()
+                return True
+            return False
+        except EclassRequestError as e:
+            logging.error(f"로그인 중 오류 발생: {e}")
+            return False
+
+    async def ensure_login(self) -> bool:
+        """EclassSession.ensure_login의 asyncio 버전입니다."""
+        if self._restore_cookies() and await self._probe_session():
+            self.user_id = self.username
+            logging.info("저장된 세션을 재사용합니다.")
+            return True
+        return await self.login()
+
+    def save_cookies(self) -> None:
+        if self.cookie_jar is None:
+            return
+        try:
+            save_cookie_jar((cookie_from_morsel(morsel) for morsel in self.cookie_jar), self.cookie_path)
+        except OSError as e:
+            logging.warning(f"쿠키 저장 중 오류 발생: {e}")
+
+    def _restore_cookies(self) -> bool:
+        jar = load_cookie_jar(self.cookie_path)
+        if not jar:
+            return False
+        self._ensure_client()
+        for cookie in jar:
+            scheme = 'https' if cookie.secure else 'http'
+            self.cookie_jar.update_cookies(
+                {cookie.name: cookie.value}, response_url=URL(f"{scheme}://{cookie.domain.lstrip('.')}{cookie.path}"))
+        return True
+
+    async def _probe_session(self) -> bool:
+        try:
+            response = await self._fetch("GET", MAIN_URL, relogin=False)
+        except EclassRequestError as e:
+            logging.warning(f"저장된 세션 확인 중 오류 발생: {e}")
+            return False
+        if is_login_page(response.url, response.text):
+            return False
+        # 확인에 쓴 메인 페이지로 과목 목록을 미리 채워 get_course_list 요청을 아낍니다.
+        self.courses.set_courses(parse_course_list(response.text))
+        return True
+
+    async def _relogin(self, generation: int) -> None:
+        async with self._login_lock:
+            if self._login_generation != generation:
+                return  # 다른 작업이 이미 다시 로그인했습니다.
+            entered_course = self.courses.entered_course
+            logging.info("세션이 만료되어 다시 로그인합니다.")
+            if not await self.login():
+                raise EclassRequestError("세션이 만료되었고 다시 로그인하지 못했습니다.")
+            # 새 서버 세션에는 현재 과목이 없으므로, 진행 중인 과목 작업을 위해 다시 진입합니다.
+            if entered_course:
+                self.courses.enter(entered_course, await self.access_course(entered_course))
+
+    def get_user_id(self):
+        return self.user_id
+
+    async def get_course_list(self, refresh: bool = False) -> List[Course]:
+        if not refresh:
+            courses = self.courses.get_courses()
+            if courses is not None:
+                return courses
+        try:
+            courses = parse_course_list(await self._fetch_text("GET", MAIN_URL))
+            self.courses.set_courses(courses)
+            return courses
+        except EclassRequestError as e:
+            logging.error(f"과목 목록 가져오기 중 오류 발생: {e}")
+            return []
+
+    async def post_request(self, url: str, data: Dict[str, Any]) -> str:
+        return await self._fetch_text("POST", url, data)
+
+    async def access_course(self, course_id: str) -> Optional[str]:
+        data = build_course_access_data(course_id)
+        try:
+            json_data = json.loads(await self._fetch_text("POST", COURSE_ACCESS_URL, data))
+            if json_data.get('isError'):
+                logging.error(f"과목 접근 실패: {json_data.get('message')}")
+                return None
+            return json_data.get('returnURL')
+        except (EclassRequestError, json.JSONDecodeError) as e:
+            logging.error(f"과목 접근 중 오류 발생: {e}")
+            return None
+
+    @asynccontextmanager
+    async def course_context(self, course_id: str):
+        """EclassSession.course_context의 asyncio 버전입니다."""
+        async with self._course_cond:
+            while self._course_users and self.courses.entered_course != course_id:
+                await self._course_cond.wait()
+            if not self.courses.is_entered(course_id):
+                # 이미 같은 과목에 들어와 있으면 eclass_room2.acl 요청을 생략합니다.
+                self.courses.enter(course_id, await self.access_course(course_id))
+                if not self.courses.is_entered(course_id):
+                    raise CourseAccessError(f"과목에 진입할 수 없습니다: {course_id}")
+            self._course_users += 1
+            access_url = self.courses.entered_course_url
+        try:
+            yield access_url
+        finally:
+            async with self._course_cond:
+                self._course_users -= 1
+                self._course_cond.notify_all()
+
+    async def get_course_menus(self, course_id: str, refresh: bool = False) -> Dict[MenuType, Dict[str, str]]:
+        if not refresh:
+            menus = self.courses.get_menus(course_id)
+            if menus is not None:
+                return menus
+        try:
+            async with self.course_context(course_id) as access_url:
+                menus = parse_course_menus(await self._fetch_text("GET", access_url))
+                if menus:
+                    self.courses.set_menus(course_id, menus)
+                return menus
+        except CourseAccessError as e:
+            logging.error(str(e))
+            return {}
+        except EclassRequestError as e:
+            logging.error(f"과목 메뉴 가져오기 중 오류 발생: {e}")
+            return {}
+
+    def invalidate(self, course_id: Optional[str] = None) -> None:
+        self.courses.invalidate(course_id)
+
+    async def get_page_content(self, url: str, method: str = "GET", data: dict = None) -> str:
+        if method.upper() not in ("GET", "POST"):
+            raise ValueError(f"지원하지 않는 HTTP 메서드입니다: {method}")
+        return await self._fetch_text(method.upper(), url, data if method.upper() == "POST" else None)
+
+    async def get_request(self, url: str) -> str:
+        return await self._fetch_text("GET", url)
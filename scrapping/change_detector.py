@@ -0,0 +1,170 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set
+
+from .models import MenuType
+from .store import EclassStore, WEEKLY_PLAN_SECTION
+
+CREATED = 'created'
+UPDATED = 'updated'
+DELETED = 'deleted'
+
+
+@dataclass
+class ChangeEvent:
+    kind: str        # created, updated, deleted
+    course_id: str
+    item_type: str  # notice, material, plan_week, plan, assignment
+    item_key: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    account: Optional[str] = None  # 계정마다 다른 메뉴(여러 계정 수집의 개인 메뉴)의 계정 프로필
+    detected_at: str = field(default_factory=lambda: datetime.now().isoformat(timespec='seconds'))
+
+
+class ItemSet(NamedTuple):
+    item_type: str
+    items: Dict[str, Dict[str, Any]]  # 항목 키 → 지문에 쓸 필드
+    complete: bool                     # 전체 목록이면 True. 빠진 항목을 삭제로 봅니다.
+
+
+def fingerprint(fields: Dict[str, Any]) -> str:
+    raw = json.dumps(fields, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def _notice_items(notices) -> List[ItemSet]:
+    # 조회수는 매번 바뀌므로 지문에서 뺍니다. 목록은 첫 페이지(또는 알려진 글까지)뿐이라 삭제는 판단하지 않습니다.
+    items = {notice.number: {'title': notice.title, 'author': notice.author, 'date': notice.date,
+                             'detail_url': notice.detail_url}
+             for notice in notices if notice.number}
+    return [ItemSet('notice', items, complete=False)]
+
+
+def _material_items(materials) -> List[ItemSet]:
+    items = {material.article_num: {'number': material.number, 'title': material.title,
+                                    'date': material.date, 'file': material.file}
+             for material in materials if material.article_num}
+    return [ItemSet('material', items, complete=True)]
+
+
+def _plan_items(plan_info) -> List[ItemSet]:
+    weeks, entries = {}, {}
+    for section, content in plan_info.items():
+        if section == WEEKLY_PLAN_SECTION:
+            weeks.update((week['주차'], {'content': week['내용'], 'note': week['비고']}) for week in content)
+        else:
+            entries.update((f"{section} {key}", {'value': value}) for key, value in content.items())
+    return [ItemSet('plan_week', weeks, complete=True), ItemSet('plan', entries, complete=True)]
+
+
+def _assignment_items(assignments) -> List[ItemSet]:
+    items = {assignment['title']: dict(assignment) for assignment in assignments}
+    return [ItemSet('assignment', items, complete=True)]
+
+
+# 메뉴 결과 → 비교할 항목들
+ITEM_EXTRACTORS: Dict[MenuType, Callable[[Any], List[ItemSet]]] = {
+    MenuType.NOTICE: _notice_items,
+    MenuType.LECTURE_MATERIAL: _material_items,
+    MenuType.PLAN: _plan_items,
+    MenuType.ASSIGNMENT: _assignment_items,
+}
+
+# 수집할 때 이미 알고 있는 항목을 건너뛸 수 있는 메뉴의 항목 종류
+INCREMENTAL_ITEM_TYPES = {
+    MenuType.NOTICE: 'notice',
+    MenuType.LECTURE_MATERIAL: 'material',
+}
+
+
+class ChangeDetector:
+    """
+    수집 결과를 이전 수집 때 저장한 항목별 지문과 비교해 변경 이벤트를 만듭니다.
+
+    지문은 EclassStore의 fingerprints 표에 저장됩니다. 이벤트는 on_event 콜백으로
+    전달되고, feed_path가 있으면 JSONL 파일에 한 줄씩 덧붙습니다.
+    """
+
+    def __init__(self, store: EclassStore, on_event: Optional[Callable[[ChangeEvent], None]] = None,
+                 feed_path: Optional[str] = None):
+        self.store = store
+        self.on_event = on_event
+        self.feed_path = feed_path
+        self._feed_lock = threading.Lock()
+
+    def known_keys(self, course_id: str, menu_type: MenuType) -> Set[str]:
+        """이전 수집에서 본 항목 키. 증분 수집을 지원하지 않는 메뉴는 빈 집합입니다."""
+        item_type = INCREMENTAL_ITEM_TYPES.get(menu_type)
+        return set(self.store.get_fingerprints(course_id, item_type)) if item_type else set()
+
+    def detect(self, crawl_results: Iterable[Any]) -> List[ChangeEvent]:
+        """EclassManager.crawl_all 결과에서 변경 사항을 찾아 내보내고 지문을 갱신합니다."""
+        events = []
+        for crawl_result in crawl_results:
+            events.extend(self._detect_menus(crawl_result.course.id, crawl_result.results, crawl_result.errors))
+        logging.info(f"변경 사항 {len(events)}건을 찾았습니다.")
+        return events
+
+    def detect_personal(self, merged_results: Iterable[Any]) -> List[ChangeEvent]:
+        """
+        여러 계정 수집 결과(MergedCourseResult)의 개인 메뉴에서 변경 사항을 찾습니다.
+
+        개인 메뉴는 계정마다 내용이 다르므로 지문을 계정별로 따로 저장하고,
+        이벤트의 account에 계정 프로필을 적습니다.
+        """
+        events = []
+        for merged in merged_results:
+            for account, results in merged.personal.items():
+                errors = merged.personal_errors.get(account, {})
+                events.extend(self._detect_menus(merged.course.id, results, errors, account))
+        logging.info(f"계정별 변경 사항 {len(events)}건을 찾았습니다.")
+        return events
+
+    def _detect_menus(self, course_id: str, results: Dict[MenuType, Any], errors: Dict[MenuType, str],
+                      account: Optional[str] = None) -> List[ChangeEvent]:
+        events = []
+        for menu_type, result in results.items():
+            # 수집에 실패한 메뉴는 모든 항목이 삭제된 것으로 보지 않도록 건너뜁니다.
+            extractor = ITEM_EXTRACTORS.get(menu_type)
+            if extractor is None or result is None or menu_type in errors:
+                continue
+            for item_set in extractor(result):
+                events.extend(self.diff(course_id, item_set, account))
+        return events
+
+    def diff(self, course_id: str, item_set: ItemSet, account: Optional[str] = None) -> List[ChangeEvent]:
+        # 계정별 지문은 항목 종류 뒤에 계정을 붙여 저장합니다. (예: assignment@alice)
+        item_type = f"{item_set.item_type}@{account}" if account else item_set.item_type
+        previous = self.store.get_fingerprints(course_id, item_type)
+        current = {key: fingerprint(fields) for key, fields in item_set.items.items()}
+
+        events = []
+        for key, value in current.items():
+            if key not in previous:
+                events.append(ChangeEvent(CREATED, course_id, item_set.item_type, key, item_set.items[key], account))
+            elif previous[key] != value:
+                events.append(ChangeEvent(UPDATED, course_id, item_set.item_type, key, item_set.items[key], account))
+        deleted = [key for key in previous if key not in current] if item_set.complete else []
+        events.extend(ChangeEvent(DELETED, course_id, item_set.item_type, key, account=account) for key in deleted)
+
+        self.store.save_fingerprints(course_id, item_type, current, deleted)
+        self._emit(events)
+        return events
+
+    def _emit(self, events: List[ChangeEvent]) -> None:
+        if not events:
+            return
+        if self.feed_path:
+            with self._feed_lock, open(self.feed_path, 'a', encoding='utf-8') as feed:
+                for event in events:
+                    feed.write(json.dumps(asdict(event), ensure_ascii=False) + '\n')
+                feed.flush()
+                os.fsync(feed.fileno())
+        if self.on_event:
+            for event in events:
+                self.on_event(event)
@@ -0,0 +1,78 @@
+import logging
+import os
+import tempfile
+import time
+from http.cookiejar import Cookie, LWPCookieJar
+from http.cookies import Morsel
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional
+
+
+def load_cookie_jar(path: str) -> Optional[LWPCookieJar]:
+    """저장된 쿠키 파일을 읽습니다. 파일이 없거나 읽을 수 없으면 None을 반환합니다."""
+    if not os.path.exists(path):
+        return None
+    jar = LWPCookieJar(path)
+    try:
+        # 세션 쿠키(JSESSIONID 등)도 다음 실행에서 재사용해야 하므로 discard 쿠키까지 읽습니다.
+        jar.load(ignore_discard=True, ignore_expires=False)
+    except (OSError, ValueError) as e:
+        logging.warning(f"쿠키 파일을 읽을 수 없습니다: {e}")
+        return None
+    return jar
+
+
+def save_cookie_jar(cookies: Iterable[Cookie], path: str) -> None:
+    """
+    쿠키를 LWP 형식으로 저장합니다.
+
+    소유자만 읽고 쓸 수 있는 권한(0600)으로 임시 파일을 만든 뒤 교체하므로,
+    저장 도중에도 다른 사용자가 내용을 읽을 수 없고 기존 파일이 반쯤 쓰인 채로 남지 않습니다.
+    """
+    jar = LWPCookieJar()
+    for cookie in cookies:
+        jar.set_cookie(cookie)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.cookies-')
+    try:
+        os.chmod(tmp_path, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            file.write("#LWP-Cookies-2.0\n")
+            file.write(jar.as_lwp_str(ignore_discard=True, ignore_expires=False))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def cookie_from_morsel(morsel: Morsel) -> Cookie:
+    """aiohttp 쿠키 저장소의 Morsel을 http.cookiejar.Cookie로 변환합니다."""
+    expires = None
+    if morsel['max-age']:
+        expires = int(time.time()) + int(morsel['max-age'])
+    elif morsel['expires']:
+        try:
+            expires = int(parsedate_to_datetime(morsel['expires']).timestamp())
+        except (TypeError, ValueError):
+            expires = None
+    domain = morsel['domain']
+    return Cookie(
+        version=0,
+        name=morsel.key,
+        value=morsel.value,
+        port=None,
+        port_specified=False,
+        domain=domain,
+        domain_specified=bool(domain),
+        domain_initial_dot=domain.startswith('.'),
+        path=morsel['path'] or '/',
+        path_specified=bool(morsel['path']),
+        secure=bool(morsel['secure']),
+        expires=expires,
+        discard=expires is None,
+        comment=None,
+        comment_url=None,
+        rest={'HttpOnly': None} if morsel['httponly'] else {},
+    )
@@ -0,0 +1,61 @@
+import threading
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .models import Course, MenuType
+
+
+class CourseRegistry:
+    """
+    세션 동안 과목 목록, 과목별 메뉴, 서버에 진입해 있는 과목을 기억합니다.
+
+    과목 목록과 메뉴는 한 번 파싱한 결과를 재사용하고, invalidate()로 명시적으로
+    비울 때까지 다시 요청하지 않습니다. 진입한 과목은 로그인할 때마다 초기화됩니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._courses: Optional[List['Course']] = None
+        self._menus: Dict[str, Dict['MenuType', Dict[str, str]]] = {}
+        self.entered_course: Optional[str] = None
+        self.entered_course_url: Optional[str] = None
+
+    def get_courses(self) -> Optional[List['Course']]:
+        with self._lock:
+            return list(self._courses) if self._courses is not None else None
+
+    def set_courses(self, courses: List['Course']) -> None:
+        with self._lock:
+            self._courses = list(courses)
+
+    def get_menus(self, course_id: str) -> Optional[Dict['MenuType', Dict[str, str]]]:
+        with self._lock:
+            menus = self._menus.get(course_id)
+            return dict(menus) if menus is not None else None
+
+    def set_menus(self, course_id: str, menus: Dict['MenuType', Dict[str, str]]) -> None:
+        with self._lock:
+            self._menus[course_id] = dict(menus)
+
+    def enter(self, course_id: Optional[str], access_url: Optional[str]) -> None:
+        self.entered_course = course_id if access_url else None
+        self.entered_course_url = access_url
+
+    def leave(self) -> None:
+        self.enter(None, None)
+
+    def is_entered(self, course_id: str) -> bool:
+        return self.entered_course == course_id and self.entered_course_url is not None
+
+    def invalidate(self, course_id: Optional[str] = None) -> None:
+        """
+        기억한 정보를 지웁니다.
+
+        :param course_id: 지정하면 해당 과목의 메뉴만, 생략하면 과목 목록과 모든 메뉴를 지웁니다.
+        """
+        with self._lock:
+            if course_id is None:
+                self._courses = None
+                self._menus.clear()
+            else:
+                self._menus.pop(course_id, None)
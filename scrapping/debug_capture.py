@@ -0,0 +1,161 @@
+"""
+핸들러가 받은 원본 HTML을 디버깅용으로 저장합니다.
+
+파싱에 실패한 응답은 항상, 정상 응답은 엔드포인트마다 DEBUG_CAPTURE_SAMPLE_EVERY번에 한 번만
+저장합니다. 압축과 파일 쓰기는 백그라운드 스레드가 맡으므로 수집 경로는 큐에 넣는 비용만
+냅니다. 큐가 가득 차면 기다리지 않고 버립니다.
+
+파일은 DEBUG_CAPTURE_DIR 아래에 <엔드포인트>_<과목 ID>_<시각>[_failed].html.gz 이름으로
+쌓이며, 전체 크기가 DEBUG_CAPTURE_MAX_BYTES를 넘으면 오래된 파일부터 지웁니다.
+
+    zcat debug/notice_list_A20240001_20241018-091500-123_failed.html.gz
+"""
+import atexit
+import gzip
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+from config import (
+    DEBUG_CAPTURE_DIR, DEBUG_CAPTURE_ENABLED, DEBUG_CAPTURE_MAX_BYTES, DEBUG_CAPTURE_QUEUE_SIZE,
+    DEBUG_CAPTURE_SAMPLE_EVERY,
+)
+from . import metrics
+
+SUFFIX = '.html.gz'
+_UNSAFE = re.compile(r'[^\w.-]+')
+
+
+class Snapshot(NamedTuple):
+    html: str
+    endpoint: str
+    course_id: str
+    failed: bool
+    captured_at: float
+
+
+def snapshot_name(snapshot: Snapshot, sequence: int) -> str:
+    stem = _UNSAFE.sub('_', snapshot.endpoint.rsplit('.', 1)[0]) or 'page'
+    course = _UNSAFE.sub('_', snapshot.course_id) or 'none'
+    millis = int(snapshot.captured_at * 1000) % 1000
+    stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(snapshot.captured_at))
+    # 같은 밀리초에 저장한 응답끼리 이름이 겹치지 않도록 일련번호를 붙입니다.
+    return f"{stem}_{course}_{stamp}-{millis:03d}-{sequence}{'_failed' if snapshot.failed else ''}{SUFFIX}"
+
+
+class DebugCapture:
+    """
+    원본 HTML을 표본 추출해 gzip으로 저장하는 백그라운드 작성기입니다.
+
+    :param sample_every: 정상 응답은 엔드포인트마다 이 횟수에 한 번 저장합니다. (0이면 실패만 저장)
+    :param max_bytes: 저장 디렉토리의 최대 크기. 넘으면 오래된 파일부터 지웁니다.
+    """
+
+    def __init__(self, directory: str = DEBUG_CAPTURE_DIR, sample_every: int = DEBUG_CAPTURE_SAMPLE_EVERY,
+                 max_bytes: int = DEBUG_CAPTURE_MAX_BYTES, queue_size: int = DEBUG_CAPTURE_QUEUE_SIZE,
+                 enabled: bool = DEBUG_CAPTURE_ENABLED):
+        self.directory = directory
+        self.sample_every = sample_every
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._queue: 'queue.Queue[Snapshot]' = queue.Queue(maxsize=queue_size)
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._sequence = 0
+
+    def capture(self, html: Optional[str], endpoint: str, course_id: str = '', failed: bool = False) -> bool:
+        """
+        응답을 저장 대상으로 고르면 큐에 넣고 True를 반환합니다. 디스크에 쓰지 않고 바로 돌아옵니다.
+
+        :param failed: 파싱에 실패한 응답이면 표본 추출 없이 저장합니다.
+        """
+        if not self.enabled or not html:
+            return False
+        if failed:
+            reason = 'failure'
+        else:
+            with self._lock:
+                count = self._counts.get(endpoint, 0)
+                self._counts[endpoint] = count + 1
+            # 엔드포인트마다 첫 응답을 저장한 뒤 sample_every번에 한 번씩 저장합니다.
+            if self.sample_every <= 0 or count % self.sample_every:
+                return False
+            reason = 'sample'
+
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(Snapshot(html, endpoint, course_id, failed, time.time()))
+        except queue.Full:
+            metrics.inc('eclass_debug_captures_total', endpoint=endpoint, reason='dropped')
+            return False
+        metrics.inc('eclass_debug_captures_total', endpoint=endpoint, reason=reason)
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """큐에 남은 응답을 모두 쓸 때까지 기다립니다. timeout 안에 끝나면 True입니다."""
+        if self._thread is None:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _ensure_writer(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='debug-capture', daemon=True)
+                self._thread.start()
+                # 데몬 스레드는 종료할 때 멈추므로, 남은 응답을 잠시 기다려 씁니다.
+                atexit.register(self.flush, 5.0)
+
+    def _run(self) -> None:
+        while True:
+            snapshot = self._queue.get()
+            try:
+                self._write(snapshot)
+            except Exception as e:
+                logging.debug(f"디버그 HTML 저장 중 오류가 발생했습니다: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, snapshot: Snapshot) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self._sequence += 1
+        path = os.path.join(self.directory, snapshot_name(snapshot, self._sequence))
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(gzip.compress(snapshot.html.encode('utf-8'), compresslevel=6))
+        os.replace(temp_path, path)
+        logging.debug(f"HTML 내용이 {path}에 저장되었습니다.")
+        self._trim()
+
+    def _trim(self) -> None:
+        # 디렉토리를 매번 다시 읽어 다른 프로세스(여러 계정 수집)가 쓴 파일도 크기에 넣습니다.
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith(SUFFIX) and entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.path, stat.st_size))
+        total = sum(size for _, _, size in entries)
+        for _, path, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+
+CAPTURE = DebugCapture()
+capture = CAPTURE.capture
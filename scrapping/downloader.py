@@ -0,0 +1,248 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import requests
+
+from config import DOWNLOAD_DIR, DOWNLOAD_MAX_WORKERS, DOWNLOAD_CHUNK_SIZE, REQUEST_MAX_RETRIES
+from .eclass_session import EclassSession, EclassRequestError
+
+
+@dataclass
+class DownloadTask:
+    url: str
+    name: str
+    course_id: str
+    post_id: str  # 예: "notice:12", "material:345"
+
+
+@dataclass
+class DownloadResult:
+    task: DownloadTask
+    sha256: Optional[str] = None
+    path: Optional[str] = None
+    size: int = 0
+    reused: bool = False
+    error: Optional[str] = None
+
+
+class AttachmentDownloader:
+    """
+    첨부 파일을 내용 해시 기준으로 한 번만 저장하는 다운로더입니다.
+
+    디렉토리 구성:
+        objects/<해시 앞 2자리>/<sha256><확장자>  실제 파일 (내용이 같으면 하나만 저장)
+        partial/<URL 해시>.part                  중단된 다운로드 (Range 요청으로 이어받음)
+        partial/<URL 해시>.part.validator        받던 파일의 ETag 또는 Last-Modified (If-Range에 씀)
+        courses/<과목 ID>/<게시글 ID>/<파일 이름>  objects 파일에 대한 하드 링크
+                                                 (이름이 겹치면 <이름>_<해시 앞 8자리><확장자>)
+        index.json                               URL → 해시, 해시 → 참조한 게시글 목록
+    """
+
+    def __init__(self, session: EclassSession, root_dir: str = DOWNLOAD_DIR,
+                 max_workers: int = DOWNLOAD_MAX_WORKERS, chunk_size: int = DOWNLOAD_CHUNK_SIZE):
+        self.session = session
+        self.root_dir = root_dir
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self._index_path = os.path.join(root_dir, 'index.json')
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+
+    def download_all(self, tasks: Iterable[DownloadTask]) -> List[DownloadResult]:
+        """작업들을 최대 max_workers개씩 동시에 내려받습니다. 같은 URL은 한 번만 요청합니다."""
+        unique_urls: Dict[str, DownloadTask] = {}
+        tasks = [task for task in tasks if task.url]
+        for task in tasks:
+            unique_urls.setdefault(task.url, task)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            fetched = dict(zip(unique_urls, executor.map(self._fetch_object, unique_urls.values())))
+
+        results = []
+        claimed: Dict[str, str] = {}
+        for task in tasks:
+            sha256, path, size, reused, error = fetched[task.url]
+            if sha256:
+                self._link(task, sha256, path, claimed)
+            results.append(DownloadResult(task, sha256, path, size, reused, error))
+        self._save_index()
+        return results
+
+    def download(self, task: DownloadTask) -> DownloadResult:
+        return self.download_all([task])[0]
+
+    def _fetch_object(self, task: DownloadTask):
+        known = self._index['urls'].get(task.url)
+        if known:
+            path = self._object_path(known['sha256'], known['ext'])
+            if os.path.exists(path):
+                return known['sha256'], path, os.path.getsize(path), True, None
+
+        part_path = os.path.join(self.root_dir, 'partial', hashlib.sha256(task.url.encode('utf-8')).hexdigest() + '.part')
+        os.makedirs(os.path.dirname(part_path), exist_ok=True)
+        # 연결과 상태 코드 재시도는 EclassSession._request가 맡습니다. 여기서는 본문을 받는
+        # 도중 끊긴 경우만, 받은 부분을 남겨 두고 이어받기로 다시 시도합니다.
+        last_error = None
+        for attempt in range(REQUEST_MAX_RETRIES + 1):
+            try:
+                self._stream_to_part(task.url, part_path)
+                break
+            except EclassRequestError as e:
+                return None, None, 0, False, str(e)
+            except (requests.RequestException, OSError) as e:
+                last_error = e
+                logging.warning(f"{task.name} 다운로드 중단 ({attempt + 1}/{REQUEST_MAX_RETRIES + 1}): {e}")
+        else:
+            return None, None, 0, False, str(last_error)
+
+        _remove(_validator_path(part_path))
+        sha256 = _hash_file(part_path, self.chunk_size)
+        ext = os.path.splitext(task.name)[1].lower()
+        path = self._object_path(sha256, ext)
+        reused = os.path.exists(path)
+        if reused:
+            # 다른 게시글에 올라온 같은 파일입니다. 새로 받은 사본은 버립니다.
+            os.remove(part_path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(part_path, path)
+        with self._lock:
+            self._index['urls'][task.url] = {'sha256': sha256, 'ext': ext}
+        return sha256, path, os.path.getsize(path), reused, None
+
+    def _stream_to_part(self, url: str, part_path: str) -> None:
+        validator_path = _validator_path(part_path)
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        validator = _read_validator(validator_path) if offset else None
+        # 받던 파일이 서버에서 바뀌었으면 If-Range 때문에 206 대신 전체 파일(200)이 옵니다.
+        # 검증할 값이 없으면 다른 파일에 이어 붙이지 않도록 처음부터 받습니다.
+        headers = {'Range': f'bytes={offset}-', 'If-Range': validator} if validator else {}
+        try:
+            response = self.session.open_stream(url, headers=headers)
+        except EclassRequestError as e:
+            if e.status_code == 416 and validator:
+                return  # 이미 끝까지 받은 파일입니다.
+            raise
+        with response:
+            if validator and response.status_code == 206:
+                mode = 'ab'
+            else:
+                mode = 'wb'
+                _write_validator(validator_path, response.headers)
+            with open(part_path, mode) as file:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    if chunk:
+                        file.write(chunk)
+
+    def _link(self, task: DownloadTask, sha256: str, object_path: str, claimed: Dict[str, str]) -> None:
+        """
+        게시글 디렉토리에 파일 이름으로 링크를 겁니다. claimed는 이번 download_all에서
+        링크한 경로 → 해시로, 한 게시글에 이름이 같은 다른 파일이 있으면 뒤의 파일 이름에
+        해시 앞 8자리를 붙입니다. 이전 실행에서 건 링크의 내용이 다르면 첨부 파일이 바뀐
+        것이므로 새 파일로 바꿉니다.
+        """
+        link_dir = os.path.join(self.root_dir, 'courses', _safe_name(task.course_id), _safe_name(task.post_id))
+        name = _safe_name(task.name) or sha256
+        link_path = os.path.join(link_dir, name)
+        if claimed.get(link_path, sha256) != sha256:
+            stem, ext = os.path.splitext(name)
+            link_path = os.path.join(link_dir, f"{stem}_{sha256[:8]}{ext}")
+        claimed[link_path] = sha256
+        os.makedirs(link_dir, exist_ok=True)
+
+        reference = {'course_id': task.course_id, 'post_id': task.post_id, 'name': task.name}
+        if os.path.exists(link_path) and not self._holds(link_path, sha256, object_path):
+            replaced = _hash_file(link_path, self.chunk_size)
+            os.remove(link_path)
+            with self._lock:
+                references = self._index['objects'].get(replaced, [])
+                if reference in references:
+                    references.remove(reference)
+        if not os.path.exists(link_path):
+            try:
+                os.link(object_path, link_path)
+            except OSError:
+                # 하드 링크를 지원하지 않는 파일 시스템에서는 복사합니다.
+                shutil.copyfile(object_path, link_path)
+
+        with self._lock:
+            references = self._index['objects'].setdefault(sha256, [])
+            if reference not in references:
+                references.append(reference)
+
+    def _holds(self, link_path: str, sha256: str, object_path: str) -> bool:
+        """link_path가 sha256 파일을 가리키는지 확인합니다. 복사본이면 내용 해시를 비교합니다."""
+        if os.path.samefile(link_path, object_path):
+            return True
+        return _hash_file(link_path, self.chunk_size) == sha256
+
+    def _object_path(self, sha256: str, ext: str) -> str:
+        return os.path.join(self.root_dir, 'objects', sha256[:2], sha256 + ext)
+
+    def _load_index(self) -> Dict[str, Dict]:
+        try:
+            with open(self._index_path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {'urls': {}, 'objects': {}}
+        except (OSError, ValueError) as e:
+            logging.warning(f"다운로드 색인을 읽을 수 없어 새로 만듭니다: {e}")
+            return {'urls': {}, 'objects': {}}
+
+    def _save_index(self) -> None:
+        os.makedirs(self.root_dir, exist_ok=True)
+        with self._lock:
+            fd, tmp_path = tempfile.mkstemp(dir=self.root_dir, prefix='.index-')
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(self._index, file, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self._index_path)
+
+
+def _hash_file(path: str, chunk_size: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _validator_path(part_path: str) -> str:
+    return f"{part_path}.validator"
+
+
+def _read_validator(path: str) -> Optional[str]:
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return file.read().strip() or None
+    except OSError:
+        return None
+
+
+def _write_validator(path: str, headers) -> None:
+    """If-Range에 쓸 ETag(약한 ETag는 쓸 수 없음)나 Last-Modified를 저장합니다. 없으면 지웁니다."""
+    etag = headers.get('ETag')
+    validator = etag if etag and not etag.startswith('W/') else headers.get('Last-Modified')
+    if validator:
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(validator)
+    else:
+        _remove(path)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _safe_name(name: str) -> str:
+    return ''.join(c for c in name if c not in '/\\:*?"<>|\0').strip().strip('.')
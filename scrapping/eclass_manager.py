@@ -1,13 +1,60 @@
-from .eclass_session import EclassSession
+from .eclass_session import EclassSession, EclassRequestError, CourseAccessError, Course, MenuType
 from .menu_handlers.factory import MenuFactory
+from .change_detector import ChangeDetector
+from . import metrics
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+from dataclasses import asdict, dataclass, field, is_dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
+from config import ASYNC_MAX_CONCURRENCY, CRAWL_MAX_WORKERS, DOWNLOAD_MAX_WORKERS
 import logging
 
+if TYPE_CHECKING:
+    from .downloader import DownloadResult
+
+def _to_jsonable(value: Any) -> Any:
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, list):
+        return [_to_jsonable(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _to_jsonable(item) for key, item in value.items()}
+    return value
+
+@dataclass
+class CourseCrawlResult:
+    course: Course
+    menus: Dict[MenuType, Dict[str, str]] = field(default_factory=dict)
+    results: Dict[MenuType, Any] = field(default_factory=dict)
+    errors: Dict[MenuType, str] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'course': asdict(self.course),
+            'menus': {menu_type.name: menu_data for menu_type, menu_data in self.menus.items()},
+            'results': {menu_type.name: _to_jsonable(result) for menu_type, result in self.results.items()},
+            'errors': {menu_type.name: error for menu_type, error in self.errors.items()},
+        }
+
 class EclassManager:
-    def __init__(self):
-        self.eclass = EclassSession()
+    def __init__(self, use_cache: bool = True, change_detector: Optional[ChangeDetector] = None,
+                 profile: Optional[str] = None,
+                 known_keys: Optional[Dict[Tuple[str, MenuType], Set[str]]] = None):
+        """
+        :param change_detector: 있으면 crawl_all이 이미 본 항목을 건너뛰며 수집하고,
+                                수집이 끝나면 변경 사항을 찾아 내보냅니다.
+        :param profile: 로그인할 계정 프로필 ([credentials:<profile>] 섹션). 없으면 [credentials]입니다.
+        :param known_keys: change_detector 대신 쓸 (과목 ID, 메뉴 종류) → 이미 본 항목 키.
+                           변경 감지를 부모 프로세스가 하는 여러 계정 수집에서 넘겨받습니다.
+        """
+        self.use_cache = use_cache
+        self.change_detector = change_detector
+        self.profile = profile
+        self.known_keys = known_keys
+        self.eclass = EclassSession(use_cache=use_cache, profile=profile)
 
     def run(self):
-        if not self.eclass.login():
+        if not self.eclass.ensure_login():
             logging.error("로그인 실패")
             return
 
@@ -20,6 +67,166 @@ class EclassManager:
 
             self._handle_course_menus(selected_course)
 
+    def crawl_all(self, max_workers: int = CRAWL_MAX_WORKERS,
+                  menu_filter: Optional[Callable[[Course, MenuType], bool]] = None) -> List[CourseCrawlResult]:
+        """
+        입력 없이 모든 과목의 모든 메뉴를 수집합니다.
+
+        로그인한 하나의 세션을 공유하는 작업 풀에서 과목 메뉴를 먼저 가져온 뒤,
+        각 (과목, 메뉴) 핸들러를 실행합니다.
+
+        :param max_workers: 동시에 실행할 최대 작업 수
+        :param menu_filter: 있으면 menu_filter(과목, 메뉴 종류)가 False인 메뉴는 수집하지 않습니다.
+        :return: 과목별 수집 결과 목록
+        """
+        if not self.eclass.ensure_login():
+            logging.error("로그인 실패")
+            return []
+
+        courses = self.eclass.get_course_list()
+        crawl_results = [CourseCrawlResult(course=course) for course in courses]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            menu_lists = executor.map(lambda course: self.eclass.get_course_menus(course.id), courses)
+            for crawl_result, menus in zip(crawl_results, menu_lists):
+                crawl_result.menus = menus
+
+            # 같은 과목의 작업이 연달아 실행되도록 과목 순서대로 제출합니다.
+            futures = {}
+            for crawl_result in crawl_results:
+                for menu_type, menu_data in crawl_result.menus.items():
+                    if menu_filter and not menu_filter(crawl_result.course, menu_type):
+                        continue
+                    future = executor.submit(self.collect_menu, crawl_result.course, menu_type, menu_data)
+                    futures[future] = (crawl_result, menu_type)
+
+            for future, (crawl_result, menu_type) in futures.items():
+                try:
+                    crawl_result.results[menu_type] = future.result()
+                except Exception as e:
+                    logging.error(f"{crawl_result.course.name} - {menu_type.name} 수집 중 오류 발생: {e}")
+                    crawl_result.errors[menu_type] = str(e)
+
+        self.eclass.save_cookies()
+        if self.eclass.cache:
+            self.eclass.cache.log_stats()
+        if self.change_detector:
+            self.change_detector.detect(crawl_results)
+        return crawl_results
+
+    def collect_menu(self, course: Course, menu_type: MenuType, menu_data: Dict[str, str]) -> Any:
+        """한 과목의 한 메뉴를 수집합니다. 현재 과목에 의존하는 핸들러는 course_context 안에서 실행합니다."""
+        handler = MenuFactory.create_handler(menu_type, self.eclass, course.id)
+        # --profile을 주지 않으면 profile()은 아무것도 하지 않습니다.
+        with metrics.profile(type(handler).__name__):
+            if not handler.course_scoped:
+                return self._run_collect(handler, course, menu_type, menu_data)
+            with self.eclass.course_context(course.id):
+                return self._run_collect(handler, course, menu_type, menu_data)
+
+    def _run_collect(self, handler, course: Course, menu_type: MenuType, menu_data: Dict[str, str]) -> Any:
+        return handler.collect_incremental(menu_data, self._known_keys(course, menu_type))
+
+    def _known_keys(self, course: Course, menu_type: MenuType) -> Set[str]:
+        # 변경 감지가 없으면 모든 항목을 새 항목으로 보고 수집합니다. (공지 상세 페이지 포함)
+        if self.known_keys is not None:
+            return self.known_keys.get((course.id, menu_type), set())
+        return self.change_detector.known_keys(course.id, menu_type) if self.change_detector else set()
+
+    def download_attachments(self, crawl_results: List[CourseCrawlResult]) -> List['DownloadResult']:
+        """
+        수집 결과에 포함된 공지사항과 강의 자료의 첨부 파일을 내려받습니다.
+
+        수집할 때 상세 페이지를 읽지 않은 공지사항은 상세 페이지를 동시에 가져온 뒤 작업을 만듭니다.
+        """
+        from .downloader import AttachmentDownloader, DownloadTask
+        from .menu_handlers.notice_handler import NoticeMenuHandler
+
+        tasks: List[DownloadTask] = []
+        notice_jobs = []
+        for crawl_result in crawl_results:
+            course_id = crawl_result.course.id
+            for material in crawl_result.results.get(MenuType.LECTURE_MATERIAL) or []:
+                for attachment in material.attachments:
+                    tasks.append(DownloadTask(attachment.url, attachment.name, course_id, f"material:{material.article_num}"))
+            handler = NoticeMenuHandler(self.eclass, course_id)
+            for notice in crawl_result.results.get(MenuType.NOTICE) or []:
+                notice_jobs.append((handler, notice))
+
+        def notice_tasks(job) -> List[DownloadTask]:
+            handler, notice = job
+            if notice.details_fetched:
+                attachments = notice.attachments
+            else:
+                try:
+                    detail = handler.get_notice_detail(notice)
+                except EclassRequestError as e:
+                    logging.error(f"공지사항 상세 요청 중 오류 발생: {e}")
+                    return []
+                attachments = detail['attachments'] if detail else []
+            return [DownloadTask(a.url, a.name, handler.course_id, f"notice:{notice.number}") for a in attachments]
+
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_MAX_WORKERS) as executor:
+            for job_tasks in executor.map(notice_tasks, notice_jobs):
+                tasks.extend(job_tasks)
+
+        results = AttachmentDownloader(self.eclass).download_all(tasks)
+        failed = [result for result in results if result.error]
+        reused = sum(1 for result in results if result.reused)
+        logging.info(f"첨부 파일 {len(results)}개 처리 (재사용 {reused}개, 실패 {len(failed)}개)")
+        return results
+
+    async def crawl_all_async(self, max_concurrency: int = ASYNC_MAX_CONCURRENCY) -> List[CourseCrawlResult]:
+        """
+        crawl_all의 asyncio 버전입니다.
+
+        하나의 이벤트 루프에서 AsyncEclassSession으로 모든 요청을 보내며,
+        동시에 진행되는 요청 수는 max_concurrency로 제한됩니다.
+        """
+        from .async_eclass_session import AsyncEclassSession
+
+        async with AsyncEclassSession(max_concurrency=max_concurrency, use_cache=self.use_cache,
+                                      profile=self.profile) as session:
+            if not await session.ensure_login():
+                logging.error("로그인 실패")
+                return []
+
+            courses = await session.get_course_list()
+            crawl_results = [CourseCrawlResult(course=course) for course in courses]
+            menu_lists = await asyncio.gather(*(session.get_course_menus(course.id) for course in courses))
+            for crawl_result, menus in zip(crawl_results, menu_lists):
+                crawl_result.menus = menus
+
+            tasks = [
+                (crawl_result, menu_type, self._collect_menu_async(session, crawl_result.course, menu_type, menu_data))
+                for crawl_result in crawl_results
+                for menu_type, menu_data in crawl_result.menus.items()
+            ]
+            outcomes = await asyncio.gather(*(task for _, _, task in tasks), return_exceptions=True)
+            for (crawl_result, menu_type, _), outcome in zip(tasks, outcomes):
+                if isinstance(outcome, Exception):
+                    logging.error(f"{crawl_result.course.name} - {menu_type.name} 수집 중 오류 발생: {outcome}")
+                    crawl_result.errors[menu_type] = str(outcome)
+                else:
+                    crawl_result.results[menu_type] = outcome
+
+            session.save_cookies()
+            if session.cache:
+                session.cache.log_stats()
+            if self.change_detector:
+                self.change_detector.detect(crawl_results)
+            return crawl_results
+
+    async def _collect_menu_async(self, session, course: Course, menu_type: MenuType, menu_data: Dict[str, str]) -> Any:
+        handler = MenuFactory.create_handler(menu_type, session, course.id)
+        if not handler.course_scoped:
+            return await self._run_collect_async(handler, course, menu_type, menu_data)
+        async with session.course_context(course.id):
+            return await self._run_collect_async(handler, course, menu_type, menu_data)
+
+    async def _run_collect_async(self, handler, course: Course, menu_type: MenuType, menu_data: Dict[str, str]) -> Any:
+        return await handler.collect_incremental_async(menu_data, self._known_keys(course, menu_type))
+
     def _display_courses(self, courses):
         print("\n수강 중인 과목:")
         for i, course in enumerate(courses, 1):
@@ -48,9 +255,12 @@ class EclassManager:
                 break
 
             handler = MenuFactory.create_handler(menu_type, self.eclass, course.id)
-            result = handler.handle(menu_data)
-            
-            print("처리 결과:", result)
+            try:
+                with self.eclass.course_context(course.id):
+                    handler.handle(menu_data)
+            except (CourseAccessError, EclassRequestError) as e:
+                logging.error(f"메뉴 처리 중 오류 발생: {e}")
+
             input("\n엔터를 눌러 계속...")
 
     def _display_menus(self, course, course_menus):
@@ -66,4 +276,4 @@ class EclassManager:
                     return None, None
                 return list(course_menus.items())[menu_choice]
             except (ValueError, IndexError):
-                logging.error("잘못된 입력입니다. 다시 시도해주세요.")
\ No newline at end of file
+                logging.error("잘못된 입력입니다. 다시 시도해주세요.")
@@ -1,80 +1,281 @@
 import configparser
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
 from typing import Dict, List, Optional, Any
 import logging
 import json
-from dataclasses import dataclass
-from enum import Enum, auto
+import os
+import threading
+import time
+from contextlib import contextmanager
 
-from config import BASE_URL, LOGIN_URL, MAIN_URL, COURSE_ACCESS_URL, SUBMAIN_URL
+from config import (
+    BASE_URL, LOGIN_URL, MAIN_URL, COURSE_ACCESS_URL, SUBMAIN_URL,
+    REQUEST_CONNECT_TIMEOUT, REQUEST_READ_TIMEOUT, HTTP_POOL_MAXSIZE,
+    REQUEST_MAX_RETRIES, REQUEST_BACKOFF_BASE, REQUEST_BACKOFF_MAX,
+    RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST, COOKIE_DIR,
+    RESPONSE_CACHE_ENABLED, RESPONSE_CACHE_DIR, RESPONSE_CACHE_TTLS, RESPONSE_CACHE_COURSE_SCOPED,
+)
+from . import metrics
+from .cookie_store import load_cookie_jar, save_cookie_jar
+from .response_cache import CacheEntry, ResponseCache
+from .course_registry import CourseRegistry
+from .html_parser import Fragment, parse_fragment
+from .models import Course, MenuType
+from .rate_limiter import HostRateLimiter
+from .retry import RETRYABLE_STATUS_CODES, backoff_delay, parse_retry_after
 
-@dataclass
-class Course:
-    id: str
-    name: str
-    code: str
-    time: str
 
-class MenuType(Enum):
-    PLAN = auto()
-    ONLINE_LECTURE = auto()
-    NOTICE = auto()
-    LECTURE_MATERIAL = auto()
-    ATTENDANCE = auto()
-    ASSIGNMENT = auto()
-    TEAM_PROJECT = auto()
-    EXAM = auto()
+MENU_ID_MAPPING = {
+    'st_plan': MenuType.PLAN,
+    'st_onlineclass': MenuType.ONLINE_LECTURE,
+    'st_notice': MenuType.NOTICE,
+    'st_lecture_material': MenuType.LECTURE_MATERIAL,
+    'st_attendance': MenuType.ATTENDANCE,
+    'st_report': MenuType.ASSIGNMENT,
+    'st_teamproject': MenuType.TEAM_PROJECT,
+    'st_exam': MenuType.EXAM
+}
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+
+def credentials_section(profile: Optional[str] = None) -> str:
+    """계정 프로필 이름을 config.ini 섹션 이름으로 바꿉니다. 프로필이 없으면 [credentials]입니다."""
+    return f'credentials:{profile}' if profile else 'credentials'
+
+
+def load_session_config(config_path: str, section: str = 'credentials') -> configparser.ConfigParser:
+    config = configparser.ConfigParser()
+    config.read(config_path)
+    if section not in config:
+        raise ValueError(f"설정 파일에 '{section}' 섹션이 없습니다.")
+    return config
+
+
+def build_login_data(username: str, password: str) -> Dict[str, str]:
+    return {
+        "usr_id": username,
+        "usr_pwd": password,
+        "returnURL": "",
+    }
+
+
+def is_login_success(html: str) -> bool:
+    return "document.location.href=" in html or "main_form.acl" in html
+
+
+def is_login_page(url: str, html: str) -> bool:
+    """세션이 만료되어 로그인 화면이 돌아왔는지 판단합니다."""
+    return 'login_form.acl' in url or 'name="usr_pwd"' in html or "name='usr_pwd'" in html
+
+
+def returned_login_page(response: requests.Response, stream: bool = False) -> bool:
+    """응답이 로그인 화면인지 판단합니다. 스트리밍 응답은 HTML일 때만 본문을 읽어 봅니다."""
+    if stream and 'text/html' not in response.headers.get('Content-Type', ''):
+        return 'login_form.acl' in response.url
+    return is_login_page(response.url, response.text)
+
+
+def default_cookie_path(username: str) -> str:
+    safe_username = ''.join(c for c in username if c.isalnum() or c in ('-', '_')) or 'default'
+    return os.path.join(COOKIE_DIR, f"{safe_username}.lwp")
+
+
+COURSE_LIST_ITEMS = Fragment(
+    css='li[style*="background: url"]',
+    strainer=SoupStrainer('li', style=lambda value: value and 'background: url' in value),
+)
+COURSE_MENU_ITEMS = Fragment(css='li.course_menu_item', strainer=SoupStrainer('li', class_='course_menu_item'))
+
+
+def parse_course_list(html: str) -> List[Course]:
+    soup = parse_fragment(html, COURSE_LIST_ITEMS)
+    course_elements = soup.find_all('li', style=lambda value: value and 'background: url' in value)
+    courses = (_parse_course_element(element) for element in course_elements)
+    return [course for course in courses if course]
+
+
+def _parse_course_element(element: BeautifulSoup) -> Optional[Course]:
+    name_elem = element.find('em', class_='sub_open')
+    if not name_elem:
+        return None
+
+    course_id = name_elem.get('kj')
+    full_name = name_elem.text.strip()
+    name_parts = full_name.rsplit('(', 1)
+    course_name = name_parts[0].strip()
+    course_code = name_parts[1].strip(') ') if len(name_parts) > 1 else ''
+    
+    time_elem = element.find('span')
+    course_time = time_elem.text.strip() if time_elem else ''
+    
+    return Course(id=course_id, name=course_name, code=course_code, time=course_time)
+
+
+def parse_course_menus(html: str) -> Dict[MenuType, Dict[str, str]]:
+    soup = parse_fragment(html, COURSE_MENU_ITEMS)
+    menus = {}
+    menu_items = soup.find_all('li', class_='course_menu_item')
+    for item in menu_items:
+        menu_id = item.get('id', '')
+        if menu_id in MENU_ID_MAPPING:
+            link = item.find('a')
+            if link:
+                menu_name = link.text.strip()
+                menu_url = link['href']
+                menus[MENU_ID_MAPPING[menu_id]] = {
+                    'name': menu_name,
+                    'url': f"{BASE_URL}{menu_url}" if menu_url.startswith('/') else menu_url
+                }
+    return menus
+
+
+def build_course_access_data(course_id: str) -> Dict[str, str]:
+    return {
+        "KJKEY": course_id,
+        "returnData": "json",
+        "returnURI": SUBMAIN_URL,
+        "encoding": "utf-8"
+    }
+
+
+class CourseAccessError(RuntimeError):
+    """과목 강의실 진입(eclass_room2.acl)에 실패했을 때 발생합니다."""
+
+
+class EclassRequestError(RuntimeError):
+    """재시도 후에도 요청이 실패했을 때 발생합니다."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
 
 
 class EclassSession:
-    def __init__(self, config_path: str = 'config.ini'):
+    def __init__(self, config_path: str = 'config.ini', cookie_path: Optional[str] = None,
+                 use_cache: bool = RESPONSE_CACHE_ENABLED, profile: Optional[str] = None):
+        """
+        :param profile: 있으면 [credentials:<profile>] 섹션의 계정으로 로그인합니다.
+                        섹션의 rate_limit, rate_burst로 계정별 요청 속도를 정할 수 있습니다.
+        """
         self.user_id = None 
         self.session = requests.Session()
-        self.config = self._load_config(config_path)
-        self.headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        self.username = self.config['credentials']['username']
-        self.password = self.config['credentials']['password']
-
-    def _load_config(self, config_path: str) -> configparser.ConfigParser:
-        config = configparser.ConfigParser()
-        config.read(config_path)
-        if 'credentials' not in config:
-            raise ValueError("설정 파일에 'credentials' 섹션이 없습니다.")
-        return config
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.timeout = (REQUEST_CONNECT_TIMEOUT, REQUEST_READ_TIMEOUT)
+        self.max_retries = REQUEST_MAX_RETRIES
+        section = credentials_section(profile)
+        self.config = load_session_config(config_path, section)
+        credentials = self.config[section]
+        self.rate_limiter = HostRateLimiter(credentials.getfloat('rate_limit', RATE_LIMIT_PER_SECOND),
+                                            credentials.getfloat('rate_burst', RATE_LIMIT_BURST))
+        self.headers = dict(DEFAULT_HEADERS)
+        self.session.headers.update(self.headers)
+        self.username = credentials['username']
+        self.password = credentials['password']
+        self.cookie_path = cookie_path or default_cookie_path(self.username)
+        self.cache = ResponseCache(RESPONSE_CACHE_DIR, RESPONSE_CACHE_TTLS, namespace=self.username,
+                                   course_scoped=RESPONSE_CACHE_COURSE_SCOPED) if use_cache else None
+
+        # 세션 만료 시 여러 스레드가 동시에 다시 로그인하지 않도록 로그인 세대를 셉니다.
+        self._login_lock = threading.Lock()
+        self._login_generation = 0
+
+        # 서버는 세션당 하나의 '현재 과목'만 기억하므로 과목 전환을 직렬화합니다.
+        self._course_cond = threading.Condition()
+        self._course_users = 0
+        self.courses = CourseRegistry()
 
     def login(self) -> bool:
-        login_data = {
-            "usr_id": self.username,
-            "usr_pwd": self.password,
-            "returnURL": "",
-        }
+        login_data = build_login_data(self.username, self.password)
         try:
-            response = self.session.post(LOGIN_URL, data=login_data, headers=self.headers)
-            response.raise_for_status()
-            if "document.location.href=" in response.text or "main_form.acl" in response.text:
+            response = self._request("POST", LOGIN_URL, data=login_data, relogin=False)
+            if is_login_success(response.text):
                 self.user_id = self.username  # 로그인 성공 시 user_id 설정
+                self._login_generation += 1
+                self.courses.leave()
+                self.save_cookies()
                 return True
             else:
                 return False
-        except requests.RequestException as e:
-            print(f"로그인 중 오류 발생: {e}")
+        except EclassRequestError as e:
+            logging.error(f"로그인 중 오류 발생: {e}")
             return False
 
+    def ensure_login(self) -> bool:
+        """
+        저장된 쿠키로 이전 세션을 복원하고, 쓸 수 없으면 새로 로그인합니다.
+
+        복원한 쿠키는 MAIN_URL에 한 번 요청해 로그인 화면으로 돌아오지 않는지 확인합니다.
+        """
+        if self._restore_cookies() and self._probe_session():
+            self.user_id = self.username
+            logging.info("저장된 세션을 재사용합니다.")
+            return True
+        return self.login()
+
+    def save_cookies(self) -> None:
+        try:
+            save_cookie_jar(self.session.cookies, self.cookie_path)
+        except OSError as e:
+            logging.warning(f"쿠키 저장 중 오류 발생: {e}")
+
+    def _restore_cookies(self) -> bool:
+        jar = load_cookie_jar(self.cookie_path)
+        if not jar:
+            return False
+        self.session.cookies.update(jar)
+        return True
+
+    def _probe_session(self) -> bool:
+        try:
+            response = self._request("GET", MAIN_URL, relogin=False)
+        except EclassRequestError as e:
+            logging.warning(f"저장된 세션 확인 중 오류 발생: {e}")
+            return False
+        if is_login_page(response.url, response.text):
+            return False
+        # 확인에 쓴 메인 페이지로 과목 목록을 미리 채워 get_course_list 요청을 아낍니다.
+        self.courses.set_courses(parse_course_list(response.text))
+        return True
+
+    def _relogin(self, generation: int) -> None:
+        with self._login_lock:
+            if self._login_generation != generation:
+                return  # 다른 스레드가 이미 다시 로그인했습니다.
+            entered_course = self.courses.entered_course
+            logging.info("세션이 만료되어 다시 로그인합니다.")
+            if not self.login():
+                raise EclassRequestError("세션이 만료되었고 다시 로그인하지 못했습니다.")
+            # 새 서버 세션에는 현재 과목이 없으므로, 진행 중인 과목 작업을 위해 다시 진입합니다.
+            if entered_course:
+                self.courses.enter(entered_course, self.access_course(entered_course))
+
     def get_user_id(self):
         return self.user_id
 
-    def get_course_list(self) -> List[Course]:
+    def get_course_list(self, refresh: bool = False) -> List[Course]:
+        """
+        수강 중인 과목 목록을 반환합니다. 한 번 가져온 목록은 세션 동안 재사용합니다.
+
+        :param refresh: True이면 기억한 목록을 무시하고 다시 가져옵니다.
+        """
+        if not refresh:
+            courses = self.courses.get_courses()
+            if courses is not None:
+                return courses
         try:
-            response = self.session.get(MAIN_URL)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            course_elements = soup.find_all('li', style=lambda value: value and 'background: url' in value)
-            
-            return [self._parse_course_element(element) for element in course_elements if self._parse_course_element(element)]
-        except requests.RequestException as e:
+            response = self._request("GET", MAIN_URL)
+            courses = parse_course_list(response.text)
+            self.courses.set_courses(courses)
+            return courses
+        except EclassRequestError as e:
             logging.error(f"과목 목록 가져오기 중 오류 발생: {e}")
             return []
         
@@ -85,107 +286,195 @@ class EclassSession:
         :param url: POST 요청을 보낼 URL
         :param data: POST 요청에 포함할 데이터 딕셔너리
         :return: 응답 내용 (문자열)
+        :raises EclassRequestError: 재시도 후에도 요청이 실패한 경우
         """
-        try:
-            response = self.session.post(url, data=data)
-            response.raise_for_status()  # HTTP 오류 발생 시 예외를 발생시킵니다.
-            return response.text
-        except requests.RequestException as e:
-            print(f"POST 요청 중 오류 발생: {e}")
-            return ""
-
-    def _parse_course_element(self, element: BeautifulSoup) -> Optional[Course]:
-        name_elem = element.find('em', class_='sub_open')
-        if not name_elem:
-            return None
-
-        course_id = name_elem.get('kj')
-        full_name = name_elem.text.strip()
-        name_parts = full_name.rsplit('(', 1)
-        course_name = name_parts[0].strip()
-        course_code = name_parts[1].strip(') ') if len(name_parts) > 1 else ''
-        
-        time_elem = element.find('span')
-        course_time = time_elem.text.strip() if time_elem else ''
-        
-        return Course(id=course_id, name=course_name, code=course_code, time=course_time)
+        return self._fetch_text("POST", url, data)
 
     def access_course(self, course_id: str) -> Optional[str]:
-        data = {
-            "KJKEY": course_id,
-            "returnData": "json",
-            "returnURI": SUBMAIN_URL,
-            "encoding": "utf-8"
-        }
+        data = build_course_access_data(course_id)
         try:
-            response = self.session.post(COURSE_ACCESS_URL, data=data)
-            response.raise_for_status()
+            response = self._request("POST", COURSE_ACCESS_URL, data=data)
             json_data = response.json()
             if json_data.get('isError'):
                 logging.error(f"과목 접근 실패: {json_data.get('message')}")
                 return None
             return json_data.get('returnURL')
-        except (requests.RequestException, json.JSONDecodeError) as e:
+        except (EclassRequestError, json.JSONDecodeError) as e:
             logging.error(f"과목 접근 중 오류 발생: {e}")
             return None
 
-    def get_course_menus(self, course_id: str) -> Dict[MenuType, Dict[str, str]]:
-        access_url = self.access_course(course_id)
-        if not access_url:
-            return {}
+    @contextmanager
+    def course_context(self, course_id: str):
+        """
+        서버 세션의 현재 과목을 course_id로 고정한 상태에서 블록을 실행합니다.
 
+        같은 과목의 작업은 동시에 진입할 수 있고, 다른 과목으로의 전환은
+        진행 중인 작업이 모두 끝난 뒤에만 일어납니다.
+
+        :param course_id: 진입할 과목 ID (KJKEY)
+        :return: 과목 진입 후 서버가 돌려준 강의실 URL
+        """
+        with self._course_cond:
+            while self._course_users and self.courses.entered_course != course_id:
+                self._course_cond.wait()
+            if not self.courses.is_entered(course_id):
+                # 이미 같은 과목에 들어와 있으면 eclass_room2.acl 요청을 생략합니다.
+                self.courses.enter(course_id, self.access_course(course_id))
+                if not self.courses.is_entered(course_id):
+                    raise CourseAccessError(f"과목에 진입할 수 없습니다: {course_id}")
+            self._course_users += 1
+            access_url = self.courses.entered_course_url
         try:
-            response = self.session.get(access_url)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            return self._get_specific_menus(soup)
-        except requests.RequestException as e:
+            yield access_url
+        finally:
+            with self._course_cond:
+                self._course_users -= 1
+                self._course_cond.notify_all()
+
+    def get_course_menus(self, course_id: str, refresh: bool = False) -> Dict[MenuType, Dict[str, str]]:
+        """
+        과목의 메뉴 목록을 반환합니다. 한 번 가져온 메뉴는 세션 동안 재사용합니다.
+
+        :param refresh: True이면 기억한 메뉴를 무시하고 강의실 페이지를 다시 파싱합니다.
+        """
+        if not refresh:
+            menus = self.courses.get_menus(course_id)
+            if menus is not None:
+                return menus
+        try:
+            with self.course_context(course_id) as access_url:
+                response = self._request("GET", access_url)
+                menus = parse_course_menus(response.text)
+                if menus:
+                    self.courses.set_menus(course_id, menus)
+                return menus
+        except CourseAccessError as e:
+            logging.error(str(e))
+            return {}
+        except EclassRequestError as e:
             logging.error(f"과목 메뉴 가져오기 중 오류 발생: {e}")
             return {}
 
-    def _get_specific_menus(self, soup: BeautifulSoup) -> Dict[MenuType, Dict[str, str]]:
-        menus = {}
-        menu_mapping = {
-            'st_plan': MenuType.PLAN,
-            'st_onlineclass': MenuType.ONLINE_LECTURE,
-            'st_notice': MenuType.NOTICE,
-            'st_lecture_material': MenuType.LECTURE_MATERIAL,
-            'st_attendance': MenuType.ATTENDANCE,
-            'st_report': MenuType.ASSIGNMENT,
-            'st_teamproject': MenuType.TEAM_PROJECT,
-            'st_exam': MenuType.EXAM
-        }
-
-        menu_items = soup.find_all('li', class_='course_menu_item')
-        for item in menu_items:
-            menu_id = item.get('id', '')
-            if menu_id in menu_mapping:
-                link = item.find('a')
-                if link:
-                    menu_name = link.text.strip()
-                    menu_url = link['href']
-                    menus[menu_mapping[menu_id]] = {
-                        'name': menu_name,
-                        'url': f"{BASE_URL}{menu_url}" if menu_url.startswith('/') else menu_url
-                    }
-        return menus
+    def invalidate(self, course_id: Optional[str] = None) -> None:
+        """기억한 과목 목록과 메뉴를 지웁니다. course_id를 주면 그 과목의 메뉴만 지웁니다."""
+        self.courses.invalidate(course_id)
 
     def get_page_content(self, url: str, method: str = "GET", data: dict = None) -> str:
-        try:
-            if method.upper() == "GET":
-                response = self.session.get(url)
-            elif method.upper() == "POST":
-                response = self.session.post(url, data=data)
-            else:
-                raise ValueError(f"지원하지 않는 HTTP 메서드입니다: {method}")
-            
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException as e:
-            logging.error(f"페이지 내용 가져오기 중 오류 발생: {e}")
-            return ""
-        
+        """
+        :raises EclassRequestError: 재시도 후에도 요청이 실패한 경우
+        """
+        if method.upper() not in ("GET", "POST"):
+            raise ValueError(f"지원하지 않는 HTTP 메서드입니다: {method}")
+        return self._fetch_text(method.upper(), url, data if method.upper() == "POST" else None)
+
     def get_request(self, url: str) -> str:
-        response = self.session.get(url)
-        response.raise_for_status()
-        return response.text
\ No newline at end of file
+        return self._fetch_text("GET", url)
+
+    def open_stream(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """
+        본문을 메모리에 읽지 않는 GET 응답을 반환합니다. 호출한 쪽에서 닫아야 합니다.
+
+        세션이 만료되어 첨부 파일 대신 로그인 화면이 오면 다시 로그인해 한 번 더 요청하고,
+        그래도 로그인 화면이면 예외를 냅니다.
+
+        :raises EclassRequestError: 재시도 후에도 요청이 실패했거나 로그인 화면이 돌아온 경우
+        """
+        response = self._request("GET", url, headers=headers or {}, stream=True)
+        if returned_login_page(response, stream=True):
+            response.close()
+            raise EclassRequestError(f"GET {url} 응답이 로그인 화면입니다.")
+        return response
+
+    def _fetch_text(self, method: str, url: str, data: Optional[Dict[str, Any]] = None) -> str:
+        """
+        응답 캐시를 거쳐 본문을 가져옵니다.
+
+        TTL 안의 캐시는 요청 없이 반환하고, TTL이 지난 캐시는 ETag/Last-Modified로
+        조건부 요청을 보내 304이면 저장된 본문을 다시 사용합니다.
+        """
+        ttl = self.cache.ttl_for(url) if self.cache else None
+        # course_context 안에서는 다른 과목으로 전환되지 않으므로 지금 진입한 과목이 응답의 과목입니다.
+        key = self.cache.make_key(method, url, data, self.courses.entered_course) if ttl is not None else None
+        if key is None:
+            return self._request(method, url, data=data).text
+
+        entry = self.cache.get(key)
+        if entry and entry.is_fresh(ttl):
+            self.cache.record_hit(url)
+            return entry.body
+
+        headers = entry.conditional_headers() if entry else {}
+        response = self._request(method, url, data=data, headers=headers)
+        if response.status_code == 304 and entry:
+            entry.stored_at = time.time()
+            self.cache.put(key, entry)
+            self.cache.record_revalidated(url)
+            return entry.body
+
+        self.cache.record_miss(url)
+        text = response.text
+        if not is_login_page(response.url, text):
+            self.cache.put(key, CacheEntry(
+                url=url,
+                body=text,
+                stored_at=time.time(),
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+            ))
+        return text
+
+    def _request(self, method: str, url: str, data: Optional[Dict[str, Any]] = None,
+                 relogin: bool = True, **kwargs) -> requests.Response:
+        """
+        모든 HTTP 요청이 거치는 공통 경로입니다.
+
+        호스트별 속도 제한을 지키고, 연결/읽기 타임아웃을 적용하며, 연결 오류나
+        재시도 가능한 상태 코드(429, 5xx)는 지수 백오프와 지터를 두고 다시 시도합니다.
+        로그인 후 응답이 로그인 화면이면 다시 로그인하고 요청을 한 번 더 보냅니다.
+
+        :raises EclassRequestError: 재시도 후에도 실패했거나 재시도할 수 없는 오류인 경우
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        generation = self._login_generation
+        last_error = None
+        status_code = None
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire(url)
+            retry_after = None
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, url, data=data, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                metrics.record_request(url, 'error', time.perf_counter() - started)
+                last_error = e
+            except requests.RequestException as e:
+                metrics.record_request(url, 'error', time.perf_counter() - started)
+                raise EclassRequestError(f"{method} {url} 요청 실패: {e}") from e
+            else:
+                status_code = response.status_code
+                # 스트리밍 응답은 본문을 아직 받지 않았으므로 Content-Length로 셉니다.
+                size = int(response.headers.get('Content-Length') or 0) if kwargs.get('stream') else len(response.content)
+                metrics.record_request(url, str(status_code), time.perf_counter() - started, size)
+                if status_code not in RETRYABLE_STATUS_CODES:
+                    try:
+                        response.raise_for_status()
+                    except requests.HTTPError as e:
+                        raise EclassRequestError(f"{method} {url} 요청 실패: {e}", status_code) from e
+                    if not kwargs.get('stream') and response.encoding is None:
+                        # .text를 여러 번 읽어도 인코딩 추정을 반복하지 않도록 한 번만 정합니다.
+                        response.encoding = response.apparent_encoding
+                    if relogin and self.user_id and returned_login_page(response, kwargs.get('stream', False)):
+                        self._relogin(generation)
+                        return self._request(method, url, data=data, relogin=False, **kwargs)
+                    return response
+                last_error = requests.HTTPError(f"HTTP {status_code}", response=response)
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                response.close()
+
+            if attempt < self.max_retries:
+                delay = min(retry_after, REQUEST_BACKOFF_MAX) if retry_after is not None else backoff_delay(attempt, REQUEST_BACKOFF_BASE, REQUEST_BACKOFF_MAX)
+                logging.warning(f"{method} {url} 요청 실패({last_error}), {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+                metrics.record_retry(url)
+                time.sleep(delay)
+
+        raise EclassRequestError(f"{method} {url} 요청이 {self.max_retries + 1}회 모두 실패했습니다: {last_error}", status_code) from last_error
@@ -0,0 +1,67 @@
+import logging
+from typing import List, NamedTuple, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from config import HTML_PARSER_BACKEND
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# 빠른 순서입니다. 'auto'는 설치된 것 중 가장 앞의 백엔드를 고릅니다.
+BACKENDS = ('selectolax', 'lxml', 'html.parser')
+
+
+class Fragment(NamedTuple):
+    """목록 페이지에서 실제로 쓰는 부분. 백엔드마다 같은 요소를 고르는 두 가지 표현입니다."""
+    css: str                  # selectolax가 골라낼 요소
+    strainer: SoupStrainer    # BeautifulSoup이 트리에 남길 요소
+
+
+def available_backends() -> List[str]:
+    installed = {'selectolax': LexborHTMLParser is not None, 'lxml': HAS_LXML, 'html.parser': True}
+    return [backend for backend in BACKENDS if installed[backend]]
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    backend = backend or HTML_PARSER_BACKEND
+    available = available_backends()
+    if backend == 'auto':
+        return available[0]
+    if backend not in available:
+        logging.warning(f"HTML 파서 '{backend}'를 사용할 수 없어 {available[0]}를 사용합니다.")
+        return available[0]
+    return backend
+
+
+def make_soup(html: str, backend: Optional[str] = None) -> BeautifulSoup:
+    """문서 전체를 BeautifulSoup 트리로 만듭니다. lxml이 있으면 lxml로 파싱합니다."""
+    return BeautifulSoup(html, _tree_builder(resolve_backend(backend)))
+
+
+def parse_fragment(html: str, fragment: Fragment, backend: Optional[str] = None) -> BeautifulSoup:
+    """
+    fragment에 해당하는 요소만 담은 BeautifulSoup 트리를 만듭니다.
+
+    selectolax가 있으면 C 파서로 해당 요소를 먼저 골라낸 뒤 그 조각만 BeautifulSoup으로
+    다시 읽고, 없으면 SoupStrainer로 나머지 요소를 트리에 만들지 않습니다. 어느 쪽이든
+    호출하는 쪽은 기존과 같은 find/select를 그대로 쓸 수 있습니다.
+    """
+    backend = resolve_backend(backend)
+    if backend == 'selectolax':
+        nodes = LexborHTMLParser(html).css(fragment.css)
+        # 조각에는 <tr>, <td>처럼 부모 없이는 의미가 없는 태그가 있어 구조를 보정하지 않는 html.parser로 읽습니다.
+        return BeautifulSoup(''.join(node.html for node in nodes), 'html.parser')
+    return BeautifulSoup(html, _tree_builder(backend), parse_only=fragment.strainer)
+
+
+def _tree_builder(backend: str) -> str:
+    return 'lxml' if backend != 'html.parser' and HAS_LXML else 'html.parser'
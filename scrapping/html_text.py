@@ -0,0 +1,168 @@
+"""
+BeautifulSoup 요소를 읽기 좋은 일반 텍스트로 바꿉니다.
+
+요소 트리를 한 번만 훑으며 조각을 리스트에 모았다가 마지막에 한 번 이어 붙입니다.
+트리를 고치지 않으므로(<br>을 바꾸거나 줄 바꿈 문자열을 끼워 넣지 않음) 같은 요소를
+여러 번 변환하거나 다른 용도로 계속 쓸 수 있습니다.
+
+- 블록 요소(<p>, <div>, <li>, <tr> 등)와 <br>은 줄 바꿈이 되고, 문단 사이에는 빈 줄이 하나 들어갑니다.
+- 빈 줄은 연달아 두 개 이상 나오지 않으며 앞뒤 빈 줄과 줄 끝 공백은 지웁니다.
+- 목록 항목은 '- ' 또는 '1. '로 시작하고 중첩된 목록은 들여씁니다.
+- 표는 행마다 한 줄에 칸을 ' | '로 나눠 씁니다.
+- 그 밖의 공백은 브라우저처럼 하나로 줄이고 <pre> 안의 공백은 그대로 둡니다.
+"""
+import re
+from typing import List, Optional
+
+from bs4 import NavigableString, Tag
+from bs4.element import PreformattedString
+
+# 앞뒤로 줄을 바꾸는 요소
+BLOCK_TAGS = frozenset({
+    'address', 'article', 'aside', 'blockquote', 'center', 'dd', 'div', 'dl', 'dt', 'fieldset', 'figcaption',
+    'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol',
+    'p', 'pre', 'section', 'table', 'tbody', 'tfoot', 'thead', 'tr', 'ul',
+})
+# 앞뒤에 빈 줄을 두는 요소
+PARAGRAPH_TAGS = frozenset({'blockquote', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'pre', 'table'})
+# 내용을 보여주지 않는 요소
+SKIP_TAGS = frozenset({'head', 'noscript', 'script', 'style', 'template', 'title'})
+LIST_TAGS = frozenset({'ol', 'ul'})
+CELL_TAGS = frozenset({'td', 'th'})
+
+# &nbsp;(\xa0)는 줄이지 않고 일반 공백 하나로 바꿉니다.
+WHITESPACE = re.compile(r'[ \t\n\r\f\v]+')
+CELL_SEPARATOR = ' | '
+
+
+class _TextBuffer:
+    """줄 바꿈과 공백을 미뤄 두었다가 다음 글자를 쓸 때 한 번에 정리하는 출력 버퍼입니다."""
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.newlines = 0       # 다음 글자 앞에 넣을 줄 바꿈 수
+        self.space = False      # 다음 글자 앞에 넣을 공백
+        self.prefix = ''        # 다음 글자 앞에 넣을 목록 기호나 칸 구분자
+        self.line_start = True
+
+    def write(self, text: str) -> None:
+        if not text:
+            return
+        if self.parts and self.newlines:
+            self.parts.append('\n' * min(self.newlines, 2))
+            self.line_start = True
+        elif self.space and not self.line_start and not self.prefix:
+            self.parts.append(' ')
+        self.newlines, self.space = 0, False
+        if self.prefix:
+            self.parts.append(self.prefix)
+            self.prefix = ''
+        self.parts.append(text)
+        self.line_start = text.endswith('\n')
+
+    def write_collapsed(self, text: str) -> None:
+        text = WHITESPACE.sub(' ', text).replace('\xa0', ' ')
+        stripped = text.strip(' ')
+        if not stripped:
+            self.space = self.space or bool(text)
+            return
+        if text[0] == ' ':
+            self.space = True
+        self.write(stripped)
+        self.space = text[-1] == ' '
+
+    def break_line(self, count: int = 1) -> None:
+        """블록 경계: 이미 미뤄 둔 줄 바꿈과 합쳐 최소 count개가 되게 합니다."""
+        if self.parts:
+            self.newlines = max(self.newlines, count)
+        self.space = False
+
+    def line_feed(self) -> None:
+        """<br>: 줄 바꿈을 하나 더합니다. 연속된 <br>은 빈 줄이 됩니다."""
+        if self.parts:
+            self.newlines += 1
+        self.space = False
+
+    def getvalue(self) -> str:
+        return ''.join(self.parts)
+
+
+def html_to_text(element: Optional[Tag]) -> str:
+    """
+    element의 내용을 일반 텍스트로 바꿉니다. element는 바뀌지 않습니다.
+
+    :param element: BeautifulSoup 요소 (None이면 빈 문자열)
+    """
+    if element is None:
+        return ''
+    buffer = _TextBuffer()
+    # 깊게 중첩된 HTML에서도 재귀 한도에 걸리지 않도록 스택으로 훑습니다.
+    # 스택 항목은 들어갈 노드이거나, 요소를 닫을 때 처리할 (요소,) 튜플입니다.
+    stack: list = [element]
+    lists: List[List] = []      # 열려 있는 목록마다 [순서 목록 여부, 다음 번호]
+    cells: List[int] = []       # 열려 있는 표 행마다 지금까지 나온 칸 수
+    pre_depth = 0
+
+    while stack:
+        node = stack.pop()
+        if isinstance(node, tuple):
+            name = node[0].name
+            if name == 'pre':
+                pre_depth -= 1
+            elif name in LIST_TAGS:
+                lists.pop()
+            elif name == 'tr':
+                cells.pop()
+                # 행 끝의 빈 칸 구분자는 버립니다.
+                buffer.prefix = ''
+            if name in BLOCK_TAGS:
+                buffer.break_line(2 if name in PARAGRAPH_TAGS or (name in LIST_TAGS and not lists) else 1)
+            continue
+
+        if isinstance(node, NavigableString):
+            # 주석, CDATA, 문서 형식 선언 등은 건너뜁니다.
+            if isinstance(node, PreformattedString):
+                continue
+            if pre_depth:
+                buffer.write(str(node))
+            else:
+                buffer.write_collapsed(str(node))
+            continue
+
+        if not isinstance(node, Tag):
+            continue
+        name = node.name
+        if name in SKIP_TAGS:
+            continue
+        if name == 'br':
+            buffer.line_feed()
+            continue
+        if name == 'hr':
+            buffer.break_line(2)
+            continue
+
+        if name in BLOCK_TAGS and node is not element:
+            buffer.break_line(2 if name in PARAGRAPH_TAGS or (name in LIST_TAGS and not lists) else 1)
+        if name == 'pre':
+            pre_depth += 1
+        elif name in LIST_TAGS:
+            lists.append([name == 'ol', 1])
+        elif name == 'li':
+            indent = '  ' * max(len(lists) - 1, 0)
+            if lists and lists[-1][0]:
+                buffer.prefix = f'{indent}{lists[-1][1]}. '
+                lists[-1][1] += 1
+            else:
+                buffer.prefix = f'{indent}- '
+        elif name == 'tr':
+            cells.append(0)
+        elif name in CELL_TAGS and cells:
+            if cells[-1]:
+                # 구분자는 다음 글자와 함께 씁니다. 빈 칸이 있어도 칸 수가 맞도록 쌓아 둡니다.
+                buffer.prefix += CELL_SEPARATOR
+            cells[-1] += 1
+
+        stack.append((node,))
+        stack.extend(reversed(node.contents))
+
+    return buffer.getvalue()
@@ -1,23 +1,30 @@
-from .base import MenuHandler
-from .plan_handler import PlanMenuHandler
-from .online_lecture_handler import OnlineLectureMenuHandler
-from .notice_handler import NoticeMenuHandler
-from .lecture_material_handler import LectureMaterialMenuHandler
-from .attendance_handler import AttendanceMenuHandler
-from .assignment_handler import AssignmentMenuHandler
-from .team_project_handler import TeamProjectMenuHandler
-from .exam_handler import ExamMenuHandler
-from .default_handler import DefaultMenuHandler
+import importlib
 
-__all__ = [
-    'MenuHandler',
-    'PlanMenuHandler',
-    'OnlineLectureMenuHandler',
-    'NoticeMenuHandler',
-    'LectureMaterialMenuHandler',
-    'AttendanceMenuHandler',
-    'AssignmentMenuHandler',
-    'TeamProjectMenuHandler',
-    'ExamMenuHandler',
-    'DefaultMenuHandler',
-]
\ No newline at end of file
+# 이름 → 정의된 모듈. 핸들러마다 파서와 의존성이 다르므로 처음 쓸 때 불러옵니다. (PEP 562)
+_EXPORTS = {
+    'MenuHandler': '.base',
+    'PlanMenuHandler': '.plan_handler',
+    'OnlineLectureMenuHandler': '.online_lecture_handler',
+    'NoticeMenuHandler': '.notice_handler',
+    'LectureMaterialMenuHandler': '.lecture_material_handler',
+    'AttendanceMenuHandler': '.attendance_handler',
+    'AssignmentMenuHandler': '.assignment_handler',
+    'TeamProjectMenuHandler': '.team_project_handler',
+    'ExamMenuHandler': '.exam_handler',
+    'DefaultMenuHandler': '.default_handler',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,47 @@
+from bs4 import SoupStrainer
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import urljoin
+from config import BASE_URL
+from scrapping.html_parser import Fragment, parse_fragment
+from scrapping.html_text import html_to_text
+
+ARTICLE_BODY = Fragment(css='td.textviewer', strainer=SoupStrainer('td', class_='textviewer'))
+
+
+@dataclass
+class Attachment:
+    name: str
+    url: str
+
+
+def parse_article_detail(html: str) -> Optional[Dict[str, Any]]:
+    """
+    공지사항·강의자료 등 게시글 상세 페이지에서 본문과 첨부 파일 목록을 추출합니다.
+
+    :param html: 상세 페이지 HTML
+    :return: {'content': 본문, 'attachments': [Attachment]} 또는 본문 영역이 없으면 None
+    """
+    soup = parse_fragment(html, ARTICLE_BODY)
+    textviewer = soup.find('td', class_='textviewer')
+    if not textviewer:
+        return None
+
+    # 본문 영역의 줄 바꿈, 문단, 목록, 표를 살려 텍스트로 바꿉니다. 트리는 바뀌지 않습니다.
+    content_div = textviewer.find('div')
+    cleaned_content = html_to_text(content_div) if content_div else None
+
+    # 첨부 파일 처리
+    attachments = []
+    file_div = textviewer.find('div', id='tbody_file')
+    if file_div and file_div.contents:
+        attachments = [_parse_attachment(link) for link in file_div.find_all('a')]
+
+    return {'content': cleaned_content, 'attachments': attachments}
+
+
+def _parse_attachment(link) -> Attachment:
+    href = (link.get('href') or '').strip()
+    # 스크립트로 내려받는 링크는 주소를 알 수 없으므로 url을 비워 둡니다.
+    url = '' if not href or href.startswith('javascript:') or href == '#' else urljoin(BASE_URL + '/', href)
+    return Attachment(name=link.text.strip(), url=url)
@@ -1,16 +1,24 @@
-from bs4 import BeautifulSoup
 from .base import MenuHandler
-from typing import Dict
+from scrapping.html_parser import make_soup
+from typing import Dict, List
 
 class AttendanceMenuHandler(MenuHandler):
-    def handle(self, menu_data: Dict[str, str]) -> None:
-        content = self.session.get_page_content(menu_data['url'])
-        soup = BeautifulSoup(content, 'html.parser')
+    def process(self, content: str, menu_data: Dict[str, str]) -> List[Dict[str, str]]:
+        soup = make_soup(content)
         attendance_records = soup.select('.attendance-record')  # 가정된 CSS 선택자
-        
-        print("출석 현황:")
+
+        results = []
         for record in attendance_records:
             date = record.select_one('.attendance-date')
             status = record.select_one('.attendance-status')
             if date and status:
-                print(f"- {date.text.strip()}: {status.text.strip()}")
+                results.append({
+                    'date': date.text.strip(),
+                    'status': status.text.strip(),
+                })
+        return results
+
+    def display(self, records: List[Dict[str, str]]) -> None:
+        print("출석 현황:")
+        for record in records:
+            print(f"- {record['date']}: {record['status']}")
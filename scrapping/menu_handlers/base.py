@@ -1,12 +1,72 @@
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Any, Dict, NamedTuple, Optional, Set
+from scrapping import debug_capture, metrics
 from scrapping.eclass_session import EclassSession
 
+class PageRequest(NamedTuple):
+    url: str
+    method: str = "GET"
+    data: Optional[Dict[str, Any]] = None
+
 class MenuHandler(ABC):
+    # True이면 서버 세션의 '현재 과목'에 의존하므로 course_context 안에서 실행해야 합니다.
+    # 요청에 과목 키(ky)를 직접 담는 핸들러는 False로 두어 과목 간 병렬 수집을 허용합니다.
+    course_scoped = True
+
     def __init__(self, session: EclassSession, course_id: str):
         self.session = session
         self.course_id = course_id
 
+    def page_request(self, menu_data: Dict[str, str]) -> PageRequest:
+        """메뉴 내용을 가져올 요청을 반환합니다. 기본값은 메뉴 URL에 대한 GET입니다."""
+        return PageRequest(menu_data['url'])
+
     @abstractmethod
-    def handle(self, menu_data):
-        pass
\ No newline at end of file
+    def process(self, content: str, menu_data: Dict[str, str]) -> Any:
+        """응답 본문을 구조화된 결과로 변환합니다."""
+        pass
+
+    def collect(self, menu_data: Dict[str, str]) -> Any:
+        """메뉴 내용을 가져와 구조화된 결과로 반환합니다. 출력이나 입력을 하지 않습니다."""
+        request = self.page_request(menu_data)
+        content = self.session.get_page_content(request.url, method=request.method, data=request.data)
+        with self.parse_timer():
+            return self.process(content, menu_data)
+
+    def collect_incremental(self, menu_data: Dict[str, str], known_keys: Set[str]) -> Any:
+        """
+        이전 수집에서 본 항목(known_keys)을 알고 있을 때의 collect입니다.
+        이미 아는 항목을 다시 가져오지 않을 수 있는 핸들러가 재정의합니다.
+        EclassManager의 수집은 이전 수집이 없어도(known_keys가 빈 집합) 이 메서드를 씁니다.
+        """
+        return self.collect(menu_data)
+
+    async def collect_async(self, menu_data: Dict[str, str]) -> Any:
+        """collect의 비동기 버전입니다. session은 AsyncEclassSession이어야 합니다."""
+        request = self.page_request(menu_data)
+        content = await self.session.get_page_content(request.url, method=request.method, data=request.data)
+        with self.parse_timer():
+            return self.process(content, menu_data)
+
+    async def collect_incremental_async(self, menu_data: Dict[str, str], known_keys: Set[str]) -> Any:
+        """collect_incremental의 비동기 버전입니다."""
+        return await self.collect_async(menu_data)
+
+    def parse_timer(self):
+        """응답을 결과로 바꾸는 구간을 eclass_parse_seconds{handler=클래스 이름}으로 잽니다."""
+        return metrics.timed('eclass_parse_seconds', handler=type(self).__name__)
+
+    def capture_debug(self, content: str, url: str, failed: bool = False) -> None:
+        """
+        응답 원본을 디버깅용으로 백그라운드에서 저장합니다. 파싱에 실패했으면(failed) 항상,
+        아니면 표본으로만 저장합니다. (scrapping/debug_capture.py)
+        """
+        debug_capture.capture(content, metrics.endpoint_label(url), self.course_id, failed)
+
+    def display(self, result: Any) -> None:
+        print("처리 결과:", result)
+
+    def handle(self, menu_data: Dict[str, str]) -> Any:
+        result = self.collect(menu_data)
+        self.display(result)
+        return result
@@ -1,6 +1,15 @@
-from . import MenuHandler
+from .base import MenuHandler
 from typing import Dict, List, Optional
 
 class DefaultMenuHandler(MenuHandler):
+    def process(self, content: str, menu_data: Dict[str, str]) -> None:
+        return None
+
+    def collect(self, menu_data: Dict[str, str]) -> None:
+        return None
+
+    async def collect_async(self, menu_data: Dict[str, str]) -> None:
+        return None
+
     def handle(self, menu_data: Dict[str, str]) -> None:
         print(f"메뉴 '{menu_data['name']}'에 대한 처리가 구현되지 않았습니다.")
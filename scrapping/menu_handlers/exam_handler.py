@@ -1,17 +1,26 @@
-from bs4 import BeautifulSoup
 from .base import MenuHandler
-from typing import Dict
+from scrapping.html_parser import make_soup
+from typing import Dict, List
 
 class ExamMenuHandler(MenuHandler):
-    def handle(self, menu_data: Dict[str, str]) -> None:
-        content = self.session.get_page_content(menu_data['url'])
-        soup = BeautifulSoup(content, 'html.parser')
+    def process(self, content: str, menu_data: Dict[str, str]) -> List[Dict[str, str]]:
+        soup = make_soup(content)
         exams = soup.select('.exam-list-item')  # 가정된 CSS 선택자
-        
-        print("시험 일정:")
+
+        results = []
         for exam in exams:
             title = exam.select_one('.exam-title')
             date = exam.select_one('.exam-date')
             time = exam.select_one('.exam-time')
             if title and date and time:
-                print(f"- {title.text.strip()} (날짜: {date.text.strip()}, 시간: {time.text.strip()})")
\ No newline at end of file
+                results.append({
+                    'title': title.text.strip(),
+                    'date': date.text.strip(),
+                    'time': time.text.strip(),
+                })
+        return results
+
+    def display(self, exams: List[Dict[str, str]]) -> None:
+        print("시험 일정:")
+        for exam in exams:
+            print(f"- {exam['title']} (날짜: {exam['date']}, 시간: {exam['time']})")
@@ -1,21 +1,59 @@
-from typing import Dict, Type
-from scrapping.eclass_session import EclassSession, MenuType
+import importlib
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Dict, Iterator, Type
+from scrapping.models import MenuType
 from .base import MenuHandler
-from . import PlanMenuHandler, OnlineLectureMenuHandler, NoticeMenuHandler, LectureMaterialMenuHandler, AttendanceMenuHandler, AssignmentMenuHandler, TeamProjectMenuHandler, ExamMenuHandler, DefaultMenuHandler
+
+if TYPE_CHECKING:
+    from scrapping.eclass_session import EclassSession
+
+
+def load_handler(path: str) -> Type[MenuHandler]:
+    """'모듈:클래스' 경로의 핸들러 클래스를 불러옵니다. 모듈 경로는 이 패키지 기준 상대 경로도 됩니다."""
+    module_name, _, class_name = path.partition(':')
+    return getattr(importlib.import_module(module_name, __package__), class_name)
+
+
+class LazyHandlerMap(Mapping):
+    """
+    MenuType → 핸들러 클래스 매핑입니다.
+
+    클래스를 '모듈:클래스' 경로로 적어 두고 처음 찾을 때 불러와 캐시하므로,
+    수집하지 않는 메뉴의 핸들러 모듈(과 그 파서)은 불러오지 않습니다.
+    """
+
+    def __init__(self, paths: Dict[MenuType, str]):
+        self._paths = dict(paths)
+        self._classes: Dict[MenuType, Type[MenuHandler]] = {}
+
+    def __getitem__(self, menu_type: MenuType) -> Type[MenuHandler]:
+        handler_class = self._classes.get(menu_type)
+        if handler_class is None:
+            # 여러 스레드가 동시에 불러와도 import 잠금 덕분에 같은 클래스를 얻습니다.
+            handler_class = self._classes[menu_type] = load_handler(self._paths[menu_type])
+        return handler_class
+
+    def __iter__(self) -> Iterator[MenuType]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
 
 class MenuFactory:
-    handler_map: Dict[MenuType, Type[MenuHandler]] = {
-        MenuType.PLAN: PlanMenuHandler,
-        MenuType.ONLINE_LECTURE: OnlineLectureMenuHandler,
-        MenuType.NOTICE: NoticeMenuHandler,
-        MenuType.LECTURE_MATERIAL: LectureMaterialMenuHandler,
-        MenuType.ATTENDANCE: AttendanceMenuHandler,
-        MenuType.ASSIGNMENT: AssignmentMenuHandler,
-        MenuType.TEAM_PROJECT: TeamProjectMenuHandler,
-        MenuType.EXAM: ExamMenuHandler,
-    }
+    handler_map: Mapping[MenuType, Type[MenuHandler]] = LazyHandlerMap({
+        MenuType.PLAN: '.plan_handler:PlanMenuHandler',
+        MenuType.ONLINE_LECTURE: '.online_lecture_handler:OnlineLectureMenuHandler',
+        MenuType.NOTICE: '.notice_handler:NoticeMenuHandler',
+        MenuType.LECTURE_MATERIAL: '.lecture_material_handler:LectureMaterialMenuHandler',
+        MenuType.ATTENDANCE: '.attendance_handler:AttendanceMenuHandler',
+        MenuType.ASSIGNMENT: '.assignment_handler:AssignmentMenuHandler',
+        MenuType.TEAM_PROJECT: '.team_project_handler:TeamProjectMenuHandler',
+        MenuType.EXAM: '.exam_handler:ExamMenuHandler',
+    })
+    default_handler = '.default_handler:DefaultMenuHandler'
 
     @staticmethod
-    def create_handler(menu_type: MenuType, session: EclassSession, course_id: str) -> MenuHandler:
-        handler_class = MenuFactory.handler_map.get(menu_type, DefaultMenuHandler)
-        return handler_class(session, course_id)
\ No newline at end of file
+    def create_handler(menu_type: MenuType, session: 'EclassSession', course_id: str) -> MenuHandler:
+        handler_class = MenuFactory.handler_map.get(menu_type) or load_handler(MenuFactory.default_handler)
+        return handler_class(session, course_id)
@@ -1,16 +1,34 @@
-from bs4 import BeautifulSoup
-from .base import MenuHandler
-from config import BASE_URL
-from typing import Dict, List
+import asyncio
+from bs4 import SoupStrainer
+from .base import MenuHandler, PageRequest
+from .article_detail import Attachment, parse_article_detail
+from concurrent.futures import ThreadPoolExecutor
+from config import BASE_URL, MATERIAL_DETAIL_WORKERS
+from scrapping.eclass_session import EclassRequestError
+from scrapping.html_parser import Fragment, parse_fragment
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
 import logging
 
+MATERIAL_TABLE = Fragment(css='table.bbslist', strainer=SoupStrainer('table', class_='bbslist'))
+
+@dataclass
+class LectureMaterial:
+    number: str
+    title: str
+    date: str
+    file: str
+    article_num: str
+    content: Optional[str] = None
+    attachments: List[Attachment] = field(default_factory=list)
+    details_fetched: bool = False
+
 class LectureMaterialMenuHandler(MenuHandler):
-    def handle(self, menu_data: Dict[str, str]) -> None:
-        materials = self.get_lecture_materials()
-        self.print_lecture_materials(materials)
+    # 목록과 상세 요청에 과목 키(ky)를 직접 담으므로 현재 과목에 의존하지 않습니다.
+    course_scoped = False
 
-    def get_lecture_materials(self) -> List[Dict[str, str]]:
-        list_url = f"{BASE_URL}/st/course/lecture_material_list_form.acl"
+    def page_request(self, menu_data: Dict[str, str] = None) -> PageRequest:
+        list_url = f"{BASE_URL}/ilos/st/course/lecture_material_list.acl"
         params = {
             'start': '',
             'display': '1',
@@ -19,66 +37,156 @@ class LectureMaterialMenuHandler(MenuHandler):
             'ky': self.course_id,
             'encoding': 'utf-8'
         }
-        content = self.session.get_page_content(list_url, method="POST", data=params)
+        return PageRequest(list_url, "POST", params)
+
+    def process(self, content: str, menu_data: Dict[str, str] = None) -> List[LectureMaterial]:
         return self.parse_materials(content)
 
-    def parse_materials(self, content: str) -> List[Dict[str, str]]:
-            soup = BeautifulSoup(content, 'html.parser')
+    def collect(self, menu_data: Dict[str, str] = None) -> List[LectureMaterial]:
+        return self.get_lecture_materials()
+
+    def collect_incremental(self, menu_data: Dict[str, str], known_keys: Set[str]) -> List[LectureMaterial]:
+        # 이미 본 글은 상세 페이지를 요청하지 않습니다.
+        return self.get_lecture_materials(known_article_nums=known_keys)
+
+    async def collect_async(self, menu_data: Dict[str, str] = None) -> List[LectureMaterial]:
+        materials = await super().collect_async(menu_data)
+        await self.fetch_material_details_async(materials)
+        return materials
+
+    async def collect_incremental_async(self, menu_data: Dict[str, str], known_keys: Set[str]) -> List[LectureMaterial]:
+        materials = await super().collect_async(menu_data)
+        await self.fetch_material_details_async(materials, known_keys)
+        return materials
+
+    async def fetch_material_details_async(self, materials: List[LectureMaterial],
+                                           known_article_nums: Optional[Iterable[str]] = None) -> None:
+        """fetch_material_details의 비동기 버전입니다."""
+        known = set(known_article_nums or ())
+        semaphore = asyncio.Semaphore(MATERIAL_DETAIL_WORKERS)
+
+        async def fetch(material: LectureMaterial) -> None:
+            request = self._detail_request(material.article_num)
+            try:
+                async with semaphore:
+                    content = await self.session.post_request(request.url, request.data)
+            except EclassRequestError as e:
+                logging.error(f"강의 자료 {material.article_num} 상세 요청 중 오류 발생: {e}")
+                content = ""
+            self._apply_details(material, content)
+
+        await asyncio.gather(*(fetch(material) for material in materials
+                               if material.article_num and material.article_num not in known))
+
+    def display(self, materials: List[LectureMaterial]) -> None:
+        self.print_lecture_materials(materials)
+
+    def get_lecture_materials(self, known_article_nums: Optional[Iterable[str]] = None,
+                              with_details: bool = True,
+                              max_workers: int = MATERIAL_DETAIL_WORKERS) -> List[LectureMaterial]:
+        """
+        강의 자료 목록을 한 번 가져온 뒤 상세 페이지를 동시에 가져옵니다.
+
+        :param known_article_nums: 이미 알고 있는 글 번호. 이 글들은 상세 페이지를 요청하지 않습니다.
+        :param with_details: False이면 목록만 반환합니다.
+        :param max_workers: 동시에 요청할 상세 페이지 수
+        """
+        request = self.page_request()
+        content = self.session.get_page_content(request.url, method=request.method, data=request.data)
+        with self.parse_timer():
+            materials = self.parse_materials(content)
+        if with_details:
+            self.fetch_material_details(materials, known_article_nums, max_workers)
+        return materials
+
+    def fetch_material_details(self, materials: List[LectureMaterial],
+                               known_article_nums: Optional[Iterable[str]] = None,
+                               max_workers: int = MATERIAL_DETAIL_WORKERS) -> None:
+        known = set(known_article_nums or ())
+        targets = [m for m in materials if m.article_num and m.article_num not in known]
+        if not targets:
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            contents = executor.map(self._fetch_detail_content, targets)
+            for material, content in zip(targets, contents):
+                self._apply_details(material, content)
+
+    def get_material_details(self, article_num: str) -> Optional[Dict[str, object]]:
+        request = self._detail_request(article_num)
+        content = self.session.post_request(request.url, request.data)
+        return parse_article_detail(content) if content else None
+
+    def _fetch_detail_content(self, material: LectureMaterial) -> str:
+        request = self._detail_request(material.article_num)
+        try:
+            return self.session.post_request(request.url, request.data)
+        except EclassRequestError as e:
+            # 한 글의 실패로 나머지 상세 정보를 버리지 않습니다. details_fetched가 False로 남습니다.
+            logging.error(f"강의 자료 {material.article_num} 상세 요청 중 오류 발생: {e}")
+            return ""
+
+    def _detail_request(self, article_num: str) -> PageRequest:
+        view_url = f"{BASE_URL}/ilos/st/course/lecture_material_view_form.acl"
+        params = {
+            'ARTL_NUM': article_num,
+            'ud': self.session.username,
+            'ky': self.course_id,
+            'encoding': 'utf-8'
+        }
+        return PageRequest(view_url, "POST", params)
+
+    def _apply_details(self, material: LectureMaterial, content: str) -> None:
+        with self.parse_timer():
+            detail = parse_article_detail(content) if content else None
+        if content:
+            self.capture_debug(content, self._detail_request(material.article_num).url, failed=detail is None)
+        material.content = detail['content'] if detail else None
+        material.attachments = detail['attachments'] if detail else []
+        material.details_fetched = detail is not None
+
+    def parse_materials(self, content: str) -> List[LectureMaterial]:
+            soup = parse_fragment(content, MATERIAL_TABLE)
             material_rows = soup.select('table.bbslist > tbody > tr')
-            
-            logging.info(f"파싱된 강의 자료 행 수: {len(material_rows)}")
-            
-            if not material_rows:
-                logging.warning("강의 자료 테이블을 찾을 수 없습니다. HTML 내용:")
-                logging.warning(content[:500])  # HTML 내용의 일부만 로깅
+
+            logging.debug(f"파싱된 강의 자료 행 수: {len(material_rows)}")
+
+            # 자료가 없는 과목도 표는 있으므로, 표가 없을 때만 실패로 봅니다.
+            table_missing = soup.find('table', class_='bbslist') is None
+            if table_missing:
+                # 원본 HTML은 로그 대신 debug/에 압축해 저장합니다.
+                logging.warning(f"강의 자료 테이블을 찾을 수 없습니다. (과목 {self.course_id})")
+            self.capture_debug(content, self.page_request().url, failed=table_missing)
 
             materials = []
             for i, row in enumerate(material_rows):
                 columns = row.select('td')
                 if len(columns) >= 4:
-                    article_num = row.get('id', '').split('_')[-1]
-                    material = {
-                        'number': columns[0].text.strip(),
-                        'title': columns[1].text.strip(),
-                        'date': columns[2].text.strip(),
-                        'file': columns[3].text.strip(),
-                        'details': self.get_material_details(article_num)
-                    }
+                    material = LectureMaterial(
+                        number=columns[0].text.strip(),
+                        title=columns[1].text.strip(),
+                        date=columns[2].text.strip(),
+                        file=columns[3].text.strip(),
+                        article_num=row.get('id', '').split('_')[-1],
+                    )
                     materials.append(material)
-                    logging.info(f"파싱된 강의 자료 {i+1}: {material['title']}")
+                    logging.debug(f"파싱된 강의 자료 {i+1}: {material.title}")
                 else:
                     logging.warning(f"행 {i+1}에 충분한 열이 없습니다: {len(columns)} 열 발견")
 
-            logging.info(f"총 파싱된 강의 자료 수: {len(materials)}")
+            logging.debug(f"총 파싱된 강의 자료 수: {len(materials)}")
             return materials
 
-    def get_lecture_materials(self) -> List[Dict[str, str]]:
-        list_url = f"{BASE_URL}/st/course/lecture_material_list.acl"
-        params = {
-            'start': '',
-            'display': '1',
-            'SCH_VALUE': '',
-            'ud': self.session.username,
-            'ky': self.course_id,
-            'encoding': 'utf-8'
-        }
-        content = self.session.get_page_content(list_url, method="POST", data=params)
-        
-        logging.info("강의 자료 목록 HTML 내용 일부:")
-        logging.info(content[:500])  # HTML 내용의 일부만 로깅
-        
-        return self.parse_materials(content)
-
-
-    def print_lecture_materials(self, materials: List[Dict[str, str]]) -> None:
+    def print_lecture_materials(self, materials: List[LectureMaterial]) -> None:
         if not materials:
             logging.info("강의 자료가 없습니다.")
             return
 
         logging.info("강의 자료 목록:")
         for material in materials:
-            logging.info(f"- [{material['number']}] {material['title']} (업로드 날짜: {material['date']}, 파일: {material['file']})")
-            logging.info(f"  내용: {material['details']['content'][:100]}...")
-            if material['details']['attachments']:
-                logging.info(f"  첨부파일: {', '.join(material['details']['attachments'])}")
-            logging.info("")
\ No newline at end of file
+            logging.info(f"- [{material.number}] {material.title} (업로드 날짜: {material.date}, 파일: {material.file})")
+            if material.content:
+                logging.info(f"  내용: {material.content[:100]}...")
+            if material.attachments:
+                logging.info(f"  첨부파일: {', '.join(attachment.name for attachment in material.attachments)}")
+            logging.info("")
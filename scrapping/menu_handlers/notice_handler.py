@@ -1,59 +1,257 @@
-import os
-from bs4 import BeautifulSoup
-from .base import MenuHandler
-from typing import Dict, List
-from config import BASE_URL, get_config
-from scrapping.eclass_session import EclassSession
+import asyncio
+from bs4 import SoupStrainer
+from .base import MenuHandler, PageRequest
+from .article_detail import Attachment, parse_article_detail
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+from config import BASE_URL, NOTICE_PAGE_SIZE, NOTICE_FETCH_CONTENT, NOTICE_DETAIL_WORKERS
+from scrapping.eclass_session import EclassRequestError
+from scrapping.html_parser import Fragment, parse_fragment
+import logging
 import re
 
-class NoticeMenuHandler(MenuHandler):
-    def __init__(self, session: EclassSession, course_id: str):
-        super().__init__(session, course_id)
-        self.config = get_config()
+NOTICE_ROWS = Fragment(css='tr[style="cursor: pointer;"]', strainer=SoupStrainer('tr', style="cursor: pointer;"))
+# 공지가 하나도 없어도 목록 표는 있습니다. 표까지 없으면 예상과 다른 응답입니다.
+NOTICE_TABLE = Fragment(css='table.bbslist', strainer=SoupStrainer('table', class_='bbslist'))
+
+@dataclass
+class Notice:
+    number: str
+    title: str
+    author: str
+    date: str
+    views: str
+    detail_url: str
+    content: Optional[str] = None
+    attachments: List[Attachment] = field(default_factory=list)
+    details_fetched: bool = False
+
+    @property
+    def number_value(self) -> Optional[int]:
+        """글 번호를 정수로 반환합니다. 상단 고정 공지처럼 번호가 없으면 None입니다."""
+        return int(self.number) if self.number.isdigit() else None
+
+def _first_number(notices: List[Notice]) -> Optional[int]:
+    """페이지에서 번호가 있는 첫 공지의 번호. 상단 고정 공지는 모든 페이지 맨 위에 반복되므로 건너뜁니다."""
+    return next((notice.number_value for notice in notices if notice.number_value is not None), None)
+
+
+def _needs_backfill(notices: List[Notice], known_keys: Set[str]) -> bool:
+    """첫 페이지의 번호 있는 공지가 모두 새 글이라 다음 페이지를 더 읽어야 하는지 판단합니다."""
+    return (any(key.isdigit() for key in known_keys) and len(notices) >= NOTICE_PAGE_SIZE
+            and not any(notice.number_value is not None and notice.number in known_keys for notice in notices))
+
+
+def _known_max(known_keys: Set[str]) -> int:
+    return max(int(key) for key in known_keys if key.isdigit())
 
-    def handle(self, menu_data: Dict[str, str] = None) -> None:
-        self._handle_notices()
 
-    def _handle_notices(self) -> None:
+class NoticeMenuHandler(MenuHandler):
+    # notice_list.acl 요청에 과목 키(ky)를 직접 담으므로 현재 과목에 의존하지 않습니다.
+    course_scoped = False
+
+    def page_request(self, menu_data: Dict[str, str] = None, page: int = 1,
+                     page_size: int = NOTICE_PAGE_SIZE) -> PageRequest:
         notice_url = f"{BASE_URL}/ilos/st/course/notice_list.acl"
         data = {
-            'start': '1',
-            'display': '1',
+            'start': str(page),
+            'display': str(page_size),
             'SCH_VALUE': '',
-            'ud': self.config['credentials']['username'],
+            'ud': self.session.username,
             'ky': self.course_id,
             'encoding': 'utf-8'
         }
-        
-        # logging.info(f"Sending request to {notice_url}")
-        content = self.session.post_request(notice_url, data)
-        # logging.info(f"Received response. Content length: {len(content)}")
-        
+        return PageRequest(notice_url, "POST", data)
+
+    def process(self, content: str, menu_data: Dict[str, str] = None) -> List[Notice]:
+        if not content:
+            logging.error("공지사항을 불러올 수 없습니다.")
+            return []
+
+        notices = self._parse_notices(content)
+        # 공지가 없는 과목은 실패가 아닙니다. 목록 표를 찾지 못했을 때만 실패로 저장합니다.
+        failed = not notices and parse_fragment(content, NOTICE_TABLE).find('table') is None
+        self.capture_debug(content, self.page_request().url, failed=failed)
+        return notices
+
+    def collect(self, menu_data: Dict[str, str] = None) -> List[Notice]:
+        # 최근 공지 확인에는 첫 페이지만 읽습니다. 전체 이력은 iter_notices()를 사용합니다.
+        # 상세 페이지는 수집(collect_incremental)에서만 가져옵니다.
+        return list(self.iter_notices(max_pages=1))
+
+    def collect_incremental(self, menu_data: Dict[str, str], known_keys: Set[str]) -> List[Notice]:
+        notices = list(self.iter_notices(max_pages=1))
+        if _needs_backfill(notices, known_keys):
+            # 첫 페이지가 모두 새 글이면 알고 있는 글을 만날 때까지 다음 페이지를 읽습니다.
+            # 첫 페이지는 응답 캐시에 있으므로 다시 요청하지 않습니다.
+            notices = list(self.iter_notices(stop_at=_known_max(known_keys)))
+        # 이미 본 공지는 상세 페이지를 요청하지 않습니다.
+        self.fetch_notice_details(notices, known_keys)
+        return notices
+
+    async def collect_incremental_async(self, menu_data: Dict[str, str], known_keys: Set[str]) -> List[Notice]:
+        notices = await super().collect_async(menu_data)
+        if _needs_backfill(notices, known_keys):
+            # collect_incremental과 같이 알고 있는 글을 만날 때까지 다음 페이지를 읽습니다.
+            notices = await self._read_until_async(notices, _known_max(known_keys))
+        await self.fetch_notice_details_async(notices, known_keys)
+        return notices
+
+    async def _read_until_async(self, first_page: List[Notice], stop_at: int,
+                                page_size: int = NOTICE_PAGE_SIZE) -> List[Notice]:
+        """iter_notices(stop_at=...)의 비동기 버전입니다. 이미 받은 첫 페이지 다음부터 차례로 요청합니다."""
+        notices, page_notices, page = [], first_page, 1
+        pinned: Set[str] = set()
+        while True:
+            for notice in page_notices:
+                if notice.number_value is not None and notice.number_value <= stop_at:
+                    return notices
+                if self._is_repeated_pin(notice, pinned):
+                    continue
+                notices.append(notice)
+            if len(page_notices) < page_size:
+                return notices
+            page += 1
+            request = self.page_request(page=page, page_size=page_size)
+            content = await self.session.post_request(request.url, request.data)
+            with self.parse_timer():
+                next_notices = self.process(content)
+            # 서버가 start를 무시하고 같은 페이지를 돌려주면 무한히 반복하지 않도록 멈춥니다.
+            first = _first_number(next_notices)
+            if first is None or first == _first_number(page_notices):
+                return notices
+            page_notices = next_notices
+
+    async def fetch_notice_details_async(self, notices: List[Notice],
+                                         known_keys: Optional[Iterable[str]] = None) -> None:
+        """fetch_notice_details의 비동기 버전입니다."""
+        if not NOTICE_FETCH_CONTENT:
+            return
+        known = set(known_keys or ())
+        semaphore = asyncio.Semaphore(NOTICE_DETAIL_WORKERS)
+
+        async def fetch(notice: Notice) -> None:
+            try:
+                async with semaphore:
+                    content = await self.session.post_request(notice.detail_url, data={})
+            except EclassRequestError as e:
+                logging.error(f"공지사항 {notice.number} 상세 요청 중 오류 발생: {e}")
+                content = ""
+            self._apply_details(notice, content)
+
+        await asyncio.gather(*(fetch(notice) for notice in notices
+                               if notice.detail_url and notice.number not in known))
+
+    def fetch_notice_details(self, notices: List[Notice], known_keys: Optional[Iterable[str]] = None,
+                             max_workers: int = NOTICE_DETAIL_WORKERS) -> None:
+        """
+        공지의 상세 페이지를 동시에 가져와 본문과 첨부 파일을 채웁니다.
+        NOTICE_FETCH_CONTENT가 False이면 아무것도 하지 않습니다.
+
+        :param known_keys: 이미 알고 있는 글 번호. 이 글들은 상세 페이지를 요청하지 않습니다.
+        """
+        if not NOTICE_FETCH_CONTENT:
+            return
+        known = set(known_keys or ())
+        targets = [notice for notice in notices if notice.detail_url and notice.number not in known]
+        if not targets:
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            contents = executor.map(self._fetch_detail_content, targets)
+            for notice, content in zip(targets, contents):
+                self._apply_details(notice, content)
+
+    def _fetch_detail_content(self, notice: Notice) -> str:
+        try:
+            return self.session.post_request(notice.detail_url, data={})
+        except EclassRequestError as e:
+            # 한 글의 실패로 나머지 상세 정보를 버리지 않습니다. details_fetched가 False로 남습니다.
+            logging.error(f"공지사항 {notice.number} 상세 요청 중 오류 발생: {e}")
+            return ""
+
+    def _apply_details(self, notice: Notice, content: str) -> None:
+        with self.parse_timer():
+            detail = parse_article_detail(content) if content else None
         if content:
-            self._save_html_content(content, 'notice_list.html')
-            notices = self._parse_notices(content)
-            self._display_notices(notices)
+            self.capture_debug(content, notice.detail_url, failed=detail is None)
+        notice.content = detail['content'] if detail else None
+        notice.attachments = detail['attachments'] if detail else []
+        notice.details_fetched = detail is not None
+
+    def iter_notices(self, page_size: int = NOTICE_PAGE_SIZE, stop_at: Optional[int] = None,
+                     max_pages: Optional[int] = None) -> Iterator[Notice]:
+        """
+        공지사항을 최신 글부터 페이지 단위로 가져오며 하나씩 내보냅니다.
+
+        현재 페이지를 소비하는 동안 다음 페이지를 백그라운드에서 미리 요청하고,
+        메모리에는 최대 두 페이지만 유지합니다.
+
+        :param page_size: 한 번에 요청할 공지 수
+        :param stop_at: 이 번호 이하의 공지(이미 알고 있는 공지)를 만나면 멈춥니다.
+        :param max_pages: 최대로 읽을 페이지 수 (None이면 끝까지)
+        """
+        executor = ThreadPoolExecutor(max_workers=1)
+        future: Optional[Future] = executor.submit(self._fetch_notice_page, 1, page_size)
+        page = 1
+        previous_first = None
+        pinned: Set[str] = set()
+        try:
+            while future is not None:
+                notices = future.result()
+                future = None
+                # 서버가 start를 무시하고 같은 페이지를 돌려주면 무한히 반복하지 않도록 멈춥니다.
+                # 상단 고정 공지는 모든 페이지에 반복되므로 번호 있는 첫 공지로 비교합니다.
+                first = _first_number(notices)
+                if not notices or (page > 1 and (first is None or first == previous_first)):
+                    return
+                previous_first = first
+
+                reaches_known = stop_at is not None and any(
+                    notice.number_value is not None and notice.number_value <= stop_at for notice in notices)
+                has_next = len(notices) >= page_size and (max_pages is None or page < max_pages)
+                if has_next and not reaches_known:
+                    future = executor.submit(self._fetch_notice_page, page + 1, page_size)
+
+                for notice in notices:
+                    if stop_at is not None and notice.number_value is not None and notice.number_value <= stop_at:
+                        return
+                    if self._is_repeated_pin(notice, pinned):
+                        continue
+                    yield notice
+                page += 1
+        finally:
+            if future is not None:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    @staticmethod
+    def _is_repeated_pin(notice: Notice, pinned: Set[str]) -> bool:
+        """앞 페이지에서 이미 내보낸 상단 고정 공지이면 True입니다. 처음 보면 pinned에 기록합니다."""
+        if notice.number_value is not None:
+            return False
+        key = notice.detail_url or notice.title
+        if key in pinned:
+            return True
+        pinned.add(key)
+        return False
+
+    def _fetch_notice_page(self, page: int, page_size: int) -> List[Notice]:
+        request = self.page_request(page=page, page_size=page_size)
+        content = self.session.post_request(request.url, request.data)
+        with self.parse_timer():
+            return self.process(content)
+
+    def display(self, notices: List[Notice]) -> None:
+        if notices:
+            # 오래된 공지부터 보여줍니다.
+            self._display_notices(list(reversed(notices)))
         else:
-            # logging.error("No content received from the server")
             print("공지사항을 불러올 수 없습니다.")
 
-    def _save_html_content(self, html_content: str, filename: str) -> None:
-        try:
-            debug_dir = os.path.join(os.getcwd(), 'debug')
-            os.makedirs(debug_dir, exist_ok=True)
-            
-            file_path = os.path.join(debug_dir, filename)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
-            # logging.info(f"HTML content saved to {file_path}")
-            print(f"HTML 내용이 {file_path}에 저장되었습니다.")
-        except Exception as e:
-            # logging.error(f"Error saving HTML content: {e}")
-            print("HTML 내용 저장 중 오류가 발생했습니다.")
-
-    def _parse_notices(self, html_content: str) -> List[Dict[str, str]]:
-        soup = BeautifulSoup(html_content, 'html.parser')
+    def _parse_notices(self, html_content: str) -> List[Notice]:
+        soup = parse_fragment(html_content, NOTICE_ROWS)
         notice_rows = soup.find_all('tr', style="cursor: pointer;")
         
         if not notice_rows:
@@ -71,17 +269,16 @@ class NoticeMenuHandler(MenuHandler):
                 onclick_value = cols[2].get('onclick', '')
                 detail_url = self._extract_detail_url(onclick_value)
                 
-                notice = {
-                    'number': cols[0].text.strip(),
-                    'title': title,
-                    'author': author,
-                    'date': cols[4].text.strip(),
-                    'views': views,
-                    'detail_url': detail_url
-                }
+                notice = Notice(
+                    number=cols[0].text.strip(),
+                    title=title,
+                    author=author,
+                    date=cols[4].text.strip(),
+                    views=views,
+                    detail_url=detail_url
+                )
                 notices.append(notice)
                 # logging.info(f"Parsed notice: {notice}")
-        notices.reverse()
 
         return notices
 
@@ -91,13 +288,13 @@ class NoticeMenuHandler(MenuHandler):
             return BASE_URL + match.group(1)
         return ""
 
-    def _display_notices(self, notices: List[Dict[str, str]]) -> None:
+    def _display_notices(self, notices: List[Notice]) -> None:
         print("\n=== 공지사항 목록 ===")
         for idx, notice in enumerate(notices, 1):
-            print(f"{idx}. 제목: {notice['title']}")
-            print(f"   작성자: {notice['author']}")
-            print(f"   게시일: {notice['date']}")
-            print(f"   조회수: {notice['views']}")
+            print(f"{idx}. 제목: {notice.title}")
+            print(f"   작성자: {notice.author}")
+            print(f"   게시일: {notice.date}")
+            print(f"   조회수: {notice.views}")
             print("-" * 30)
         
         while True:
@@ -115,61 +312,57 @@ class NoticeMenuHandler(MenuHandler):
                 print("숫자를 입력해주세요.")
 
     # 공지사항 세부 정보 확인
-    def _display_notice_detail(self, notice: Dict[str, str]) -> None:
-        detail_url = notice['detail_url']
+    def get_notice_detail(self, notice: Notice) -> Optional[Dict[str, Any]]:
+        """
+        공지사항 상세 페이지를 가져와 본문과 첨부 파일 목록을 반환합니다.
+
+        :param notice: _parse_notices가 반환한 공지사항
+        :return: {'content': 본문, 'attachments': [Attachment]} 또는 실패 시 None
+        """
+        detail_url = notice.detail_url
         if not detail_url:
-            print("공지사항 상세 정보를 불러올 수 없습니다.")
-            return
+            return None
 
         content = self.session.post_request(detail_url, data={})
         if not content:
-            print("공지사항 상세 내용을 불러올 수 없습니다.")
+            return None
+
+        return parse_article_detail(content)
+
+    def _display_notice_detail(self, notice: Notice) -> None:
+        if not notice.detail_url:
+            print("공지사항 상세 정보를 불러올 수 없습니다.")
             return
 
-        soup = BeautifulSoup(content, 'html.parser')
-        textviewer = soup.find('td', class_='textviewer')
-        
-        if not textviewer:
-            print("공지사항 상세 내용을 파싱할 수 없습니다.")
+        if notice.details_fetched:
+            # 수집할 때 이미 가져온 상세 내용은 다시 요청하지 않습니다.
+            detail = {'content': notice.content, 'attachments': notice.attachments}
+        else:
+            try:
+                detail = self.get_notice_detail(notice)
+            except EclassRequestError as e:
+                logging.error(f"공지사항 상세 요청 중 오류 발생: {e}")
+                detail = None
+        if detail is None:
+            print("공지사항 상세 내용을 불러올 수 없습니다.")
             return
 
         print("\n=== 공지사항 상세 ===")
-        print(f"제목: {notice['title']}")
-        print(f"작성자: {notice['author']}")
-        print(f"게시일: {notice['date']}")
-        print(f"조회수: {notice['views']}")
+        print(f"제목: {notice.title}")
+        print(f"작성자: {notice.author}")
+        print(f"게시일: {notice.date}")
+        print(f"조회수: {notice.views}")
         print("\n내용:")
         
-        content_div = textviewer.find('div')
-        if content_div:
-            # HTML 태그 처리
-            for br in content_div.find_all('br'):
-                br.replace_with('\n')
-            
-            for p in content_div.find_all('p'):
-                p.insert_after(soup.new_string('\n'))
-            
-            # 공백 유지하면서 텍스트 추출
-            cleaned_content = ''
-            for element in content_div.contents:
-                if element.name == 'p':
-                    cleaned_content += element.get_text(strip=False) + '\n'
-                elif isinstance(element, str):
-                    cleaned_content += element
-            
-            # 연속된 빈 줄 제거
-            cleaned_content = '\n'.join([line for line in cleaned_content.splitlines() if line.strip() or line.isspace()])
-            
+        if detail['content'] is not None:
             # 줄 바꿈 유지하면서 출력
-            print(cleaned_content)
+            print(detail['content'])
         else:
             print("내용을 찾을 수 없습니다.")
         
-        # 첨부 파일 처리
-        file_div = textviewer.find('div', id='tbody_file')
-        if file_div and file_div.contents:
+        if detail['attachments']:
             print("\n첨부 파일:")
-            for file in file_div.find_all('a'):
-                print(f"- {file.text.strip()}")
+            for attachment in detail['attachments']:
+                print(f"- {attachment.name}")
         
-        input("\n엔터를 누르면 목록으로 돌아갑니다...")
\ No newline at end of file
+        input("\n엔터를 누르면 목록으로 돌아갑니다...")
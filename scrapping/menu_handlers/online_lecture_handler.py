@@ -1,16 +1,24 @@
-from bs4 import BeautifulSoup
 from .base import MenuHandler
-from typing import Dict
+from scrapping.html_parser import make_soup
+from typing import Dict, List
 
 class OnlineLectureMenuHandler(MenuHandler):
-    def handle(self, menu_data: Dict[str, str]) -> None:
-        content = self.session.get_page_content(menu_data['url'])
-        soup = BeautifulSoup(content, 'html.parser')
+    def process(self, content: str, menu_data: Dict[str, str]) -> List[Dict[str, str]]:
+        soup = make_soup(content)
         lectures = soup.select('.lecture-list-item')  # 가정된 CSS 선택자
-        
-        print("온라인 강의 목록:")
+
+        results = []
         for lecture in lectures:
             title = lecture.select_one('.lecture-title')
             date = lecture.select_one('.lecture-date')
             if title and date:
-                print(f"- {title.text.strip()} (날짜: {date.text.strip()})")
+                results.append({
+                    'title': title.text.strip(),
+                    'date': date.text.strip(),
+                })
+        return results
+
+    def display(self, lectures: List[Dict[str, str]]) -> None:
+        print("온라인 강의 목록:")
+        for lecture in lectures:
+            print(f"- {lecture['title']} (날짜: {lecture['date']})")
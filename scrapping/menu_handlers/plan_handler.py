@@ -1,29 +1,42 @@
 import os
-from bs4 import BeautifulSoup
-from .base import MenuHandler
-from typing import Dict, Any
-from config import BASE_URL
+import logging
+from .base import MenuHandler, PageRequest
+from typing import Dict, Any, Optional
+from config import BASE_URL, EXPORT_DIR
+from scrapping.html_parser import make_soup
 
 # 강의계획서
 class PlanMenuHandler(MenuHandler):
-    def handle(self, menu_data: Dict[str, str]) -> None:
+    def page_request(self, menu_data: Dict[str, str]) -> PageRequest:
         plan_view_url = f"{BASE_URL}/ilos/st/course/plan_view.acl"
         data = {
             'SCH_PROF': menu_data.get('SCH_PROF', ''),
             'encoding': 'utf-8'
         }
-        content = self.session.post_request(plan_view_url, data)
-        soup = BeautifulSoup(content, 'html.parser')
+        return PageRequest(plan_view_url, "POST", data)
+
+    def process(self, content: str, menu_data: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        # 섹션 제목 div 다음의 표를 find_next로 찾으므로 문서 전체를 파싱합니다.
+        soup = make_soup(content)
         
         plan_info = self._extract_plan_info(soup)
-        
+        # 섹션을 하나도 채우지 못했으면 페이지 구조가 바뀐 것으로 보고 원본을 남깁니다.
+        found = any(plan_info.values())
+        self.capture_debug(content, self.page_request(menu_data).url, failed=not found)
+
+        if not found:
+            logging.warning("강의계획서 정보를 찾을 수 없습니다.")
+            return None
+
+        text_content = self._generate_text(plan_info)
+        # 동시 수집 시 과목끼리 같은 파일을 덮어쓰지 않도록 과목 ID를 기본 이름으로 씁니다.
+        if not self._save_text_to_file(text_content, menu_data.get('SCH_PROF', self.course_id)):
+            logging.error("강의계획서 파일 저장에 실패했습니다.")
+        return plan_info
+
+    def display(self, plan_info: Optional[Dict[str, Any]]) -> None:
         if plan_info:
-            text_content = self._generate_text(plan_info)
-            success = self._save_text_to_file(text_content, menu_data.get('SCH_PROF', 'unknown'))
-            if success:
-                self._print_plan_info(plan_info)
-            else:
-                print("강의계획서 파일 저장에 실패했습니다.")
+            self._print_plan_info(plan_info)
         else:
             print("강의계획서 정보를 찾을 수 없습니다.")
 
@@ -74,57 +87,47 @@ class PlanMenuHandler(MenuHandler):
                     })
 
     def _generate_text(self, plan_info: Dict[str, Any]) -> str:
-        text = "강의계획서 정보\n\n"
-        
+        lines = ["강의계획서 정보", ""]
+
         for section, content in plan_info.items():
-            text += f"{section}\n\n"
+            lines += [section, ""]
             if isinstance(content, dict):
-                for key, value in content.items():
-                    text += f"{key}: {value}\n"
-                text += "\n"
+                lines.extend(f"{key}: {value}" for key, value in content.items())
+                lines.append("")
             elif isinstance(content, list):
                 for item in content:
-                    text += f"{item['주차']}. {item['내용']}\n"
+                    lines.append(f"{item['주차']}. {item['내용']}")
                     if item['비고']:
-                        text += f"   비고: {item['비고']}\n"
-                text += "\n"
-        
-        return text
+                        lines.append(f"   비고: {item['비고']}")
+                lines.append("")
+
+        # 줄마다 줄 바꿈으로 끝나도록 빈 문자열을 하나 더해 이어 붙입니다.
+        return "\n".join(lines + [""])
 
     def _save_text_to_file(self, text_content: str, course_id: str) -> bool:
         try:
-            print("파일 저장 시작")
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            print(f"현재 디렉토리: {current_dir}")
-
-            # 상대 경로로 export 디렉토리 찾기 시도
-            relative_export_dir = os.path.join(current_dir, '..', 'export')
-            if os.path.exists(os.path.dirname(relative_export_dir)):
-                export_dir = relative_export_dir
-                print(f"상대 경로 사용: {export_dir}")
-            else:
-                # 상대 경로 실패 시 절대 경로 사용
-                export_dir = r"C:\Users\elaus\Projects\Eclass\export"
-                print(f"절대 경로 사용: {export_dir}")
+            logging.debug("파일 저장 시작")
+            # 요약 단계(processing)가 읽는 디렉토리입니다.
+            export_dir = EXPORT_DIR
 
             # export 디렉토리가 없으면 생성
             os.makedirs(export_dir, exist_ok=True)
-            print(f"내보내기 디렉토리 생성 완료")
+            logging.debug("내보내기 디렉토리 생성 완료")
             
             # 파일 이름에 사용할 수 없는 문자 제거
             safe_course_id = ''.join(c for c in course_id if c.isalnum() or c in ('-', '_'))
             filename = os.path.join(export_dir, f"강의계획서_{safe_course_id}.txt")
-            print(f"저장할 파일 경로: {filename}")
+            logging.debug(f"저장할 파일 경로: {filename}")
             
             # 파일 쓰기
             with open(filename, "w", encoding="utf-8") as f:
                 f.write(text_content)
             
-            print(f"강의계획서가 '{filename}' 파일로 저장되었습니다.")
+            logging.info(f"강의계획서가 '{filename}' 파일로 저장되었습니다.")
             return True
         except Exception as e:
-            print(f"파일 저장 중 오류 발생: {str(e)}")
-            print(f"현재 작업 디렉토리: {os.getcwd()}")
+            logging.error(f"파일 저장 중 오류 발생: {str(e)}")
+            logging.error(f"현재 작업 디렉토리: {os.getcwd()}")
             return False
 
     def _print_plan_info(self, plan_info: Dict[str, Any]):
@@ -1,17 +1,26 @@
-from bs4 import BeautifulSoup
 from .base import MenuHandler
-from typing import Dict
+from scrapping.html_parser import make_soup
+from typing import Dict, List
 
 class TeamProjectMenuHandler(MenuHandler):
-    def handle(self, menu_data: Dict[str, str]) -> None:
-        content = self.session.get_page_content(menu_data['url'])
-        soup = BeautifulSoup(content, 'html.parser')
+    def process(self, content: str, menu_data: Dict[str, str]) -> List[Dict[str, str]]:
+        soup = make_soup(content)
         projects = soup.select('.team-project-item')  # 가정된 CSS 선택자
-        
-        print("팀 프로젝트 목록:")
+
+        results = []
         for project in projects:
             title = project.select_one('.project-title')
             deadline = project.select_one('.project-deadline')
             team = project.select_one('.project-team')
             if title and deadline and team:
-                print(f"- {title.text.strip()} (마감일: {deadline.text.strip()}, 팀: {team.text.strip()})")
+                results.append({
+                    'title': title.text.strip(),
+                    'deadline': deadline.text.strip(),
+                    'team': team.text.strip(),
+                })
+        return results
+
+    def display(self, projects: List[Dict[str, str]]) -> None:
+        print("팀 프로젝트 목록:")
+        for project in projects:
+            print(f"- {project['title']} (마감일: {project['deadline']}, 팀: {project['team']})")
@@ -0,0 +1,329 @@
+import bisect
+import copy
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from config import METRICS_LATENCY_BUCKETS
+
+if TYPE_CHECKING:
+    import pstats
+    from http.server import ThreadingHTTPServer
+
+# 지표 이름 → Prometheus HELP 문구
+METRIC_HELP = {
+    'eclass_request_seconds': "e-Class HTTP 요청 한 번(재시도 한 번)의 응답 시간",
+    'eclass_requests_total': "e-Class HTTP 요청 수 (status는 상태 코드 또는 error)",
+    'eclass_response_bytes_total': "e-Class 응답 본문 바이트 수",
+    'eclass_request_retries_total': "e-Class 요청 재시도 수",
+    'eclass_parse_seconds': "핸들러가 응답 HTML을 결과로 바꾸는 데 걸린 시간",
+    'eclass_debug_captures_total': "디버그용으로 저장한 원본 HTML 수 (reason은 failure, sample 또는 dropped)",
+    'summary_request_seconds': "요약 API 요청 한 번의 응답 시간",
+    'summary_requests_total': "요약 API 요청 수 (status는 ok 또는 상태 코드)",
+    'summary_request_retries_total': "요약 API 요청 재시도 수",
+    'summary_tokens_total': "요약 API가 보고한 사용 토큰 수",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def endpoint_label(url: str) -> str:
+    """URL의 마지막 경로 조각(예: notice_list.acl)을 엔드포인트 이름으로 씁니다."""
+    path = urlsplit(url).path
+    return path.rsplit('/', 1)[-1] or '/'
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: 'Histogram') -> None:
+        if other.buckets != self.buckets:
+            raise ValueError("버킷 경계가 다른 히스토그램은 합칠 수 없습니다.")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.sum += other.sum
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        """버킷 안에서 선형 보간한 분위수 추정값입니다. (Prometheus histogram_quantile과 같은 방식)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                if index == len(self.buckets):
+                    return lower  # +Inf 버킷은 가장 큰 경계로 봅니다.
+                return lower + (self.buckets[index] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """
+    카운터와 히스토그램을 이름과 레이블별로 모으는 저장소입니다.
+
+    여러 스레드가 동시에 기록해도 되며, to_prometheus()는 Prometheus 텍스트 형식을,
+    summary_table()은 실행이 끝날 때 출력할 표를 만듭니다.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = METRICS_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timed(self, name: str, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def snapshot(self) -> Tuple[Dict[str, Dict[Labels, float]], Dict[str, Dict[Labels, Histogram]]]:
+        """지금까지의 값을 복사합니다. 다른 프로세스에서 모은 값을 merge()로 합칠 때 씁니다."""
+        with self._lock:
+            return copy.deepcopy((self._counters, self._histograms))
+
+    def merge(self, snapshot: Tuple[Dict[str, Dict[Labels, float]], Dict[str, Dict[Labels, Histogram]]]) -> None:
+        counters, histograms = snapshot
+        with self._lock:
+            for name, series in counters.items():
+                target = self._counters.setdefault(name, {})
+                for labels, value in series.items():
+                    target[labels] = target.get(labels, 0.0) + value
+            for name, series in histograms.items():
+                target = self._histograms.setdefault(name, {})
+                for labels, histogram in series.items():
+                    if labels in target:
+                        target[labels].merge(histogram)
+                    else:
+                        target[labels] = copy.deepcopy(histogram)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def to_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.extend(_header(name, 'counter'))
+                lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}"
+                             for labels, value in sorted(series.items()))
+            for name, series in sorted(self._histograms.items()):
+                lines.extend(_header(name, 'histogram'))
+                for labels, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + (float('inf'),), histogram.counts):
+                        cumulative += count
+                        le = '+Inf' if bound == float('inf') else _format_value(bound)
+                        lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str) -> None:
+        """node_exporter 텍스트 파일 수집기가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 바꿔치기합니다."""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write(self.to_prometheus())
+        os.replace(temp_path, path)
+
+    def summary_table(self) -> str:
+        with self._lock:
+            histograms = {name: dict(series) for name, series in self._histograms.items()}
+            counters = {name: dict(series) for name, series in self._counters.items()}
+
+        rows = []
+        for name, series in sorted(histograms.items()):
+            for labels, histogram in sorted(series.items()):
+                rows.append((
+                    f"{name.replace('_seconds', '')} {','.join(value for _, value in labels)}",
+                    str(histogram.count),
+                    f"{histogram.sum:.2f}",
+                    f"{histogram.sum / histogram.count * 1000:.1f}",
+                    f"{histogram.quantile(0.5) * 1000:.1f}",
+                    f"{histogram.quantile(0.99) * 1000:.1f}",
+                ))
+        if not rows:
+            return "기록된 지표가 없습니다."
+
+        header = ('항목', '횟수', '합계(s)', '평균(ms)', 'p50(ms)', 'p99(ms)')
+        widths = [max(len(row[i]) for row in rows + [header]) for i in range(len(header))]
+        lines = ['  '.join(cell.ljust(widths[0]) if i == 0 else cell.rjust(widths[i]) for i, cell in enumerate(row))
+                 for row in [header] + rows]
+
+        # 요청 수가 있는 엔드포인트별로 상태 코드, 재시도, 받은 바이트를 덧붙입니다.
+        statuses: Dict[str, List[str]] = {}
+        for labels, value in sorted(counters.get('eclass_requests_total', {}).items()):
+            label_map = dict(labels)
+            statuses.setdefault(label_map.get('endpoint', ''), []).append(f"{label_map.get('status')}×{value:.0f}")
+        for endpoint, codes in statuses.items():
+            retries = counters.get('eclass_request_retries_total', {}).get((('endpoint', endpoint),), 0)
+            received = counters.get('eclass_response_bytes_total', {}).get((('endpoint', endpoint),), 0)
+            lines.append(f"{endpoint}: 상태 {' '.join(codes)}, 재시도 {retries:.0f}, {received / 1024:.1f}KB")
+
+        captures: Dict[str, float] = {}
+        for labels, value in counters.get('eclass_debug_captures_total', {}).items():
+            reason = dict(labels).get('reason', '')
+            captures[reason] = captures.get(reason, 0) + value
+        if captures:
+            lines.append(f"디버그 HTML 저장: {' '.join(f'{reason}×{value:.0f}' for reason, value in sorted(captures.items()))}")
+        return '\n'.join(lines)
+
+
+def _header(name: str, kind: str) -> List[str]:
+    help_text = METRIC_HELP.get(name)
+    return ([f"# HELP {name} {help_text}"] if help_text else []) + [f"# TYPE {name} {kind}"]
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    escaped = (f'{key}="{_escape(value)}"' for key, value in labels)
+    return '{' + ','.join(escaped) + '}'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+REGISTRY = MetricsRegistry()
+inc = REGISTRY.inc
+observe = REGISTRY.observe
+timed = REGISTRY.timed
+
+
+def record_request(url: str, status: str, seconds: float, size: int = 0) -> None:
+    """HTTP 요청 한 번의 결과를 기록합니다. status는 상태 코드 또는 'error'입니다."""
+    endpoint = endpoint_label(url)
+    REGISTRY.observe('eclass_request_seconds', seconds, endpoint=endpoint)
+    REGISTRY.inc('eclass_requests_total', endpoint=endpoint, status=status)
+    if size:
+        REGISTRY.inc('eclass_response_bytes_total', size, endpoint=endpoint)
+
+
+def record_retry(url: str) -> None:
+    REGISTRY.inc('eclass_request_retries_total', endpoint=endpoint_label(url))
+
+
+def serve_metrics(port: int, host: str = '127.0.0.1', registry: MetricsRegistry = REGISTRY) -> 'ThreadingHTTPServer':
+    """/metrics에서 Prometheus 텍스트 형식을 내주는 서버를 백그라운드 스레드로 띄웁니다."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.to_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+    logging.info(f"지표를 http://{host}:{server.server_address[1]}/metrics 에서 제공합니다.")
+    return server
+
+
+class Profiler:
+    """
+    이름(핸들러)별로 cProfile 결과를 모읍니다. enable()하기 전에는 아무것도 하지 않습니다.
+
+    여러 스레드에서 같은 이름을 프로파일하면 결과를 합칩니다. 다른 프로파일러가 이미
+    동작 중이라 시작할 수 없는 환경(Python 3.12 이상의 동시 프로파일링)에서는 그 블록을
+    프로파일 없이 실행하므로, 빠짐없이 보려면 --workers 1로 수집합니다.
+    """
+
+    def __init__(self):
+        self.directory: Optional[str] = None
+        self._stats: Dict[str, 'pstats.Stats'] = {}
+        self._lock = threading.Lock()
+
+    def enable(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+
+    @contextmanager
+    def profile(self, name: str) -> Iterator[None]:
+        if self.directory is None:
+            yield
+            return
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            yield
+            return
+        try:
+            yield
+        finally:
+            profiler.disable()
+            with self._lock:
+                if name in self._stats:
+                    self._stats[name].add(profiler)
+                else:
+                    self._stats[name] = pstats.Stats(profiler)
+
+    def dump(self) -> List[str]:
+        """이름마다 <directory>/<이름>.prof를 쓰고 경로 목록을 반환합니다. (snakeviz 등으로 열 수 있습니다)"""
+        if self.directory is None:
+            return []
+        paths = []
+        with self._lock:
+            for name, stats in self._stats.items():
+                path = os.path.join(self.directory, f"{name}.prof")
+                stats.dump_stats(path)
+                paths.append(path)
+        if paths:
+            logging.info(f"프로파일 {len(paths)}개를 {self.directory}에 저장했습니다.")
+        return paths
+
+
+PROFILER = Profiler()
+profile = PROFILER.profile
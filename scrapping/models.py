@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from enum import Enum, auto
+
+
+# 저장소·변경 감지처럼 HTTP 세션이 필요 없는 모듈도 쓰는 자료형입니다.
+# requests와 bs4를 불러오지 않도록 eclass_session과 따로 둡니다.
+@dataclass
+class Course:
+    id: str
+    name: str
+    code: str
+    time: str
+
+class MenuType(Enum):
+    PLAN = auto()
+    ONLINE_LECTURE = auto()
+    NOTICE = auto()
+    LECTURE_MATERIAL = auto()
+    ATTENDANCE = auto()
+    ASSIGNMENT = auto()
+    TEAM_PROJECT = auto()
+    EXAM = auto()
@@ -0,0 +1,251 @@
+import configparser
+import logging
+import multiprocessing
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from config import CRAWL_MAX_WORKERS, MULTI_ACCOUNT_MAX_PROCESSES, SHARED_MENU_TYPES
+from . import metrics
+from .change_detector import INCREMENTAL_ITEM_TYPES, ChangeDetector
+from .eclass_manager import CourseCrawlResult, EclassManager, _to_jsonable
+from .eclass_session import EclassSession
+from .models import Course, MenuType
+
+PROFILE_PREFIX = 'credentials:'
+SHARED_MENUS = frozenset(MenuType[name] for name in SHARED_MENU_TYPES)
+
+
+@dataclass
+class MergedCourseResult(CourseCrawlResult):
+    """
+    여러 계정의 수집 결과를 과목별로 합친 결과입니다.
+
+    results와 errors에는 공유 메뉴(SHARED_MENU_TYPES)를 맡은 계정의 결과가,
+    personal과 personal_errors에는 계정별 개인 메뉴(출석, 과제 등)의 결과가 들어갑니다.
+
+    EclassStore.save_crawl_results는 한 계정 수집과 마찬가지로 공유 메뉴만 저장합니다.
+    개인 메뉴는 JSON 출력과 ChangeDetector.detect_personal이 계정별로 기록하는 변경 피드에만 남습니다.
+    """
+    accounts: List[str] = field(default_factory=list)
+    personal: Dict[str, Dict[MenuType, Any]] = field(default_factory=dict)
+    personal_errors: Dict[str, Dict[MenuType, str]] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = super().to_dict()
+        data['accounts'] = self.accounts
+        data['personal'] = {
+            account: {menu_type.name: _to_jsonable(result) for menu_type, result in results.items()}
+            for account, results in self.personal.items()
+        }
+        data['personal_errors'] = {
+            account: {menu_type.name: error for menu_type, error in errors.items()}
+            for account, errors in self.personal_errors.items()
+        }
+        return data
+
+
+def list_profiles(config_path: str = 'config.ini') -> List[str]:
+    """config.ini에 있는 [credentials:<이름>] 섹션의 이름들을 반환합니다."""
+    config = configparser.ConfigParser()
+    config.read(config_path)
+    return [section[len(PROFILE_PREFIX):] for section in config.sections() if section.startswith(PROFILE_PREFIX)]
+
+
+def assign_owners(course_lists: Dict[str, List[Course]]) -> Dict[str, str]:
+    """
+    과목마다 공유 메뉴를 수집할 계정을 하나씩 정합니다. (과목 ID → 프로필)
+
+    수강하는 계정이 적은 과목부터, 지금까지 맡은 과목이 가장 적은 계정에게 맡겨
+    계정별 요청 수가 고르게 나뉘도록 합니다.
+    """
+    enrolled: Dict[str, List[str]] = {}
+    for profile, courses in course_lists.items():
+        for course in courses:
+            enrolled.setdefault(course.id, []).append(profile)
+
+    load = dict.fromkeys(course_lists, 0)
+    owners = {}
+    for course_id, profiles in sorted(enrolled.items(), key=lambda item: (len(item[1]), item[0])):
+        owner = min(profiles, key=load.get)
+        owners[course_id] = owner
+        load[owner] += 1
+    return owners
+
+
+def merge_results(account_results: Dict[str, List[CourseCrawlResult]]) -> List[MergedCourseResult]:
+    """계정별 수집 결과를 과목별로 합칩니다. 공유 메뉴는 먼저 들어온 결과를 씁니다."""
+    merged: Dict[str, MergedCourseResult] = {}
+    for profile, results in account_results.items():
+        _merge_into(merged, profile, results)
+    return list(merged.values())
+
+
+def _merge_into(merged: Dict[str, MergedCourseResult], profile: str, results: List[CourseCrawlResult]) -> None:
+    for result in results:
+        entry = merged.get(result.course.id)
+        if entry is None:
+            entry = merged[result.course.id] = MergedCourseResult(course=result.course, menus=dict(result.menus))
+        if profile not in entry.accounts:
+            entry.accounts.append(profile)
+        for menu_type, data in result.results.items():
+            if menu_type in SHARED_MENUS:
+                entry.results.setdefault(menu_type, data)
+                # 다른 계정이 다시 수집해 성공했으면 앞선 실패는 지웁니다.
+                entry.errors.pop(menu_type, None)
+            else:
+                entry.personal.setdefault(profile, {})[menu_type] = data
+        for menu_type, error in result.errors.items():
+            if menu_type in SHARED_MENUS:
+                if menu_type not in entry.results:
+                    entry.errors.setdefault(menu_type, error)
+            else:
+                entry.personal_errors.setdefault(profile, {})[menu_type] = error
+
+
+def _record_unowned(merged: Dict[str, MergedCourseResult], courses: List[Course], reason: str) -> None:
+    """공유 메뉴를 수집한 계정이 없는 과목은 변경 감지가 삭제로 보지 않도록 오류로 남깁니다."""
+    for course in courses:
+        entry = merged.setdefault(course.id, MergedCourseResult(course=course))
+        for menu_type in SHARED_MENUS:
+            if menu_type not in entry.results:
+                entry.errors.setdefault(menu_type, reason)
+
+
+def _take_metrics():
+    # 풀의 작업자 프로세스는 여러 작업을 실행하므로, 보낸 값은 지워 두 번 합치지 않게 합니다.
+    snapshot = metrics.REGISTRY.snapshot()
+    metrics.REGISTRY.reset()
+    return snapshot
+
+
+def _list_courses(profile: str, use_cache: bool):
+    """작업자 프로세스: 로그인해 과목 목록을 가져옵니다. 로그인 쿠키는 다음 단계가 재사용합니다."""
+    session = EclassSession(use_cache=use_cache, profile=profile)
+    if not session.ensure_login():
+        raise RuntimeError("로그인 실패")
+    return session.get_course_list(), _take_metrics()
+
+
+def _known_keys_snapshot(change_detector: Optional[ChangeDetector],
+                         course_ids: Iterable[str]) -> Optional[Dict[Tuple[str, MenuType], Set[str]]]:
+    """
+    맡은 과목의 공유 메뉴 중 증분 수집하는 메뉴에서 이미 본 항목 키를 모읍니다.
+    작업자 프로세스는 저장소를 열지 않으므로 이 값을 넘겨 받아 아는 항목을 다시 가져오지 않습니다.
+    """
+    if change_detector is None:
+        return None
+    return {
+        (course_id, menu_type): change_detector.known_keys(course_id, menu_type)
+        for course_id in course_ids
+        for menu_type in INCREMENTAL_ITEM_TYPES if menu_type in SHARED_MENUS
+    }
+
+
+def _crawl_account(profile: str, use_cache: bool, owned: Set[str], max_workers: int, personal: bool = True,
+                   known_keys: Optional[Dict[Tuple[str, MenuType], Set[str]]] = None):
+    """
+    작업자 프로세스: 한 계정이 맡은 과목(owned)의 공유 메뉴와, personal이면 모든 과목의 개인 메뉴를 수집합니다.
+    known_keys는 _known_keys_snapshot이 만든 이미 본 항목 키입니다.
+    """
+    manager = EclassManager(use_cache=use_cache, profile=profile, known_keys=known_keys)
+    results = manager.crawl_all(
+        max_workers=max_workers,
+        menu_filter=lambda course, menu_type: course.id in owned if menu_type in SHARED_MENUS else personal,
+    )
+    return results, _take_metrics()
+
+
+def crawl_accounts(profiles: List[str], use_cache: bool = True, max_workers: int = CRAWL_MAX_WORKERS,
+                   processes: Optional[int] = MULTI_ACCOUNT_MAX_PROCESSES,
+                   change_detector: Optional[ChangeDetector] = None) -> List[MergedCourseResult]:
+    """
+    여러 계정을 계정마다 별도 프로세스에서 수집하고 결과를 과목별로 합칩니다.
+
+    계정마다 세션, 쿠키 파일, 응답 캐시 이름공간, 요청 속도 제한을 따로 씁니다.
+    먼저 모든 계정의 과목 목록을 가져와 함께 듣는 과목의 공유 메뉴를 맡을 계정을
+    정한 뒤, 각 계정은 자기가 맡은 과목의 공유 메뉴와 모든 과목의 개인 메뉴를
+    수집합니다. 두 번째 단계는 첫 단계에서 저장한 쿠키로 세션을 복원합니다.
+    수집에 실패한 계정이 맡았던 과목의 공유 메뉴는 그 과목을 듣는 다른 계정이
+    다시 수집하고, 맡을 계정이 없으면 errors에 남깁니다.
+
+    :param processes: 동시에 실행할 프로세스 수 (None이면 CPU 코어 수)
+    :param change_detector: 있으면 계정마다 맡은 과목에서 이미 본 항목을 알려 주어 건너뛰며
+                            수집하게 하고, 합친 결과에서 변경 사항을 찾아 내보냅니다.
+    """
+    if not profiles:
+        logging.error("config.ini에 [credentials:<이름>] 섹션이 없습니다.")
+        return []
+
+    processes = min(len(profiles), processes or os.cpu_count() or 1)
+    # 부모 프로세스의 스레드(지표 서버 등)와 잠금 상태를 물려받지 않도록 spawn으로 띄웁니다.
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context) as executor:
+        course_lists: Dict[str, List[Course]] = {}
+        futures = {profile: executor.submit(_list_courses, profile, use_cache) for profile in profiles}
+        for profile, future in futures.items():
+            try:
+                courses, snapshot = future.result()
+            except Exception as e:
+                logging.error(f"{profile} 계정의 과목 목록을 가져오지 못했습니다: {e}")
+                continue
+            metrics.REGISTRY.merge(snapshot)
+            course_lists[profile] = courses
+
+        owners = assign_owners(course_lists)
+        enrollments = Counter(course.id for courses in course_lists.values() for course in courses)
+        shared = sum(1 for count in enrollments.values() if count > 1)
+        logging.info(f"계정 {len(course_lists)}개, 과목 {len(owners)}개 (함께 듣는 과목 {shared}개), 프로세스 {processes}개")
+
+        futures = {}
+        for profile, courses in course_lists.items():
+            owned = {course.id for course in courses if owners[course.id] == profile}
+            futures[profile] = executor.submit(_crawl_account, profile, use_cache, owned, max_workers, True,
+                                               _known_keys_snapshot(change_detector, owned))
+        account_results = _collect_account_results(futures)
+        merged: Dict[str, MergedCourseResult] = {}
+        for profile, results in account_results.items():
+            _merge_into(merged, profile, results)
+
+        # 실패한 계정이 맡았던 과목의 공유 메뉴를 그 과목을 듣는 다른 계정에게 다시 맡깁니다.
+        orphaned = {course_id for course_id, owner in owners.items() if owner not in account_results}
+        if orphaned:
+            reassigned = assign_owners({
+                profile: [course for course in courses if course.id in orphaned]
+                for profile, courses in course_lists.items() if profile in account_results
+            })
+            logging.info(f"수집에 실패한 계정의 과목 {len(orphaned)}개 중 {len(reassigned)}개를 다른 계정이 다시 수집합니다.")
+            futures = {}
+            for profile in set(reassigned.values()):
+                owned = {course_id for course_id, owner in reassigned.items() if owner == profile}
+                futures[profile] = executor.submit(_crawl_account, profile, use_cache, owned, max_workers, False,
+                                                   _known_keys_snapshot(change_detector, owned))
+            retried = _collect_account_results(futures)
+            for profile, results in retried.items():
+                _merge_into(merged, profile, results)
+            courses_by_id = {course.id: course for courses in course_lists.values() for course in courses}
+            unowned = [courses_by_id[course_id] for course_id in sorted(orphaned)
+                       if reassigned.get(course_id) not in retried]
+            _record_unowned(merged, unowned, "공유 메뉴를 수집할 계정이 모두 실패했습니다.")
+
+    merged_results = list(merged.values())
+    if change_detector:
+        change_detector.detect(merged_results)
+        change_detector.detect_personal(merged_results)
+    return merged_results
+
+
+def _collect_account_results(futures) -> Dict[str, List[CourseCrawlResult]]:
+    """계정별 수집 작업의 결과를 모읍니다. 실패한 계정은 빠집니다."""
+    account_results: Dict[str, List[CourseCrawlResult]] = {}
+    for profile, future in futures.items():
+        try:
+            results, snapshot = future.result()
+        except Exception as e:
+            logging.error(f"{profile} 계정 수집 중 오류 발생: {e}")
+            continue
+        metrics.REGISTRY.merge(snapshot)
+        account_results[profile] = results
+    return account_results
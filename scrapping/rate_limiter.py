@@ -0,0 +1,79 @@
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """
+    초당 rate개의 토큰이 채워지고 최대 capacity개까지 쌓이는 토큰 버킷입니다.
+
+    reserve()는 토큰 하나를 예약하고 사용 가능해질 때까지 기다려야 할 시간을
+    반환하므로, 동기 코드(time.sleep)와 비동기 코드(asyncio.sleep)가 같은 버킷을
+    공유할 수 있습니다.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate와 capacity는 0보다 커야 합니다.")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0) -> None:
+        import asyncio  # 동기 코드만 쓰는 실행에서는 불러오지 않습니다.
+
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class HostRateLimiter:
+    """
+    호스트별로 TokenBucket을 따로 두어 요청 속도를 제한합니다.
+
+    budget이 있으면 모든 요청이 호스트 버킷과 함께 이 버킷에서도 토큰을 하나씩 씁니다.
+    (예: 데몬의 시간당 요청 예산)
+    """
+
+    def __init__(self, rate: float, capacity: float, budget: Optional[TokenBucket] = None):
+        self.rate = rate
+        self.capacity = capacity
+        self.budget = budget
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.capacity)
+            return bucket
+
+    def acquire(self, url: str) -> None:
+        if self.budget:
+            self.budget.acquire()
+        self.bucket_for(url).acquire()
+
+    async def acquire_async(self, url: str) -> None:
+        if self.budget:
+            await self.budget.acquire_async()
+        await self.bucket_for(url).acquire_async()
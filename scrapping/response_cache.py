@@ -0,0 +1,123 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    body: str
+    stored_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.stored_at < ttl
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    e-Class 페이지 응답을 디스크에 저장하는 캐시입니다.
+
+    키는 (namespace, 메서드, URL, 폼 데이터)로 만들고, 엔드포인트(URL 경로의 마지막
+    부분)마다 다른 TTL을 둡니다. course_scoped 엔드포인트는 진입한 과목 ID도 키에 넣습니다.
+    TTL이 지난 항목은 버리지 않고 ETag/Last-Modified로 조건부 요청을 보내 304를 받으면
+    그대로 다시 사용합니다.
+    """
+
+    def __init__(self, directory: str, ttls: Dict[str, float], namespace: str = '',
+                 course_scoped: Iterable[str] = ()):
+        self.directory = directory
+        self.ttls = ttls
+        self.course_scoped = frozenset(course_scoped)
+        self.namespace = namespace
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stores': 0}
+        self._lock = threading.Lock()
+
+    def ttl_for(self, url: str) -> Optional[float]:
+        """URL에 해당하는 TTL(초)을 반환합니다. 캐시 대상이 아니면 None입니다."""
+        return self.ttls.get(_endpoint(url))
+
+    def make_key(self, method: str, url: str, data: Optional[Dict[str, Any]] = None,
+                 course_id: Optional[str] = None) -> Optional[str]:
+        """
+        캐시 키를 만듭니다. 응답이 현재 과목에 따라 달라지는 엔드포인트에서 진입한 과목(course_id)이
+        없으면 어느 과목의 응답인지 알 수 없으므로 None(캐시하지 않음)을 반환합니다.
+        """
+        scope = None
+        if _endpoint(url) in self.course_scoped:
+            if not course_id:
+                return None
+            scope = course_id
+        form = sorted((str(k), str(v)) for k, v in (data or {}).items())
+        raw = json.dumps([self.namespace, method.upper(), url, form] + ([scope] if scope else []), ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as file:
+                return CacheEntry(**json.load(file))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            logging.warning(f"캐시 항목을 읽을 수 없습니다({key}): {e}")
+            return None
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            # mkstemp는 0600 권한으로 파일을 만듭니다. 캐시에는 개인 정보가 담긴 페이지가 들어갑니다.
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.entry-')
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(asdict(entry), file, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning(f"캐시 저장 중 오류 발생: {e}")
+            return
+        self._count('stores')
+
+    def record_hit(self, url: str) -> None:
+        self._count('hits')
+        logging.debug(f"캐시 적중: {url}")
+
+    def record_revalidated(self, url: str) -> None:
+        self._count('revalidated')
+        logging.debug(f"캐시 재검증(304): {url}")
+
+    def record_miss(self, url: str) -> None:
+        self._count('misses')
+        logging.debug(f"캐시 없음: {url}")
+
+    def log_stats(self) -> None:
+        stats = self.stats
+        logging.info(
+            f"응답 캐시: 적중 {stats['hits']}, 재검증 {stats['revalidated']}, "
+            f"미적중 {stats['misses']}, 저장 {stats['stores']}")
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+
+def _endpoint(url: str) -> str:
+    return urlsplit(url).path.rsplit('/', 1)[-1]
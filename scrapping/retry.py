@@ -0,0 +1,29 @@
+import random
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Optional
+
+# 일시적인 오류로 보고 다시 시도할 HTTP 상태 코드
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """지수 백오프에 full jitter를 적용한 대기 시간(초)을 반환합니다. attempt는 0부터 시작합니다."""
+    return random.uniform(0, min(maximum, base * (2 ** attempt)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 변환합니다."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
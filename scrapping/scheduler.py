@@ -0,0 +1,167 @@
+import heapq
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from config import (
+    POLL_INTERVALS, POLL_DEFAULT_INTERVAL, POLL_MIN_INTERVAL, POLL_MAX_INTERVAL,
+    POLL_JITTER, POLL_BUDGET_PER_HOUR, POLL_COURSE_REFRESH_INTERVAL,
+)
+from .eclass_manager import CourseCrawlResult, EclassManager
+from .models import Course, MenuType
+from .rate_limiter import TokenBucket
+from .store import EclassStore
+
+# 변경이 있으면 주기에 곱하는 값과 없으면 곱하는 값
+SPEED_UP = 0.5
+SLOW_DOWN = 1.5
+
+
+@dataclass(order=True)
+class PollTarget:
+    next_run: float
+    course: Course = field(compare=False)
+    menu_type: MenuType = field(compare=False)
+    menu_data: Dict[str, str] = field(compare=False)
+    interval: float = field(compare=False)
+
+    @property
+    def key(self) -> Tuple[str, MenuType]:
+        return self.course.id, self.menu_type
+
+
+def initial_interval(menu_type: MenuType) -> float:
+    return POLL_INTERVALS.get(menu_type.name, POLL_DEFAULT_INTERVAL)
+
+
+def next_interval(interval: float, changed: bool) -> float:
+    """변경이 있었으면 주기를 줄이고, 없었으면 늘립니다."""
+    interval *= SPEED_UP if changed else SLOW_DOWN
+    return min(POLL_MAX_INTERVAL, max(POLL_MIN_INTERVAL, interval))
+
+
+def jittered(interval: float) -> float:
+    # 여러 과목의 폴링이 같은 순간에 몰리지 않도록 주기를 ±POLL_JITTER만큼 흔듭니다.
+    return interval * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+
+
+class PollScheduler:
+    """
+    하나의 로그인 세션으로 (과목, 메뉴)마다 다른 주기로 폴링하는 데몬입니다.
+
+    주기는 메뉴 종류별 초깃값(POLL_INTERVALS)에서 시작해 변경이 감지되면 짧아지고,
+    변경이 없으면 POLL_MAX_INTERVAL까지 길어집니다. 모든 과목이 시간당 요청 예산
+    (POLL_BUDGET_PER_HOUR)을 나눠 쓰며, 과목 목록과 메뉴는 하루에 한 번 다시 읽습니다.
+    예산은 세션의 속도 제한기에 걸어 두어 상세 페이지, 과목 진입, 과목 목록을 포함한
+    모든 HTTP 요청이 하나씩 씁니다.
+    """
+
+    def __init__(self, manager: EclassManager, store: EclassStore,
+                 budget_per_hour: float = POLL_BUDGET_PER_HOUR):
+        if manager.change_detector is None:
+            raise ValueError("데몬 모드에는 변경 감지기가 필요합니다.")
+        self.manager = manager
+        self.store = store
+        if manager.eclass.cache:
+            # 캐시 TTL 동안 변경이 가려지지 않도록 항상 조건부 요청(ETag/Last-Modified)으로 재검증합니다.
+            manager.eclass.cache.ttls = dict.fromkeys(manager.eclass.cache.ttls, 0)
+        self.budget = TokenBucket(budget_per_hour / 3600, max(1.0, budget_per_hour / 12))
+        manager.eclass.rate_limiter.budget = self.budget
+        self._queue: List[PollTarget] = []
+        self._intervals: Dict[Tuple[str, MenuType], float] = {}
+        self._stop = threading.Event()
+        self._next_refresh = 0.0
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def run(self) -> None:
+        if not self.manager.eclass.ensure_login():
+            logging.error("로그인 실패")
+            return
+
+        while not self._stop.is_set():
+            if time.time() >= self._next_refresh:
+                self._refresh_targets()
+            target = self._queue[0] if self._queue else None
+            wake_at = min(target.next_run if target else self._next_refresh, self._next_refresh)
+            if self._stop.wait(max(0.0, wake_at - time.time())):
+                break
+            if target is None or target.next_run > time.time():
+                continue
+
+            heapq.heappop(self._queue)
+            # 앞선 폴링이 예산을 넘겨 썼으면 갚을 때까지 멈출 수 있게 기다립니다.
+            # (요청마다의 토큰은 세션의 속도 제한기가 씁니다.)
+            wait = self.budget.reserve(0)
+            if wait > 0 and self._stop.wait(wait):
+                break
+            self._poll(target)
+            heapq.heappush(self._queue, target)
+
+        self.manager.eclass.save_cookies()
+        logging.info("폴링을 멈췄습니다.")
+
+    def _poll(self, target: PollTarget) -> None:
+        course, menu_type = target.course, target.menu_type
+        result = CourseCrawlResult(course=course, menus={menu_type: target.menu_data})
+        try:
+            result.results[menu_type] = self.manager.collect_menu(course, menu_type, target.menu_data)
+        except Exception as e:
+            logging.error(f"{course.name} - {menu_type.name} 폴링 중 오류 발생: {e}")
+            # 실패한 메뉴는 변경이 없던 것처럼 주기를 늘려 서버를 계속 두드리지 않습니다.
+            self._reschedule(target, changed=False)
+            return
+
+        events = self.manager.change_detector.detect([result])
+        self.store.save_crawl_results([result])
+        self.manager.eclass.save_cookies()
+        self._reschedule(target, changed=bool(events))
+        log = logging.info if events else logging.debug
+        log(f"{course.name} - {menu_type.name}: 변경 {len(events)}건, 다음 폴링까지 {target.next_run - time.time():.0f}초")
+
+    def _reschedule(self, target: PollTarget, changed: bool) -> None:
+        target.interval = next_interval(target.interval, changed)
+        self._intervals[target.key] = target.interval
+        target.next_run = time.time() + jittered(target.interval)
+
+    def _refresh_targets(self) -> None:
+        """과목 목록과 메뉴를 다시 읽어 폴링 대상을 만듭니다. 기존 대상의 주기와 다음 시각은 유지합니다."""
+        now = time.time()
+        courses = self.manager.eclass.get_course_list(refresh=True)
+        if not courses:
+            # 목록을 읽지 못했을 때 기존 대상을 모두 버리지 않고 잠시 뒤 다시 시도합니다.
+            logging.warning("과목 목록을 가져오지 못해 기존 폴링 대상을 유지합니다.")
+            self._next_refresh = now + POLL_MIN_INTERVAL
+            return
+
+        existing = {target.key: target for target in self._queue}
+        targets = []
+        for course in courses:
+            menus = self.manager.eclass.get_course_menus(course.id, refresh=True)
+            if not menus:
+                targets.extend(target for key, target in existing.items() if key[0] == course.id)
+                continue
+            for menu_type, menu_data in menus.items():
+                key = (course.id, menu_type)
+                interval = self._intervals.setdefault(key, initial_interval(menu_type))
+                # 새 대상은 처음 몇 분 안의 임의 시점에 시작해 한꺼번에 몰리지 않게 합니다.
+                next_run = existing[key].next_run if key in existing else now + random.uniform(0, POLL_MIN_INTERVAL)
+                targets.append(PollTarget(next_run, course, menu_type, menu_data, interval))
+        heapq.heapify(targets)
+        self._queue = targets
+        self._next_refresh = now + POLL_COURSE_REFRESH_INTERVAL
+        logging.info(f"폴링 대상 {len(targets)}개 ({len(courses)}개 과목)")
+
+
+def run_daemon(manager: EclassManager, store: EclassStore, budget_per_hour: Optional[float] = None) -> None:
+    """SIGINT/SIGTERM을 받을 때까지 PollScheduler를 실행합니다."""
+    import signal
+
+    scheduler = PollScheduler(manager, store, budget_per_hour or POLL_BUDGET_PER_HOUR)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: scheduler.stop())
+    scheduler.run()
@@ -0,0 +1,200 @@
+"""
+공지사항, 강의 자료, 강의계획서에 대한 전문 검색 색인입니다.
+
+SQLite FTS5 표(search_index) 하나에 세 종류의 글을 함께 넣습니다. FTS5의 기본 토크나이저는
+공백으로 단어를 나누므로 "중간고사"로 "중간고사일정"을 찾지 못하고, trigram 토크나이저는
+"과제", "시험" 같은 두 글자 단어를 찾지 못합니다. 그래서 글을 색인하기 전에 ngrams()로
+단어마다 두 글자씩 겹쳐 자른 토큰(2-gram)으로 바꿔 넣고, 검색어도 같은 방식으로 바꿉니다.
+
+색인은 원본 표(notices, materials, plan_sections)에 건 트리거가 행을 쓸 때마다 갱신합니다.
+트리거는 파이썬 함수 ngrams()를 부르므로 연결마다 만드는 TEMP 트리거로 둡니다. 그래서
+sqlite3 명령줄 도구처럼 이 함수가 없는 연결도 데이터베이스를 그대로 읽고 쓸 수 있으며,
+그런 연결이 쓴 행은 rebuild()로 다시 색인합니다.
+"""
+import hashlib
+import re
+import sqlite3
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from config import SEARCH_SNIPPET_CHARS
+
+TABLE = 'search_index'
+
+# 밑줄은 FTS5 토크나이저가 구분자로 보므로 단어에서 뺍니다.
+WORD_PATTERN = re.compile(r'[^\W_]+')
+
+# 종류 → (원본 표, 제목 식, 본문 식, 항목 키 식). 식은 트리거에서 new./old. 접두어를 붙여 씁니다.
+SOURCES = {
+    'notice': ('notices', "{row}title", "{row}content", "{row}number"),
+    'material': ('materials', "{row}title",
+                 "COALESCE({row}content, '') || ' ' || COALESCE({row}file, '')", "{row}article_num"),
+    'plan': ('plan_sections', "{row}section || ' ' || {row}item_key",
+             "COALESCE({row}value, '') || ' ' || COALESCE({row}note, '')", "{row}section || ' ' || {row}item_key"),
+}
+KINDS = tuple(SOURCES)
+
+SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5(
+    title, body,
+    kind UNINDEXED, course_id UNINDEXED, item_key UNINDEXED,
+    title_text UNINDEXED, body_text UNINDEXED,
+    tokenize = 'unicode61'
+)
+"""
+
+
+class SearchHit(NamedTuple):
+    kind: str
+    course_id: str
+    course_name: Optional[str]
+    item_key: str
+    title: str
+    snippet: str
+    score: float
+
+
+def ngrams(text: Optional[str]) -> str:
+    """
+    글을 단어마다 두 글자씩 겹쳐 자른 토큰들로 바꿉니다.
+
+    단어의 마지막 글자도 따로 넣어, 한 글자 검색어가 단어의 어느 위치에 있어도
+    접두어 검색(글자*)으로 찾을 수 있게 합니다. ("공지사항" → "공지 지사 사항 항")
+    """
+    if not text:
+        return ''
+    tokens = []
+    for word in WORD_PATTERN.findall(text.lower()):
+        tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        tokens.append(word[-1])
+    return ' '.join(tokens)
+
+
+def search_rowid(kind: str, course_id: str, item_key: str) -> int:
+    """
+    항목의 색인 rowid를 원본 표의 rowid와 무관하게 자연 키에서 만듭니다.
+    VACUUM으로 원본 rowid가 바뀌어도 색인이 어긋나지 않습니다.
+    """
+    digest = hashlib.sha1(f'{kind}\0{course_id}\0{item_key}'.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') >> 1
+
+
+def _insert_sql(kind: str, row: str) -> str:
+    # row가 'new.'이면 트리거 안의 한 행을, ''이면 원본 표의 모든 행을 색인하는 문장을 만듭니다.
+    table, title, body, key = SOURCES[kind]
+    title, body, key = (expression.format(row=row) for expression in (title, body, key))
+    values = (f"search_rowid('{kind}', {row}course_id, {key}), ngrams({title}), ngrams({body}), "
+              f"'{kind}', {row}course_id, {key}, {title}, {body}")
+    insert = f"INSERT OR REPLACE INTO {TABLE} (rowid, title, body, kind, course_id, item_key, title_text, body_text)"
+    if row:
+        return f"{insert} VALUES ({values})"
+    return f"{insert} SELECT {values} FROM main.{table}"
+
+
+def _trigger_sql(kind: str) -> List[str]:
+    table, title, body, key = SOURCES[kind]
+    old_key, old_title, old_body = (expression.format(row='old.') for expression in (key, title, body))
+    new_title, new_body = (expression.format(row='new.') for expression in (title, body))
+    delete = f"DELETE FROM {TABLE} WHERE rowid = search_rowid('{kind}', old.course_id, {old_key})"
+    return [
+        f"CREATE TEMP TRIGGER IF NOT EXISTS {TABLE}_{table}_insert AFTER INSERT ON main.{table} "
+        f"BEGIN {_insert_sql(kind, 'new.')}; END",
+        # 조회수처럼 검색과 무관한 열만 바뀐 경우에는 다시 색인하지 않습니다.
+        f"CREATE TEMP TRIGGER IF NOT EXISTS {TABLE}_{table}_update AFTER UPDATE ON main.{table} "
+        f"WHEN {old_title} IS NOT {new_title} OR {old_body} IS NOT {new_body} "
+        f"BEGIN {delete}; {_insert_sql(kind, 'new.')}; END",
+        f"CREATE TEMP TRIGGER IF NOT EXISTS {TABLE}_{table}_delete AFTER DELETE ON main.{table} "
+        f"BEGIN {delete}; END",
+    ]
+
+
+def install(connection: sqlite3.Connection) -> bool:
+    """
+    연결에 색인 표, 함수, 트리거를 준비합니다. 색인 표를 새로 만들었으면 True를 반환하며,
+    이때는 rebuild()로 기존 행을 색인해야 합니다.
+
+    SQLite에 FTS5가 없으면 sqlite3.OperationalError가 발생합니다.
+    """
+    connection.create_function('ngrams', 1, ngrams, deterministic=True)
+    connection.create_function('search_rowid', 3, search_rowid, deterministic=True)
+    exists = connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (TABLE,)).fetchone()
+    connection.execute(SCHEMA)
+    for kind in KINDS:
+        for statement in _trigger_sql(kind):
+            connection.execute(statement)
+    return exists is None
+
+
+def rebuild(connection: sqlite3.Connection) -> None:
+    """색인을 비우고 원본 표의 모든 행을 다시 색인합니다. 호출하는 쪽에서 트랜잭션을 엽니다."""
+    connection.execute(f"DELETE FROM {TABLE}")
+    for kind in KINDS:
+        connection.execute(_insert_sql(kind, ''))
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    검색어를 FTS5 MATCH 식으로 바꿉니다. 단어마다 2-gram 구문을 만들어 모두 AND로 묶고,
+    한 글자 단어는 그 글자로 시작하는 토큰을 찾는 접두어 검색으로 바꿉니다.
+    검색할 단어가 없으면 None을 반환합니다.
+    """
+    terms = []
+    for word in WORD_PATTERN.findall(query.lower()):
+        if len(word) == 1:
+            terms.append(f'"{word}"*')
+        else:
+            terms.append('"' + ' '.join(word[i:i + 2] for i in range(len(word) - 1)) + '"')
+    return ' AND '.join(terms) or None
+
+
+def make_snippet(text: Optional[str], words: Iterable[str], width: int = SEARCH_SNIPPET_CHARS) -> str:
+    """text에서 검색어가 처음 나오는 곳 주변을 잘라 검색어를 [ ]로 강조합니다."""
+    if not text:
+        return ''
+    text = ' '.join(text.split())
+    pattern = re.compile('|'.join(re.escape(word) for word in sorted(set(words), key=len, reverse=True)),
+                         re.IGNORECASE) if words else None
+    match = pattern.search(text) if pattern else None
+    start = max(0, match.start() - width // 2) if match else 0
+    end = min(len(text), start + width)
+    snippet = text[start:end]
+    if pattern:
+        snippet = pattern.sub(lambda found: f'[{found.group(0)}]', snippet)
+    return ('…' if start > 0 else '') + snippet + ('…' if end < len(text) else '')
+
+
+def search(connection: sqlite3.Connection, query: str, limit: int = 20, course_id: Optional[str] = None,
+           kinds: Optional[Iterable[str]] = None) -> List[SearchHit]:
+    """
+    검색어에 맞는 글을 관련도 순으로 반환합니다. 점수는 BM25이며 제목에서 맞은 경우를
+    본문보다 크게 칩니다. (값이 작을수록 관련도가 높습니다)
+    """
+    match = build_match_query(query)
+    if match is None:
+        return []
+    conditions, params = [f"{TABLE} MATCH ?"], [match]
+    if course_id is not None:
+        conditions.append("course_id = ?")
+        params.append(course_id)
+    if kinds:
+        kinds = list(kinds)
+        conditions.append(f"kind IN ({', '.join('?' for _ in kinds)})")
+        params.extend(kinds)
+    params.append(limit)
+    rows = connection.execute(
+        f"SELECT hits.*, courses.name AS course_name FROM ("
+        f"  SELECT kind, course_id, item_key, title_text, body_text, bm25({TABLE}, 10.0, 1.0) AS score"
+        f"  FROM {TABLE} WHERE {' AND '.join(conditions)} ORDER BY score LIMIT ?"
+        f") AS hits LEFT JOIN courses ON courses.id = hits.course_id ORDER BY score",
+        params).fetchall()
+
+    words = WORD_PATTERN.findall(query)
+    hits = []
+    for kind, hit_course_id, item_key, title, body, score, course_name in rows:
+        snippet = make_snippet(body, words)
+        hits.append(SearchHit(kind, hit_course_id, course_name, item_key, title or '', snippet or title or '', score))
+    return hits
+
+
+def counts(connection: sqlite3.Connection) -> Dict[str, int]:
+    """종류별로 색인된 글 수를 반환합니다."""
+    return dict(connection.execute(f"SELECT kind, COUNT(*) FROM {TABLE} GROUP BY kind").fetchall())
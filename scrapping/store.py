@@ -0,0 +1,307 @@
+import json
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config import STORE_PATH
+from . import search_index
+from .models import Course, MenuType
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS courses (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    code TEXT,
+    time TEXT,
+    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS menus (
+    course_id TEXT NOT NULL,
+    menu_type TEXT NOT NULL,
+    name TEXT,
+    url TEXT,
+    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (course_id, menu_type)
+);
+CREATE TABLE IF NOT EXISTS notices (
+    course_id TEXT NOT NULL,
+    number TEXT NOT NULL,
+    title TEXT,
+    author TEXT,
+    date TEXT,
+    views TEXT,
+    detail_url TEXT,
+    content TEXT,
+    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (course_id, number)
+);
+CREATE TABLE IF NOT EXISTS materials (
+    course_id TEXT NOT NULL,
+    article_num TEXT NOT NULL,
+    number TEXT,
+    title TEXT,
+    date TEXT,
+    file TEXT,
+    content TEXT,
+    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (course_id, article_num)
+);
+CREATE TABLE IF NOT EXISTS attachments (
+    course_id TEXT NOT NULL,
+    post_type TEXT NOT NULL,
+    post_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    name TEXT,
+    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (course_id, post_type, post_id, url)
+);
+CREATE INDEX IF NOT EXISTS attachments_url ON attachments (url);
+CREATE TABLE IF NOT EXISTS plan_sections (
+    course_id TEXT NOT NULL,
+    section TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    value TEXT,
+    note TEXT,
+    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (course_id, section, item_key)
+);
+CREATE TABLE IF NOT EXISTS fingerprints (
+    course_id TEXT NOT NULL,
+    item_type TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (course_id, item_type, item_key)
+);
+CREATE TABLE IF NOT EXISTS summaries (
+    file_name TEXT PRIMARY KEY,
+    sha256 TEXT,
+    summary TEXT,
+    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS notion_pages (
+    entity TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    page_id TEXT NOT NULL,
+    property_hashes TEXT NOT NULL,
+    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (entity, item_key)
+);
+"""
+
+# 이전 버전에서 만든 데이터베이스에 덧붙일 열: (표, 열, 형식)
+MIGRATIONS = [
+    ('notices', 'content', 'TEXT'),
+]
+
+WEEKLY_PLAN_SECTION = '[주별강의계획]'
+
+
+def _upsert_sql(table: str, columns: List[str], keys: List[str], keep_existing: Iterable[str] = ()) -> str:
+    # keep_existing 열은 새 값이 NULL이면 기존 값을 유지합니다. (예: 상세 페이지를 다시 가져오지 않은 강의 자료의 본문)
+    updates = ', '.join(
+        f"{column} = COALESCE(excluded.{column}, {table}.{column})" if column in keep_existing
+        else f"{column} = excluded.{column}"
+        for column in columns if column not in keys)
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+        f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP"
+    )
+
+
+class EclassStore:
+    """
+    수집한 e-Class 데이터를 저장하는 SQLite 저장소입니다.
+
+    각 표는 자연 키(과목 ID + 글 번호 등)를 기본 키로 쓰며 upsert_*는 여러 행을 한
+    트랜잭션에서 executemany로 씁니다. WAL 모드로 열기 때문에 수집기가 쓰는 동안에도
+    다른 프로세스가 읽을 수 있습니다. 쓰기는 하나의 연결을 잠금으로 나눠 씁니다.
+
+    공지사항, 강의 자료, 강의계획서는 쓰는 즉시 전문 검색 색인(search_index)에도 반영됩니다.
+    """
+
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        self._lock = threading.RLock()
+        # 트랜잭션은 transaction()에서 직접 BEGIN/COMMIT합니다.
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        self._migrate()
+        self.search_enabled = self._install_search_index()
+
+    def _migrate(self) -> None:
+        for table, column, column_type in MIGRATIONS:
+            columns = {row['name'] for row in self._connection.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                self._connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+    def _install_search_index(self) -> bool:
+        try:
+            created = search_index.install(self._connection)
+        except sqlite3.OperationalError as e:
+            logging.warning(f"전문 검색 색인을 사용할 수 없습니다 (SQLite FTS5 필요): {e}")
+            return False
+        if created:
+            # 색인이 없던 데이터베이스는 이미 저장된 글을 한 번 색인합니다.
+            self.rebuild_search_index()
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> 'EclassStore':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """중첩해서 써도 가장 바깥 블록이 끝날 때 한 번만 커밋합니다."""
+        with self._lock:
+            if self._connection.in_transaction:
+                yield self._connection
+                return
+            self._connection.execute("BEGIN")
+            try:
+                yield self._connection
+            except BaseException:
+                self._connection.rollback()
+                raise
+            self._connection.commit()
+
+    def query(self, sql: str, params: Iterable[Any] = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(row) for row in self._connection.execute(sql, tuple(params))]
+
+    def upsert_courses(self, courses: Iterable[Course]) -> None:
+        rows = [(course.id, course.name, course.code, course.time) for course in courses]
+        self._upsert('courses', ['id', 'name', 'code', 'time'], ['id'], rows)
+
+    def upsert_menus(self, course_id: str, menus: Dict[MenuType, Dict[str, str]]) -> None:
+        rows = [(course_id, menu_type.name, menu.get('name'), menu.get('url')) for menu_type, menu in menus.items()]
+        self._upsert('menus', ['course_id', 'menu_type', 'name', 'url'], ['course_id', 'menu_type'], rows)
+
+    def upsert_notices(self, course_id: str, notices: Iterable[Any]) -> None:
+        notices = [notice for notice in notices if notice.number]
+        with self.transaction():
+            self._upsert('notices', ['course_id', 'number', 'title', 'author', 'date', 'views', 'detail_url', 'content'],
+                         ['course_id', 'number'],
+                         [(course_id, n.number, n.title, n.author, n.date, n.views, n.detail_url, n.content)
+                          for n in notices],
+                         keep_existing=['content'])
+            for notice in notices:
+                if notice.details_fetched:
+                    self.upsert_attachments(course_id, 'notice', notice.number, notice.attachments)
+
+    def upsert_materials(self, course_id: str, materials: Iterable[Any]) -> None:
+        materials = [material for material in materials if material.article_num]
+        with self.transaction():
+            self._upsert('materials',
+                         ['course_id', 'article_num', 'number', 'title', 'date', 'file', 'content'],
+                         ['course_id', 'article_num'],
+                         [(course_id, m.article_num, m.number, m.title, m.date, m.file, m.content) for m in materials],
+                         keep_existing=['content'])
+            for material in materials:
+                if material.details_fetched:
+                    self.upsert_attachments(course_id, 'material', material.article_num, material.attachments)
+
+    def upsert_attachments(self, course_id: str, post_type: str, post_id: str, attachments: Iterable[Any]) -> None:
+        rows = [(course_id, post_type, post_id, attachment.url, attachment.name)
+                for attachment in attachments if attachment.url]
+        self._upsert('attachments', ['course_id', 'post_type', 'post_id', 'url', 'name'],
+                     ['course_id', 'post_type', 'post_id', 'url'], rows)
+
+    def upsert_plan(self, course_id: str, plan_info: Dict[str, Any]) -> None:
+        rows = []
+        for section, content in plan_info.items():
+            if section == WEEKLY_PLAN_SECTION:
+                rows.extend((course_id, section, week['주차'], position, week['내용'], week['비고'])
+                            for position, week in enumerate(content))
+            else:
+                rows.extend((course_id, section, key, position, value, None)
+                            for position, (key, value) in enumerate(content.items()))
+        self._upsert('plan_sections', ['course_id', 'section', 'item_key', 'position', 'value', 'note'],
+                     ['course_id', 'section', 'item_key'], rows)
+
+    def upsert_summaries(self, records: Iterable[Dict[str, str]]) -> None:
+        rows = [(record['file_name'], record.get('sha256'), record['summary']) for record in records]
+        self._upsert('summaries', ['file_name', 'sha256', 'summary'], ['file_name'], rows)
+
+    def search(self, query: str, limit: int = 20, course_id: Optional[str] = None,
+               kinds: Optional[Iterable[str]] = None) -> List[search_index.SearchHit]:
+        """
+        공지사항, 강의 자료, 강의계획서를 전문 검색해 관련도 순으로 반환합니다.
+
+        :param course_id: 이 과목의 글만 찾습니다.
+        :param kinds: 찾을 글 종류 ('notice', 'material', 'plan'). None이면 모두 찾습니다.
+        """
+        if not self.search_enabled:
+            logging.error("전문 검색 색인이 없어 검색할 수 없습니다.")
+            return []
+        with self._lock:
+            return search_index.search(self._connection, query, limit, course_id, kinds)
+
+    def rebuild_search_index(self) -> Dict[str, int]:
+        """검색 색인을 처음부터 다시 만들고 종류별 색인된 글 수를 반환합니다."""
+        with self.transaction() as connection:
+            search_index.rebuild(connection)
+            return search_index.counts(connection)
+
+    def get_fingerprints(self, course_id: str, item_type: str) -> Dict[str, str]:
+        rows = self.query("SELECT item_key, fingerprint FROM fingerprints WHERE course_id = ? AND item_type = ?",
+                          (course_id, item_type))
+        return {row['item_key']: row['fingerprint'] for row in rows}
+
+    def save_fingerprints(self, course_id: str, item_type: str, fingerprints: Dict[str, str],
+                          deleted: Iterable[str] = ()) -> None:
+        with self.transaction() as connection:
+            self._upsert('fingerprints', ['course_id', 'item_type', 'item_key', 'fingerprint'],
+                         ['course_id', 'item_type', 'item_key'],
+                         [(course_id, item_type, key, value) for key, value in fingerprints.items()])
+            connection.executemany(
+                "DELETE FROM fingerprints WHERE course_id = ? AND item_type = ? AND item_key = ?",
+                [(course_id, item_type, key) for key in deleted])
+
+    def get_notion_pages(self, entity: str) -> Dict[str, Tuple[str, Dict[str, str]]]:
+        """항목 키 → (Notion 페이지 ID, 마지막으로 보낸 속성별 해시)"""
+        rows = self.query("SELECT item_key, page_id, property_hashes FROM notion_pages WHERE entity = ?", (entity,))
+        return {row['item_key']: (row['page_id'], json.loads(row['property_hashes'])) for row in rows}
+
+    def save_notion_pages(self, entity: str, pages: Iterable[Tuple[str, str, Dict[str, str]]]) -> None:
+        rows = [(entity, key, page_id, json.dumps(hashes, sort_keys=True)) for key, page_id, hashes in pages]
+        self._upsert('notion_pages', ['entity', 'item_key', 'page_id', 'property_hashes'],
+                     ['entity', 'item_key'], rows)
+
+    def save_crawl_results(self, crawl_results: Iterable[Any]) -> None:
+        """EclassManager.crawl_all의 결과를 한 트랜잭션으로 저장합니다."""
+        crawl_results = list(crawl_results)
+        with self.transaction():
+            self.upsert_courses(result.course for result in crawl_results)
+            for result in crawl_results:
+                course_id = result.course.id
+                self.upsert_menus(course_id, result.menus)
+                for menu_type, data in result.results.items():
+                    if not data:
+                        continue
+                    if menu_type == MenuType.NOTICE:
+                        self.upsert_notices(course_id, data)
+                    elif menu_type == MenuType.LECTURE_MATERIAL:
+                        self.upsert_materials(course_id, data)
+                    elif menu_type == MenuType.PLAN:
+                        self.upsert_plan(course_id, data)
+        logging.info(f"수집 결과를 {self.path}에 저장했습니다.")
+
+    def _upsert(self, table: str, columns: List[str], keys: List[str], rows: List[tuple],
+                keep_existing: Iterable[str] = ()) -> None:
+        if not rows:
+            return
+        with self.transaction() as connection:
+            connection.executemany(_upsert_sql(table, columns, keys, keep_existing), rows)
@@ -0,0 +1,74 @@
+"""
+테스트는 같은 프로세스에서 띄운 가짜 e-Class 서버(benchmarks.fake_eclass_server)에 접속합니다.
+
+config는 처음 불러올 때 ECLASS_BASE_URL을 읽으므로, 어느 테스트 모듈보다 먼저 불러오는
+이 패키지에서 비어 있는 포트를 골라 주소를 정합니다. 서버를 쓰는 테스트는 FakeServerTestCase를 상속합니다.
+"""
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+from urllib.parse import urlsplit
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+os.environ['ECLASS_BASE_URL'] = f'http://localhost:{_free_port()}'
+
+
+class FakeServerTestCase(unittest.TestCase):
+    """
+    가짜 e-Class 서버를 띄우고, 쿠키·응답 캐시·내보내기 파일을 임시 디렉토리에 쓰도록 바꿔 둡니다.
+
+    하위 클래스는 server_options로 서버 데이터를 정하고, self.server.requests로
+    엔드포인트별 요청 수를 확인합니다.
+    """
+    server_options = None
+
+    @classmethod
+    def setUpClass(cls):
+        import config
+        from benchmarks.fake_eclass_server import FakeEclassServer, ServerOptions
+
+        cls.server = FakeEclassServer(('127.0.0.1', urlsplit(config.BASE_URL).port),
+                                      cls.server_options or ServerOptions())
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        import scrapping.eclass_session as eclass_session
+        import scrapping.menu_handlers.plan_handler as plan_handler
+        from scrapping import debug_capture
+
+        self.server.requests.clear()
+        self.workdir = tempfile.mkdtemp(prefix='eclass-test-')
+        self.previous_cwd = os.getcwd()
+        # EclassSession은 현재 디렉토리의 config.ini를 읽습니다.
+        os.chdir(self.workdir)
+        with open('config.ini', 'w', encoding='utf-8') as file:
+            file.write("[credentials]\nusername = test\npassword = test\nrate_limit = 1000\nrate_burst = 1000\n")
+        patches = [
+            (eclass_session, 'COOKIE_DIR', os.path.join(self.workdir, 'cookies')),
+            (eclass_session, 'RESPONSE_CACHE_DIR', os.path.join(self.workdir, 'cache')),
+            (plan_handler, 'EXPORT_DIR', os.path.join(self.workdir, 'export')),
+            (debug_capture.CAPTURE, 'enabled', False),
+        ]
+        self.originals = [(owner, name, getattr(owner, name)) for owner, name, _ in patches]
+        for owner, name, value in patches:
+            setattr(owner, name, value)
+
+    def tearDown(self):
+        for owner, name, value in self.originals:
+            setattr(owner, name, value)
+        os.chdir(self.previous_cwd)
+        shutil.rmtree(self.workdir, ignore_errors=True)
@@ -0,0 +1,48 @@
+"""
+AsyncEclassSession이 저장된 쿠키로 세션을 재사용할 때 확인 요청도 _fetch를 거치는지 확인합니다.
+
+    python -m unittest tests.test_async_session
+"""
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_eclass_server import ServerOptions  # noqa: E402
+from scrapping import metrics  # noqa: E402
+from scrapping.async_eclass_session import AsyncEclassSession  # noqa: E402
+from tests import FakeServerTestCase  # noqa: E402
+
+
+def _requests_to(endpoint: str) -> float:
+    counters, _ = metrics.REGISTRY.snapshot()
+    return sum(value for labels, value in counters.get('eclass_requests_total', {}).items()
+               if ('endpoint', endpoint) in labels)
+
+
+async def _login() -> bool:
+    async with AsyncEclassSession(use_cache=False) as session:
+        logged_in = await session.ensure_login()
+        session.save_cookies()
+        return logged_in
+
+
+class ProbeSessionTest(FakeServerTestCase):
+    server_options = ServerOptions(courses=1, notices=1, materials=1)
+
+    def test_restored_session_is_probed_through_fetch(self):
+        self.assertTrue(asyncio.run(_login()))
+        self.server.requests.clear()
+        probes = _requests_to('main_form.acl')
+
+        self.assertTrue(asyncio.run(_login()))
+        self.assertNotIn('login.acl', self.server.requests)
+        self.assertEqual(self.server.requests.get('main_form.acl'), 1)
+        # 속도 제한, 재시도, 지표 기록을 하는 _fetch를 거쳤으면 요청 지표에 남습니다.
+        self.assertEqual(_requests_to('main_form.acl') - probes, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
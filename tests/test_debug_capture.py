@@ -0,0 +1,56 @@
+"""
+목록이 비어 있는 과목은 파싱 실패로 저장하지 않고, 목록 표가 없는 응답만 실패로 저장하는지 확인합니다.
+섹션을 하나도 찾지 못한 강의계획서는 결과로 돌려주거나 파일로 저장하지 않습니다.
+
+    python -m unittest tests.test_debug_capture
+"""
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapping import debug_capture  # noqa: E402
+from scrapping.menu_handlers.lecture_material_handler import LectureMaterialMenuHandler  # noqa: E402
+from scrapping.menu_handlers.notice_handler import NoticeMenuHandler  # noqa: E402
+from scrapping.menu_handlers.plan_handler import PlanMenuHandler  # noqa: E402
+
+EMPTY_LIST = '<html><body><table class="bbslist"><tbody><tr><td colspan="5">조회할 자료가 없습니다.</td></tr></tbody></table></body></html>'
+ERROR_PAGE = '<html><body><div class="error">잘못된 접근입니다.</div></body></html>'
+
+
+class FailedCaptureTest(unittest.TestCase):
+    def failed_flags(self, handler_class, content):
+        handler = handler_class(SimpleNamespace(username='test'), 'A1')
+        with mock.patch.object(debug_capture, 'capture') as capture:
+            result = handler.process(content)
+        self.assertEqual(result, [])
+        return [call.args[3] for call in capture.call_args_list]
+
+    def test_empty_notice_list_is_not_a_failure(self):
+        self.assertEqual(self.failed_flags(NoticeMenuHandler, EMPTY_LIST), [False])
+
+    def test_missing_notice_table_is_a_failure(self):
+        self.assertEqual(self.failed_flags(NoticeMenuHandler, ERROR_PAGE), [True])
+
+    def test_empty_material_list_is_not_a_failure(self):
+        self.assertEqual(self.failed_flags(LectureMaterialMenuHandler, EMPTY_LIST), [False])
+
+    def test_missing_material_table_is_a_failure(self):
+        self.assertEqual(self.failed_flags(LectureMaterialMenuHandler, ERROR_PAGE), [True])
+
+
+class EmptyPlanTest(unittest.TestCase):
+    def test_plan_without_sections_is_not_saved(self):
+        handler = PlanMenuHandler(SimpleNamespace(username='test'), 'A1')
+        with mock.patch.object(debug_capture, 'capture') as capture, \
+                mock.patch.object(handler, '_save_text_to_file') as save:
+            self.assertIsNone(handler.process(ERROR_PAGE, {}))
+        save.assert_not_called()
+        self.assertEqual([call.args[3] for call in capture.call_args_list], [True])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+"""
+첨부 파일 다운로더의 이어받기(If-Range), 재시도, 로그인 화면 처리와 게시글 링크 이름을 확인합니다.
+
+    python -m unittest tests.test_downloader
+"""
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapping.downloader import AttachmentDownloader, DownloadTask  # noqa: E402
+from scrapping.eclass_session import EclassRequestError, returned_login_page  # noqa: E402
+
+URL = 'http://e/ilos/co/efile_download.acl?FILE_SEQ=1'
+TASK = DownloadTask(URL, 'report.pdf', 'A1', 'notice:1')
+
+
+def _response(status: int, body: bytes, headers=None, url: str = URL) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response._content_consumed = True
+    response.headers.update(headers or {})
+    response.url = url
+    return response
+
+
+class _StubSession:
+    """open_stream이 준비한 응답(또는 예외)을 차례로 돌려주고 받은 헤더를 기록합니다."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def open_stream(self, url, headers=None):
+        self.requests.append(dict(headers or {}))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class AttachmentDownloaderTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.part_path = None
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def downloader(self, session):
+        downloader = AttachmentDownloader(session, root_dir=self.directory.name)
+        self.part_path = os.path.join(downloader.root_dir, 'partial', 'resume.part')
+        os.makedirs(os.path.dirname(self.part_path), exist_ok=True)
+        return downloader
+
+    def write_part(self, body: bytes, validator=None):
+        with open(self.part_path, 'wb') as file:
+            file.write(body)
+        if validator:
+            with open(f"{self.part_path}.validator", 'w', encoding='utf-8') as file:
+                file.write(validator)
+
+    def read_part(self) -> bytes:
+        with open(self.part_path, 'rb') as file:
+            return file.read()
+
+    def test_resume_sends_if_range_and_appends_on_206(self):
+        session = _StubSession(_response(206, b'world'))
+        downloader = self.downloader(session)
+        self.write_part(b'hello ', validator='"v1"')
+        downloader._stream_to_part(URL, self.part_path)
+        self.assertEqual(session.requests, [{'Range': 'bytes=6-', 'If-Range': '"v1"'}])
+        self.assertEqual(self.read_part(), b'hello world')
+
+    def test_changed_file_restarts_on_200(self):
+        session = _StubSession(_response(200, b'new file', {'ETag': '"v2"'}))
+        downloader = self.downloader(session)
+        self.write_part(b'old ', validator='"v1"')
+        downloader._stream_to_part(URL, self.part_path)
+        self.assertEqual(self.read_part(), b'new file')
+        with open(f"{self.part_path}.validator", encoding='utf-8') as file:
+            self.assertEqual(file.read(), '"v2"')
+
+    def test_part_without_validator_is_not_resumed(self):
+        session = _StubSession(_response(200, b'whole', {'ETag': 'W/"weak"'}))
+        downloader = self.downloader(session)
+        self.write_part(b'stale')
+        downloader._stream_to_part(URL, self.part_path)
+        self.assertEqual(session.requests, [{}])
+        self.assertEqual(self.read_part(), b'whole')
+        self.assertFalse(os.path.exists(f"{self.part_path}.validator"))
+
+    def test_request_errors_are_not_retried_again(self):
+        # EclassSession._request가 이미 재시도한 뒤 낸 예외이므로 다운로더는 다시 요청하지 않습니다.
+        session = _StubSession(EclassRequestError("요청이 모두 실패했습니다", 503))
+        result = AttachmentDownloader(session, root_dir=self.directory.name).download(TASK)
+        self.assertEqual(len(session.requests), 1)
+        self.assertIsNone(result.sha256)
+        self.assertTrue(result.error)
+
+
+class AttachmentLinkTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.post_dir = os.path.join(self.directory.name, 'courses', 'A1', 'notice1')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def download(self, *files):
+        """(FILE_SEQ, 본문) 목록을 같은 게시글의 report.pdf 첨부로 내려받습니다."""
+        session = _StubSession(*(_response(200, body) for _, body in files))
+        downloader = AttachmentDownloader(session, root_dir=self.directory.name, max_workers=1)
+        return downloader.download_all([DownloadTask(URL.replace('=1', f'={seq}'), 'report.pdf', 'A1', 'notice:1')
+                                        for seq, _ in files])
+
+    def linked(self):
+        contents = {}
+        for name in os.listdir(self.post_dir):
+            with open(os.path.join(self.post_dir, name), 'rb') as file:
+                contents[name] = file.read()
+        return contents
+
+    def test_same_name_in_one_post_gets_hash_suffix(self):
+        results = self.download((1, b'first'), (2, b'second'))
+        suffixed = f"report_{results[1].sha256[:8]}.pdf"
+        self.assertEqual(self.linked(), {'report.pdf': b'first', suffixed: b'second'})
+
+    def test_replaced_attachment_replaces_link(self):
+        self.download((1, b'old'))
+        result = self.download((2, b'new'))[0]
+        self.assertEqual(self.linked(), {'report.pdf': b'new'})
+        with open(os.path.join(self.directory.name, 'index.json'), encoding='utf-8') as file:
+            objects = json.load(file)['objects']
+        self.assertEqual([sha for sha, references in objects.items() if references], [result.sha256])
+
+
+class LoginPageTest(unittest.TestCase):
+    def test_html_login_page_is_detected_in_stream(self):
+        login = _response(200, b'<form><input type="password" name="usr_pwd"></form>', {'Content-Type': 'text/html'})
+        self.assertTrue(returned_login_page(login, stream=True))
+
+    def test_binary_attachment_is_not_read(self):
+        attachment = _response(200, b'%PDF-1.4 name="usr_pwd"', {'Content-Type': 'application/pdf'})
+        self.assertFalse(returned_login_page(attachment, stream=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+--changes로 다시 수집할 때 이미 본 공지와 강의 자료의 상세 페이지를 요청하지 않는지
+동기(crawl_all)와 asyncio(crawl_all_async) 수집, 여러 계정 수집의 작업자가 받는 항목 키로
+가짜 e-Class 서버에서 확인합니다.
+
+    python -m unittest tests.test_incremental_crawl
+"""
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_eclass_server import ServerOptions, course_id  # noqa: E402
+from scrapping import multi_account  # noqa: E402
+from scrapping.change_detector import ChangeDetector  # noqa: E402
+from scrapping.eclass_manager import EclassManager  # noqa: E402
+from scrapping.store import EclassStore  # noqa: E402
+from tests import FakeServerTestCase  # noqa: E402
+
+DETAIL_ENDPOINTS = ('notice_view_form.acl', 'lecture_material_view_form.acl')
+
+
+class IncrementalCrawlTest(FakeServerTestCase):
+    server_options = ServerOptions(courses=2, notices=5, materials=3)
+
+    def setUp(self):
+        super().setUp()
+        self.store = EclassStore(os.path.join(self.workdir, 'eclass.db'))
+        self.addCleanup(self.store.close)
+
+    def crawl(self, use_async: bool):
+        manager = EclassManager(use_cache=False, change_detector=ChangeDetector(self.store))
+        if use_async:
+            asyncio.run(manager.crawl_all_async())
+        else:
+            manager.crawl_all()
+
+    def detail_requests(self):
+        return {endpoint: self.server.requests.get(endpoint, 0) for endpoint in DETAIL_ENDPOINTS}
+
+    def assert_second_crawl_skips_details(self, use_async: bool):
+        self.crawl(use_async)
+        self.assertEqual(self.detail_requests(), {'notice_view_form.acl': 10, 'lecture_material_view_form.acl': 6})
+        self.server.requests.clear()
+        self.crawl(use_async)
+        self.assertEqual(self.detail_requests(), {'notice_view_form.acl': 0, 'lecture_material_view_form.acl': 0})
+
+    def test_sync_crawl_skips_known_details(self):
+        self.assert_second_crawl_skips_details(use_async=False)
+
+    def test_async_crawl_skips_known_details(self):
+        self.assert_second_crawl_skips_details(use_async=True)
+
+    def test_known_keys_snapshot_skips_details(self):
+        # 여러 계정 수집의 작업자 프로세스처럼 변경 감지 없이 넘겨받은 항목 키로 수집합니다.
+        self.crawl(use_async=False)
+        self.server.requests.clear()
+        snapshot = multi_account._known_keys_snapshot(ChangeDetector(self.store), [course_id(i) for i in range(2)])
+        EclassManager(use_cache=False, known_keys=snapshot).crawl_all()
+        self.assertEqual(self.detail_requests(), {'notice_view_form.acl': 0, 'lecture_material_view_form.acl': 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+"""
+명령줄 옵션 조합 검사를 확인합니다.
+
+    python -m unittest tests.test_main
+"""
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import parse_args  # noqa: E402
+
+
+class ParseArgsTest(unittest.TestCase):
+    def assert_rejected(self, argv):
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+            parse_args(argv)
+
+    def test_async_crawl_rejects_download(self):
+        self.assert_rejected(['crawl', '--async', '--download'])
+
+    def test_accounts_reject_async_and_download(self):
+        self.assert_rejected(['crawl', '--accounts', '--async'])
+        self.assert_rejected(['crawl', '--accounts', '--download'])
+
+    def test_compatible_options_are_accepted(self):
+        self.assertTrue(parse_args(['crawl', '--download']).download)
+        self.assertTrue(parse_args(['crawl', '--async', '--changes']).use_async)
+
+
+if __name__ == '__main__':
+    unittest.main()
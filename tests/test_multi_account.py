@@ -0,0 +1,112 @@
+"""
+여러 계정 수집에서 공유 메뉴를 맡은 계정이 실패했을 때와 개인 메뉴의 변경 감지를 확인합니다.
+
+계정 프로세스 대신 같은 프로세스의 스레드 풀에서 가짜 작업 함수를 실행합니다.
+
+    python -m unittest tests.test_multi_account
+"""
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapping import multi_account  # noqa: E402
+from scrapping.change_detector import ChangeDetector  # noqa: E402
+from scrapping.eclass_manager import CourseCrawlResult  # noqa: E402
+from scrapping.models import Course, MenuType  # noqa: E402
+from scrapping.store import EclassStore  # noqa: E402
+
+SHARED = Course('A1', '함께 듣는 과목', 'C1', '')
+ALONE = Course('A2', '혼자 듣는 과목', 'C2', '')
+COURSES = {'alice': [SHARED, ALONE], 'bob': [SHARED]}
+
+
+def _fake_pool(max_workers, mp_context=None):
+    return ThreadPoolExecutor(max_workers=max_workers)
+
+
+def _list_courses(profile, use_cache):
+    return COURSES[profile], ({}, {})
+
+
+class CrawlAccountsTest(unittest.TestCase):
+    def crawl(self, failing, calls, change_detector=None, known_keys=None):
+        def crawl_account(profile, use_cache, owned, max_workers, personal=True, known=None):
+            calls.append((profile, set(owned), personal))
+            if known_keys is not None:
+                known_keys[profile] = known
+            if profile in failing:
+                raise RuntimeError("로그인 실패")
+            results = []
+            for course in COURSES[profile]:
+                result = CourseCrawlResult(course=course)
+                if course.id in owned:
+                    result.results[MenuType.NOTICE] = [f'{course.id} 공지']
+                if personal:
+                    result.results[MenuType.ASSIGNMENT] = [{'title': f'{profile} 과제'}]
+                results.append(result)
+            return results, ({}, {})
+
+        with mock.patch.object(multi_account, 'ProcessPoolExecutor', _fake_pool), \
+                mock.patch.object(multi_account, '_list_courses', _list_courses), \
+                mock.patch.object(multi_account, '_crawl_account', crawl_account):
+            results = multi_account.crawl_accounts(['alice', 'bob'], change_detector=change_detector)
+            return {result.course.id: result for result in results}
+
+    def test_failed_owner_courses_are_recrawled_by_another_account(self):
+        # 수강 계정이 적은 과목부터 맡기므로 A2는 alice, 함께 듣는 A1은 bob이 맡습니다.
+        calls = []
+        merged = self.crawl({'bob'}, calls)
+        self.assertIn(('alice', {'A1'}, False), calls)
+        self.assertEqual(merged['A1'].results[MenuType.NOTICE], ['A1 공지'])
+        self.assertEqual(merged['A1'].errors, {})
+        self.assertEqual(list(merged['A1'].personal), ['alice'])
+
+    def test_courses_without_another_account_are_recorded_as_errors(self):
+        merged = self.crawl({'alice'}, [])
+        self.assertEqual(merged['A1'].results[MenuType.NOTICE], ['A1 공지'])
+        self.assertEqual(set(merged['A2'].errors), multi_account.SHARED_MENUS)
+        self.assertEqual(merged['A2'].results, {})
+
+    def test_workers_get_known_keys_of_owned_courses(self):
+        detector = mock.Mock()
+        detector.known_keys.side_effect = lambda course_id, menu_type: {f'{course_id} {menu_type.name}'}
+        known_keys = {}
+        self.crawl(set(), [], detector, known_keys)
+        self.assertEqual(known_keys['alice'], {('A2', MenuType.NOTICE): {'A2 NOTICE'},
+                                               ('A2', MenuType.LECTURE_MATERIAL): {'A2 LECTURE_MATERIAL'}})
+        self.assertEqual(set(known_keys['bob']), {('A1', MenuType.NOTICE), ('A1', MenuType.LECTURE_MATERIAL)})
+
+
+class DetectPersonalTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = EclassStore(os.path.join(self.directory.name, 'eclass.db'))
+        self.detector = ChangeDetector(self.store)
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def merged(self, assignments):
+        merged = multi_account.MergedCourseResult(course=SHARED, accounts=list(assignments))
+        merged.personal = {account: {MenuType.ASSIGNMENT: [{'title': title}]} for account, title in assignments.items()}
+        return merged
+
+    def test_personal_fingerprints_are_kept_per_account(self):
+        events = self.detector.detect_personal([self.merged({'alice': '과제 1', 'bob': '과제 1'})])
+        self.assertEqual(sorted((event.kind, event.account) for event in events),
+                         [('created', 'alice'), ('created', 'bob')])
+
+        # bob의 과제만 바뀌면 alice의 과제는 삭제로 보지 않습니다.
+        events = self.detector.detect_personal([self.merged({'alice': '과제 1', 'bob': '과제 2'})])
+        self.assertEqual(sorted((event.kind, event.account, event.item_key) for event in events),
+                         [('created', 'bob', '과제 2'), ('deleted', 'bob', '과제 1')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+상단 고정 공지가 모든 페이지 맨 위에 반복될 때 공지 목록을 끝까지(또는 알고 있는 글까지) 읽는지,
+목록만 보는 collect()가 상세 페이지를 요청하지 않는지 확인합니다.
+
+    python -m unittest tests.test_notice_paging
+"""
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_eclass_server import ServerOptions, course_id  # noqa: E402
+from scrapping.async_eclass_session import AsyncEclassSession  # noqa: E402
+from scrapping.eclass_session import EclassSession  # noqa: E402
+from scrapping.menu_handlers.notice_handler import NoticeMenuHandler  # noqa: E402
+from tests import FakeServerTestCase  # noqa: E402
+
+PINNED = ['공지', '공지']
+# 고정 공지의 키('공지')를 이미 알고 있어도 번호 있는 새 글을 따라 다음 페이지를 읽어야 합니다.
+KNOWN = {'공지', '3'}
+
+
+class NoticePagingTest(FakeServerTestCase):
+    server_options = ServerOptions(courses=1, notices=45, materials=1, pinned=2)
+
+    def handler(self) -> NoticeMenuHandler:
+        session = EclassSession(use_cache=False)
+        self.assertTrue(session.ensure_login())
+        return NoticeMenuHandler(session, course_id(0))
+
+    def test_iter_notices_reads_every_page_once(self):
+        numbers = [notice.number for notice in self.handler().iter_notices()]
+        self.assertEqual(numbers, PINNED + [str(n) for n in range(45, 0, -1)])
+        self.assertEqual(self.server.requests.get('notice_list.acl'), 3)
+
+    def test_incremental_collect_pages_past_known_pins(self):
+        numbers = [notice.number for notice in self.handler().collect_incremental({}, KNOWN)]
+        self.assertEqual(numbers, PINNED + [str(n) for n in range(45, 3, -1)])
+
+    def test_async_incremental_collect_pages_past_known_pins(self):
+        async def collect():
+            async with AsyncEclassSession(use_cache=False) as session:
+                self.assertTrue(await session.ensure_login())
+                return await NoticeMenuHandler(session, course_id(0)).collect_incremental_async({}, KNOWN)
+
+        numbers = [notice.number for notice in asyncio.run(collect())]
+        self.assertEqual(numbers, PINNED + [str(n) for n in range(45, 3, -1)])
+
+
+class NoticeDetailRequestTest(FakeServerTestCase):
+    server_options = ServerOptions(courses=1, notices=5, materials=1)
+
+    def handler(self) -> NoticeMenuHandler:
+        session = EclassSession(use_cache=False)
+        self.assertTrue(session.ensure_login())
+        return NoticeMenuHandler(session, course_id(0))
+
+    def test_collect_reads_only_the_list(self):
+        notices = self.handler().collect({})
+        self.assertEqual(len(notices), 5)
+        self.assertNotIn('notice_view_form.acl', self.server.requests)
+
+    def test_display_reuses_fetched_details(self):
+        handler = self.handler()
+        notices = handler.collect_incremental({}, set())
+        self.assertEqual(self.server.requests.get('notice_view_form.acl'), 5)
+        with mock.patch('builtins.input', return_value=''), mock.patch('builtins.print') as printed:
+            handler._display_notice_detail(notices[0])
+        self.assertEqual(self.server.requests.get('notice_view_form.acl'), 5)
+        self.assertIn(mock.call(notices[0].content), printed.call_args_list)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+응답 캐시가 과목마다 다른 강의계획서를 섞지 않는지 가짜 e-Class 서버로 확인합니다.
+
+plan_view.acl의 폼에는 과목 키가 없고 서버 세션의 '현재 과목'에 따라 응답이 달라지므로,
+캐시 키에 진입한 과목이 들어가지 않으면 모든 과목이 첫 과목의 강의계획서를 받습니다.
+
+    python -m unittest tests.test_response_cache
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_eclass_server import ServerOptions, course_id  # noqa: E402
+from scrapping.eclass_manager import EclassManager  # noqa: E402
+from scrapping.models import MenuType  # noqa: E402
+from scrapping.response_cache import ResponseCache  # noqa: E402
+from tests import FakeServerTestCase  # noqa: E402
+
+
+class ResponseCacheKeyTest(unittest.TestCase):
+    def test_course_scoped_key_depends_on_entered_course(self):
+        cache = ResponseCache('unused', {'plan_view.acl': 60}, namespace='user', course_scoped=['plan_view.acl'])
+        url, form = 'http://e/ilos/st/course/plan_view.acl', {'SCH_PROF': '', 'encoding': 'utf-8'}
+        self.assertNotEqual(cache.make_key('POST', url, form, 'A1'), cache.make_key('POST', url, form, 'A2'))
+        self.assertIsNone(cache.make_key('POST', url, form, None))
+
+    def test_other_keys_ignore_entered_course(self):
+        cache = ResponseCache('unused', {'notice_list.acl': 60}, namespace='user', course_scoped=['plan_view.acl'])
+        url, form = 'http://e/ilos/st/course/notice_list.acl', {'ky': 'A1'}
+        self.assertEqual(cache.make_key('POST', url, form, 'A1'), cache.make_key('POST', url, form, 'A2'))
+
+
+class CachedPlanCrawlTest(FakeServerTestCase):
+    server_options = ServerOptions(courses=2, notices=3, materials=2)
+
+    def crawl_plans(self):
+        results = EclassManager(use_cache=True).crawl_all(max_workers=4)
+        return {result.course.id: result.results[MenuType.PLAN]['[수업기본정보]']['교과목명'] for result in results}
+
+    def test_each_course_gets_its_own_plan(self):
+        expected = {course_id(i): f'과목 {course_id(i)}' for i in range(2)}
+        # 두 번째 수집은 첫 수집이 채운 캐시에서 강의계획서를 읽습니다.
+        self.assertEqual(self.crawl_plans(), expected)
+        self.assertEqual(self.crawl_plans(), expected)
+        self.assertEqual(self.server.requests.get('plan_view.acl'), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
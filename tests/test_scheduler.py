@@ -0,0 +1,44 @@
+"""
+데몬의 시간당 예산이 폴링 횟수가 아니라 HTTP 요청마다 쓰이는지 확인합니다.
+
+    python -m unittest tests.test_scheduler
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_eclass_server import ServerOptions  # noqa: E402
+from scrapping.change_detector import ChangeDetector  # noqa: E402
+from scrapping.eclass_manager import EclassManager  # noqa: E402
+from scrapping.models import MenuType  # noqa: E402
+from scrapping.scheduler import PollScheduler  # noqa: E402
+from scrapping.store import EclassStore  # noqa: E402
+from tests import FakeServerTestCase  # noqa: E402
+
+
+class PollBudgetTest(FakeServerTestCase):
+    server_options = ServerOptions(courses=2, notices=4, materials=1)
+
+    def test_every_request_draws_from_the_budget(self):
+        store = EclassStore(os.path.join(self.workdir, 'eclass.db'))
+        self.addCleanup(store.close)
+        manager = EclassManager(use_cache=False, change_detector=ChangeDetector(store))
+        scheduler = PollScheduler(manager, store, budget_per_hour=100000)
+        self.assertTrue(manager.eclass.ensure_login())
+        self.server.requests.clear()
+
+        with mock.patch.object(scheduler.budget, 'reserve', wraps=scheduler.budget.reserve) as reserve:
+            scheduler._refresh_targets()
+            notice = next(target for target in scheduler._queue if target.menu_type == MenuType.NOTICE)
+            scheduler._poll(notice)
+
+        # 과목 목록, 과목별 메뉴, 공지 목록과 공지 4개의 상세 페이지
+        self.assertGreater(self.server.requests.get('notice_view_form.acl', 0), 0)
+        self.assertEqual(reserve.call_count, sum(self.server.requests.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()